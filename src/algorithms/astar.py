@@ -1,5 +1,7 @@
-from typing import Dict, List, Union, Set
+from typing import Dict, List, Optional, Union, Set
 from graph import Graph
+from algorithms.budget import Budget
+from algorithms.stats import AlgorithmStats
 import heapq
 
 
@@ -8,6 +10,9 @@ def a_star(
     start_node: Union[int, str],
     goal_node: Union[int, str],
     heuristic: Dict[Union[int, str], float],
+    stats: Optional[AlgorithmStats] = None,
+    budget: Optional[Budget] = None,
+    weight: Optional[str] = None,
 ) -> List[Union[int, str]]:
     """
     Perform A* algorithm for shortest path from start_node to goal_node using heuristic.
@@ -16,7 +21,13 @@ def a_star(
     :param start_node: The node where the algorithm should start
     :param goal_node: The target node to reach
     :param heuristic: A dictionary containing the heuristic for each node
-    :return: A list of nodes representing the shortest path from start to goal
+    :param stats: Counters to fill in
+    :param budget: Limits checked while searching; on running out no path is returned,
+        as for an unreachable goal, and ``budget.exhausted`` tells the two apart
+        (``AlgorithmResult.complete`` when run through the runner)
+    :param weight: Name of an edge column used as the weights instead of Edge.weight
+    :return: A list of nodes representing the shortest path from start to goal,
+        empty if the goal is unreachable or the budget ran out
     :raises: ValueError if start_node or goal_node don't exist in graph
     """
     if start_node not in graph.nodes:
@@ -24,54 +35,79 @@ def a_star(
     if goal_node not in graph.nodes:
         raise ValueError(f"Goal node {goal_node} not found in graph")
 
-    # Initialize data structures
-    open_set: Set[Union[int, str]] = {start_node}
     came_from: Dict[Union[int, str], Union[int, str]] = {}
+    # Nodes whose shortest path is known; later heap entries for them are stale
+    closed: Set[Union[int, str]] = set()
 
     # Use infinity as default value
     inf = float("inf")
     g_score: Dict[Union[int, str], float] = {node_id: inf for node_id in graph.nodes}
     g_score[start_node] = 0
 
-    f_score: Dict[Union[int, str], float] = {node_id: inf for node_id in graph.nodes}
-    f_score[start_node] = heuristic.get(start_node, inf)
+    # Column values by Edge.index, as a list for fast scalar access
+    weights = None if weight is None else graph.edge_columns[weight].tolist()
 
-    # Priority queue for efficient min extraction
-    open_heap = []
-    heapq.heappush(open_heap, (f_score[start_node], start_node))
+    # Priority queue of (f score, node); a node is pushed again whenever its g score improves
+    open_heap = [(heuristic.get(start_node, inf), start_node)]
+    path: List[Union[int, str]] = []
+    edges_relaxed = 0
+    reported = 0
+    heap_pushes = 1
+    peak_frontier = 1
 
-    while open_set:
+    while open_heap:
         _, current_node = heapq.heappop(open_heap)
 
         # Skip if this node was already processed with better score
-        if current_node not in open_set:
+        if current_node in closed:
             continue
+        closed.add(current_node)
 
         if current_node == goal_node:
-            # Reconstruct path
-            path = []
-            while current_node in came_from:
-                path.append(current_node)
-                current_node = came_from[current_node]
-            path.append(start_node)
-            return path[::-1]
-
-        open_set.remove(current_node)
+            path = _reconstruct_path(came_from, start_node, goal_node)
+            break
 
+        # Edges are counted as relaxed the same way as in dijkstra and bfs_order
         for edge in graph.get_edges(current_node):
+            edges_relaxed += 1
             neighbor = edge.target.id
-            weight = edge.weight
+            edge_weight = edge.weight if weights is None else weights[edge.index]
 
             # Calculate tentative g score
-            tentative_g_score = g_score[current_node] + weight
+            tentative_g_score = g_score[current_node] + edge_weight
 
             if tentative_g_score < g_score[neighbor]:
                 came_from[neighbor] = current_node
                 g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = g_score[neighbor] + heuristic.get(neighbor, inf)
-
-                if neighbor not in open_set:
-                    open_set.add(neighbor)
-                    heapq.heappush(open_heap, (f_score[neighbor], neighbor))
-
-    return []  # No path found
+                heapq.heappush(
+                    open_heap, (tentative_g_score + heuristic.get(neighbor, inf), neighbor)
+                )
+                heap_pushes += 1
+        if len(open_heap) > peak_frontier:
+            peak_frontier = len(open_heap)
+
+        if budget is not None and edges_relaxed - reported >= budget.check_every:
+            if not budget.spend(edges_relaxed - reported, len(open_heap)):
+                break
+            reported = edges_relaxed
+
+    if stats is not None:
+        stats.nodes_settled += len(closed)
+        stats.edges_relaxed += edges_relaxed
+        stats.heap_pushes += heap_pushes
+        stats.peak_frontier = max(stats.peak_frontier, peak_frontier)
+    return path  # Empty if no path was found
+
+
+def _reconstruct_path(
+    came_from: Dict[Union[int, str], Union[int, str]],
+    start_node: Union[int, str],
+    node: Union[int, str],
+) -> List[Union[int, str]]:
+    """Follow the predecessors from a node back to the start node."""
+    path = []
+    while node in came_from:
+        path.append(node)
+        node = came_from[node]
+    path.append(start_node)
+    return path[::-1]
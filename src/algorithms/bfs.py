@@ -1,5 +1,8 @@
-from typing import Set, Union, List
+from collections import deque
+from typing import List, Optional, Set, Union
 from graph import Graph
+from algorithms.budget import Budget
+from algorithms.stats import AlgorithmStats
 
 
 def bfs(graph: Graph, start_node: Union[int, str]) -> None:
@@ -9,20 +12,56 @@ def bfs(graph: Graph, start_node: Union[int, str]) -> None:
     :param graph: The graph instance
     :param start_node: The node ID where BFS should start (can be int or str)
     """
+    print(" ".join(str(node) for node in bfs_order(graph, start_node)), end=" ")
+
+
+def bfs_order(
+    graph: Graph,
+    start_node: Union[int, str],
+    stats: Optional[AlgorithmStats] = None,
+    budget: Optional[Budget] = None,
+) -> List[Union[int, str]]:
+    """
+    Get the nodes in Breadth-First Search (BFS) order starting from the given node.
+
+    :param graph: The graph instance
+    :param start_node: The node ID where BFS should start (can be int or str)
+    :param stats: Counters to fill in
+    :param budget: Limits checked while searching; on running out the order so far is returned
+    :return: The visited node IDs in visiting order
+    :raises: ValueError if start_node doesn't exist in graph
+    """
     if start_node not in graph.nodes:
         raise ValueError(f"Node {start_node} not found in graph")
 
-    visited: Set[Union[int, str]] = set()
-    queue: List[Union[int, str]] = [start_node]
+    order: List[Union[int, str]] = []
+    discovered: Set[Union[int, str]] = {start_node}
+    queue = deque([start_node])
+    edges_relaxed = 0
+    reported = 0
+    peak_frontier = 1
 
     while queue:
-        current_node = queue.pop(0)
-        if current_node not in visited:
-            print(current_node, end=" ")
-            visited.add(current_node)
-
-            # Get all edges from current node
-            for edge in graph.get_edges(current_node):
-                neighbor = edge.target.id
-                if neighbor not in visited and neighbor not in queue:
-                    queue.append(neighbor)
+        current_node = queue.popleft()
+        order.append(current_node)
+
+        # Get all edges from current node
+        for edge in graph.get_edges(current_node):
+            edges_relaxed += 1
+            neighbor = edge.target.id
+            if neighbor not in discovered:
+                discovered.add(neighbor)
+                queue.append(neighbor)
+        if len(queue) > peak_frontier:
+            peak_frontier = len(queue)
+        if budget is not None and edges_relaxed - reported >= budget.check_every:
+            if not budget.spend(edges_relaxed - reported, len(queue)):
+                break
+            reported = edges_relaxed
+
+    if stats is not None:
+        stats.nodes_settled += len(order)
+        stats.edges_relaxed += edges_relaxed
+        stats.heap_pushes += len(discovered)  # Every discovered node was enqueued once
+        stats.peak_frontier = max(stats.peak_frontier, peak_frontier)
+    return order
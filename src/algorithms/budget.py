@@ -0,0 +1,82 @@
+from typing import Any, Callable, Optional
+import threading
+import time
+
+
+class CancelToken:
+    """Thread-safe flag for cancelling running algorithms from another thread"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the algorithms checking this token to stop"""
+        self._event.set()
+
+    def is_set(self) -> bool:
+        """Check whether cancellation was requested"""
+        return self._event.is_set()
+
+
+class Budget:
+    """
+    Limits on the work of an algorithm run, checked cooperatively.
+
+    Algorithms taking a ``budget`` report their edge relaxations every
+    ``check_every`` relaxations. Once the time, the relaxation count or the cancel
+    token says stop, they return what they have computed so far and the budget is
+    marked as exhausted, with the reason in ``reason``.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        max_relaxations: Optional[int] = None,
+        cancel_token: Optional[Any] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        check_every: int = 1024,
+    ):
+        """
+        Start the budget; the timeout runs from its creation.
+
+        :param timeout: Seconds of wall-clock time allowed
+        :param max_relaxations: Number of edge relaxations allowed
+        :param cancel_token: A CancelToken or any object with an ``is_set()`` method,
+            such as a threading.Event
+        :param progress: Called as progress(relaxations, frontier size) at every check
+        :param check_every: Number of relaxations between checks
+        :raises: ValueError if check_every is not positive
+        """
+        if check_every <= 0:
+            raise ValueError("check_every must be positive")
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.max_relaxations = max_relaxations
+        self.cancel_token = cancel_token
+        self.progress = progress
+        self.check_every = check_every
+        self.relaxations = 0
+        self.exhausted = False
+        self.reason: Optional[str] = None
+
+    def spend(self, relaxations: int, frontier: int) -> bool:
+        """
+        Record work done since the last check.
+
+        :param relaxations: Number of edges relaxed since the last check
+        :param frontier: Current size of the algorithm's queue, stack or heap
+        :return: True if the algorithm may continue, False if it must stop
+        """
+        self.relaxations += relaxations
+        if self.progress is not None:
+            self.progress(self.relaxations, frontier)
+
+        if self.cancel_token is not None and self.cancel_token.is_set():
+            self.reason = "cancelled"
+        elif self.max_relaxations is not None and self.relaxations >= self.max_relaxations:
+            self.reason = "max_relaxations"
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            self.reason = "timeout"
+        else:
+            return True
+        self.exhausted = True
+        return False
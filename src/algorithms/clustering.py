@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional, Tuple, Union
+from multiprocessing import Pool
+from array_graph import ArrayGraph
+from graph import Graph
+import numpy as np
+
+# Upper bound on the number of wedges (paths of length two) checked in one vectorized step
+_WEDGE_CHUNK = 1 << 22
+
+# Oriented adjacency arrays, set in every worker process by _init_worker
+_worker_arrays: Tuple[np.ndarray, ...] = ()
+
+
+def triangles(
+    graph: Union[Graph, ArrayGraph], workers: Optional[int] = None
+) -> Dict[Union[int, str], int]:
+    """
+    Count the triangles through every node.
+
+    Edge directions, weights, self-loops and parallel edges are ignored.
+
+    :param graph: The graph instance or its array form
+    :param workers: Number of worker processes to split the node ranges across
+    :return: A dictionary mapping each node to the number of triangles it belongs to
+    """
+    array_graph = graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph)
+    counts, _ = _triangle_counts(array_graph, workers)
+    return array_graph.to_dict(counts)
+
+
+def clustering(
+    graph: Union[Graph, ArrayGraph], workers: Optional[int] = None
+) -> Dict[Union[int, str], float]:
+    """
+    Compute the local clustering coefficient of every node.
+
+    The coefficient is the fraction of pairs of neighbours that are themselves
+    connected; it is 0 for nodes with fewer than two neighbours. Edge directions,
+    weights, self-loops and parallel edges are ignored.
+
+    :param graph: The graph instance or its array form
+    :param workers: Number of worker processes to split the node ranges across
+    :return: A dictionary mapping each node to its clustering coefficient
+    """
+    array_graph = graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph)
+    counts, degrees = _triangle_counts(array_graph, workers)
+    pairs = degrees * (degrees - 1)
+    coefficients = np.zeros(array_graph.num_nodes)
+    np.divide(2.0 * counts, pairs, out=coefficients, where=pairs > 0)
+    return array_graph.to_dict(coefficients)
+
+
+def transitivity(graph: Union[Graph, ArrayGraph], workers: Optional[int] = None) -> float:
+    """
+    Compute the transitivity (global clustering coefficient) of the graph.
+
+    :param graph: The graph instance or its array form
+    :param workers: Number of worker processes to split the node ranges across
+    :return: Three times the number of triangles divided by the number of connected triples
+    """
+    array_graph = graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph)
+    counts, degrees = _triangle_counts(array_graph, workers)
+    triples = int((degrees * (degrees - 1)).sum()) // 2
+    return float(counts.sum()) / triples if triples else 0.0
+
+
+def _triangle_counts(
+    array_graph: ArrayGraph, workers: Optional[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Count triangles per node on the simple undirected graph; also return its degrees."""
+    simple = array_graph.undirected()
+    n = simple.num_nodes
+    degrees = simple.degrees()
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), degrees
+
+    # Orient every edge from lower to higher (degree, index) rank, which bounds the work per node
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), degrees))] = np.arange(n)
+    sources = simple.edge_sources()
+    forward = rank[sources] < rank[simple.targets]
+    forward_sources = sources[forward]
+    forward_targets = simple.targets[forward]
+    forward_degrees = np.bincount(forward_sources, minlength=n)
+    forward_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(forward_degrees, out=forward_offsets[1:])
+    # Edges stay sorted by (source, target), so their keys are sorted for binary search
+    forward_keys = forward_sources * n + forward_targets
+
+    arrays = (forward_offsets, forward_sources, forward_targets, forward_keys)
+    ranges = _node_ranges(forward_offsets, forward_degrees)
+
+    if workers is not None and workers > 1 and len(ranges) > 1:
+        counts = np.zeros(n, dtype=np.int64)
+        with Pool(workers, initializer=_init_worker, initargs=arrays) as pool:
+            for partial in pool.imap_unordered(_count_range_worker, ranges):
+                counts += partial
+        return counts, degrees
+
+    counts = np.zeros(n, dtype=np.int64)
+    for node_range in ranges:
+        counts += _count_range(*arrays, *node_range)
+    return counts, degrees
+
+
+def _node_ranges(offsets: np.ndarray, degrees: np.ndarray) -> List[Tuple[int, int]]:
+    """Split the nodes into consecutive ranges of roughly _WEDGE_CHUNK wedges each."""
+    work = np.cumsum(degrees * degrees)
+    total = int(work[-1])
+    bounds = np.searchsorted(work, np.arange(_WEDGE_CHUNK, total, _WEDGE_CHUNK), side="right")
+    bounds = np.unique(np.concatenate(([0], bounds, [degrees.shape[0]])))
+    return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
+def _count_range(
+    offsets: np.ndarray,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    keys: np.ndarray,
+    lo: int,
+    hi: int,
+) -> np.ndarray:
+    """Count the triangles closed by the wedges whose apex lies in the node range [lo, hi)."""
+    n = offsets.shape[0] - 1
+    edges = np.arange(offsets[lo], offsets[hi])
+    if edges.size == 0:
+        return np.zeros(n, dtype=np.int64)
+
+    # Pair every edge u -> v with every edge u -> w of the same source node
+    apex = sources[edges]
+    counts = offsets[apex + 1] - offsets[apex]
+    total = int(counts.sum())
+    first = np.repeat(edges, counts)
+    second = np.repeat(offsets[apex] - (np.cumsum(counts) - counts), counts) + np.arange(total)
+
+    # The wedge u -> v, u -> w is a triangle when the oriented edge v -> w exists
+    v = targets[first]
+    w = targets[second]
+    query = v * n + w
+    position = np.minimum(np.searchsorted(keys, query), max(keys.shape[0] - 1, 0))
+    closed = keys[position] == query if keys.size else np.zeros(total, dtype=bool)
+
+    return (
+        np.bincount(sources[first[closed]], minlength=n)
+        + np.bincount(v[closed], minlength=n)
+        + np.bincount(w[closed], minlength=n)
+    )
+
+
+def _init_worker(*arrays: np.ndarray) -> None:
+    """Store the oriented adjacency arrays once per worker process."""
+    global _worker_arrays
+    _worker_arrays = arrays
+
+
+def _count_range_worker(node_range: Tuple[int, int]) -> np.ndarray:
+    """Count the triangles of one node range inside a worker process."""
+    return _count_range(*_worker_arrays, *node_range)
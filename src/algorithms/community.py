@@ -0,0 +1,218 @@
+from typing import Dict, List, Optional, Tuple, Union
+from array_graph import ArrayGraph
+from graph import Graph
+import numpy as np
+
+
+def label_propagation(
+    graph: Union[Graph, ArrayGraph],
+    seed: Optional[int] = None,
+    tol: float = 0.0,
+    max_iter: int = 100,
+    weight: Optional[str] = None,
+) -> Dict[Union[int, str], int]:
+    """
+    Detect communities with asynchronous label propagation.
+
+    Every node starts in its own community. Nodes are visited in a random order
+    and adopt the label with the largest total edge weight among their neighbours,
+    keeping their own label on ties. Edge directions and self-loops are ignored and
+    parallel edges are merged.
+
+    :param graph: The graph instance or its array form
+    :param seed: Seed for the visiting order and tie breaking
+    :param tol: Stop once at most this fraction of the nodes changed label in a sweep
+    :param max_iter: Maximum number of sweeps over all nodes
+    :param weight: Name of an edge column of a graph used as the weights instead of Edge.weight
+    :return: A dictionary mapping each node to a community number
+    """
+    array_graph = graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph, weight)
+    simple = array_graph.undirected()
+    n = simple.num_nodes
+    rng = np.random.default_rng(seed)
+
+    offsets: List[int] = simple.offsets.tolist()
+    targets: List[int] = simple.targets.tolist()
+    weights: List[float] = simple.weights.tolist()
+    labels = list(range(n))
+
+    for _ in range(max_iter):
+        changed = 0
+        for node in rng.permutation(n).tolist():
+            start, end = offsets[node], offsets[node + 1]
+            if start == end:
+                continue
+
+            scores: Dict[int, float] = {}
+            for k in range(start, end):
+                label = labels[targets[k]]
+                scores[label] = scores.get(label, 0.0) + weights[k]
+
+            best = max(scores.values())
+            if scores.get(labels[node]) == best:
+                continue
+            candidates = [label for label, score in scores.items() if score == best]
+            labels[node] = candidates[int(rng.integers(len(candidates)))]
+            changed += 1
+
+        if changed <= tol * n:
+            break
+
+    return array_graph.to_dict(_relabel(np.array(labels, dtype=np.int64)))
+
+
+def louvain(
+    graph: Union[Graph, ArrayGraph],
+    seed: Optional[int] = None,
+    tol: float = 1e-7,
+    resolution: float = 1.0,
+    weight: Optional[str] = None,
+) -> Dict[Union[int, str], int]:
+    """
+    Detect communities by modularity optimisation with the Louvain method.
+
+    Each level moves single nodes to the neighbouring community with the best
+    modularity gain until a sweep improves modularity by less than ``tol``, then
+    collapses every community into one node and repeats on the smaller graph.
+    Edge directions and self-loops are ignored and parallel edges are merged.
+
+    :param graph: The graph instance or its array form
+    :param seed: Seed for the node visiting order
+    :param tol: Minimum modularity improvement for another sweep or level
+    :param resolution: Resolution parameter; larger values give smaller communities
+    :param weight: Name of an edge column of a graph used as the weights instead of Edge.weight
+    :return: A dictionary mapping each node to a community number
+    """
+    array_graph = graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph, weight)
+    simple = array_graph.undirected()
+    n = simple.num_nodes
+    rng = np.random.default_rng(seed)
+
+    offsets = simple.offsets
+    targets = simple.targets
+    weights = simple.weights
+    loops = np.zeros(n)
+    membership = np.arange(n, dtype=np.int64)
+
+    total = float(weights.sum())
+    if total == 0:
+        return array_graph.to_dict(membership)
+
+    quality = _modularity(offsets, targets, weights, loops, np.arange(n), resolution, total)
+    while True:
+        communities, new_quality = _move_nodes(
+            offsets, targets, weights, loops, resolution, total, rng, tol, quality
+        )
+        membership = communities[membership]
+        count = int(communities.max()) + 1
+        if count == offsets.shape[0] - 1 or new_quality - quality <= tol:
+            break
+        quality = new_quality
+        offsets, targets, weights, loops = _aggregate(offsets, targets, weights, loops, communities)
+
+    return array_graph.to_dict(_relabel(membership))
+
+
+def _move_nodes(
+    offsets: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    loops: np.ndarray,
+    resolution: float,
+    total: float,
+    rng: np.random.Generator,
+    tol: float,
+    quality: float,
+) -> Tuple[np.ndarray, float]:
+    """Local moving phase of one Louvain level; returns communities and their modularity."""
+    n = offsets.shape[0] - 1
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    strengths = np.bincount(sources, weights=weights, minlength=n) + loops
+
+    offset_list: List[int] = offsets.tolist()
+    target_list: List[int] = targets.tolist()
+    weight_list: List[float] = weights.tolist()
+    strength_list: List[float] = strengths.tolist()
+    community = list(range(n))
+    community_totals = list(strength_list)
+    scale = resolution / total
+
+    while True:
+        for node in rng.permutation(n).tolist():
+            current = community[node]
+            strength = strength_list[node]
+
+            links: Dict[int, float] = {}
+            for k in range(offset_list[node], offset_list[node + 1]):
+                neighbor_community = community[target_list[k]]
+                links[neighbor_community] = links.get(neighbor_community, 0.0) + weight_list[k]
+
+            # Take the node out of its community, then put it where the gain is largest
+            community_totals[current] -= strength
+            best = current
+            best_gain = links.get(current, 0.0) - scale * community_totals[current] * strength
+            for candidate, link in links.items():
+                gain = link - scale * community_totals[candidate] * strength
+                if gain > best_gain:
+                    best = candidate
+                    best_gain = gain
+            community_totals[best] += strength
+            community[node] = best
+
+        communities = _relabel(np.array(community, dtype=np.int64))
+        new_quality = _modularity(offsets, targets, weights, loops, communities, resolution, total)
+        if new_quality - quality <= tol:
+            return communities, new_quality
+        quality = new_quality
+
+
+def _modularity(
+    offsets: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    loops: np.ndarray,
+    communities: np.ndarray,
+    resolution: float,
+    total: float,
+) -> float:
+    """Modularity of a partition; total is the sum of all edge weights in both directions."""
+    n = offsets.shape[0] - 1
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    internal = communities[sources] == communities[targets]
+    inside = float(weights[internal].sum() + loops.sum())
+    totals = np.bincount(communities[sources], weights=weights, minlength=n)
+    totals += np.bincount(communities, weights=loops, minlength=n)
+    return inside / total - resolution * float(((totals / total) ** 2).sum())
+
+
+def _aggregate(
+    offsets: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    loops: np.ndarray,
+    communities: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Collapse every community into a single node, keeping internal weight as a self-loop."""
+    n = offsets.shape[0] - 1
+    count = int(communities.max()) + 1
+    sources = communities[np.repeat(np.arange(n), np.diff(offsets))]
+    targets = communities[targets]
+    internal = sources == targets
+
+    new_loops = np.bincount(communities, weights=loops, minlength=count)
+    new_loops += np.bincount(sources[internal], weights=weights[internal], minlength=count)
+
+    external = ~internal
+    keys, inverse = np.unique(sources[external] * count + targets[external], return_inverse=True)
+    new_weights = np.bincount(inverse, weights=weights[external], minlength=keys.shape[0])
+    new_offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // count, minlength=count), out=new_offsets[1:])
+    return new_offsets, keys % count, new_weights, new_loops
+
+
+def _relabel(labels: np.ndarray) -> np.ndarray:
+    """Renumber labels to 0..k-1 in order of first appearance."""
+    _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    order = np.empty(first.shape[0], dtype=np.int64)
+    order[np.argsort(first)] = np.arange(first.shape[0])
+    return order[inverse.reshape(-1)]
@@ -0,0 +1,216 @@
+from typing import Dict, List, Optional, Tuple, Union
+from multiprocessing import Pool
+from array_graph import ArrayGraph
+from algorithms.budget import Budget
+from graph import Graph
+import heapq
+import numpy as np
+
+# Frontiers smaller than this are relaxed in the calling process even when workers are given
+_PARALLEL_MIN_FRONTIER = 1 << 16
+
+# CSR arrays of the graph being searched, set in every worker process by _init_worker
+_worker_arrays: Tuple[np.ndarray, np.ndarray, np.ndarray] = ()
+
+
+def delta_stepping(
+    graph: Union[Graph, ArrayGraph],
+    start_node: Union[int, str],
+    delta: Optional[float] = None,
+    workers: Optional[int] = None,
+    budget: Optional[Budget] = None,
+    weight: Optional[str] = None,
+) -> Dict[Union[int, str], float]:
+    """
+    Compute single-source shortest paths with the delta-stepping algorithm.
+
+    Nodes are kept in buckets of width ``delta``. Each bucket is emptied by
+    repeatedly relaxing the light edges (weight <= delta) of its whole frontier at
+    once, then the heavy edges of every node it settled are relaxed in one pass.
+    Relaxations are vectorized with NumPy over the CSR arrays of the graph.
+
+    :param graph: The graph instance or its array form
+    :param start_node: The node ID where the algorithm should start (can be int or str)
+    :param delta: Bucket width; defaults to the largest weight divided by the average degree
+    :param workers: Number of worker processes to split large frontiers across
+    :param budget: Limits checked after every bucket; on running out, distances of
+        the nodes not settled yet are upper bounds or infinity
+    :param weight: Name of an edge column of a graph used as the weights instead of Edge.weight
+    :return: A dictionary containing the shortest distances to all nodes
+    :raises: ValueError if start_node doesn't exist, delta is not positive or a weight is negative
+    """
+    array_graph = graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph, weight)
+    if start_node not in array_graph.index:
+        raise ValueError(f"Start node {start_node} not found in graph")
+
+    weights = array_graph.weights
+    if weights.size and weights.min() < 0:
+        raise ValueError("Edge weights must be non-negative")
+    if delta is None:
+        delta = _default_delta(array_graph)
+    elif delta <= 0:
+        raise ValueError("delta must be positive")
+
+    arrays = (array_graph.offsets, array_graph.targets, weights)
+    source = array_graph.index[start_node]
+
+    if workers is not None and workers > 1:
+        with Pool(workers, initializer=_init_worker, initargs=arrays) as pool:
+            distances = _run(arrays, source, delta, pool, workers, budget)
+    else:
+        distances = _run(arrays, source, delta, None, 1, budget)
+
+    return array_graph.to_dict(distances)
+
+
+def _default_delta(array_graph: ArrayGraph) -> float:
+    """Pick a bucket width of roughly one average edge per node per bucket."""
+    if array_graph.num_edges == 0:
+        return 1.0
+    max_weight = float(array_graph.weights.max())
+    if max_weight == 0:
+        return 1.0
+    average_degree = array_graph.num_edges / max(array_graph.num_nodes, 1)
+    return max_weight / max(average_degree, 1.0)
+
+
+def _run(
+    arrays: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    source: int,
+    delta: float,
+    pool: Optional[Pool],
+    workers: int,
+    budget: Optional[Budget],
+) -> np.ndarray:
+    """Delta-stepping main loop over CSR arrays; returns the distance array."""
+    offsets = arrays[0]
+    distances = np.full(offsets.shape[0] - 1, np.inf)
+    distances[source] = 0.0
+
+    # Bucket index -> arrays of node indices; entries may be stale and are filtered on pop
+    buckets: Dict[int, List[np.ndarray]] = {0: [np.array([source], dtype=np.int64)]}
+    bucket_heap = [0]
+
+    while bucket_heap:
+        i = heapq.heappop(bucket_heap)
+        settled: List[np.ndarray] = []
+        edges_relaxed = 0
+
+        while i in buckets:
+            frontier = np.unique(np.concatenate(buckets.pop(i)))
+            frontier = frontier[np.floor(distances[frontier] / delta) == i]
+            if frontier.size == 0:
+                continue
+            settled.append(frontier)
+            edges_relaxed += int((offsets[frontier + 1] - offsets[frontier]).sum())
+            targets, candidates = _relax(arrays, frontier, distances, delta, True, pool, workers)
+            _update(distances, targets, candidates, delta, buckets, bucket_heap)
+
+        if settled:
+            frontier = np.unique(np.concatenate(settled))
+            targets, candidates = _relax(arrays, frontier, distances, delta, False, pool, workers)
+            _update(distances, targets, candidates, delta, buckets, bucket_heap)
+
+        if budget is not None and not budget.spend(edges_relaxed, len(bucket_heap)):
+            break
+
+    return distances
+
+
+def _relax(
+    arrays: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    frontier: np.ndarray,
+    distances: np.ndarray,
+    delta: float,
+    light: bool,
+    pool: Optional[Pool],
+    workers: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Relax the light or heavy edges of a frontier, splitting it across workers if large."""
+    if pool is None or frontier.size < _PARALLEL_MIN_FRONTIER:
+        return _relax_edges(*arrays, frontier, distances[frontier], delta, light)
+
+    chunks = np.array_split(frontier, workers)
+    results = pool.starmap(
+        _relax_chunk, [(chunk, distances[chunk], delta, light) for chunk in chunks]
+    )
+    targets = np.concatenate([t for t, _ in results])
+    candidates = np.concatenate([c for _, c in results])
+    return _min_per_target(targets, candidates)
+
+
+def _relax_edges(
+    offsets: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    frontier: np.ndarray,
+    frontier_distances: np.ndarray,
+    delta: float,
+    light: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the best tentative distance offered to each target by the frontier's edges."""
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    # Flat indices of all edges leaving the frontier
+    edge_index = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+    edge_weights = weights[edge_index]
+    mask = edge_weights <= delta if light else edge_weights > delta
+
+    candidates = np.repeat(frontier_distances, counts)[mask] + edge_weights[mask]
+    return _min_per_target(targets[edge_index[mask]], candidates)
+
+
+def _min_per_target(targets: np.ndarray, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep only the smallest candidate distance for every target."""
+    if targets.size == 0:
+        return targets, candidates
+    order = np.lexsort((candidates, targets))
+    targets = targets[order]
+    candidates = candidates[order]
+    first = np.empty(targets.size, dtype=bool)
+    first[0] = True
+    np.not_equal(targets[1:], targets[:-1], out=first[1:])
+    return targets[first], candidates[first]
+
+
+def _update(
+    distances: np.ndarray,
+    targets: np.ndarray,
+    candidates: np.ndarray,
+    delta: float,
+    buckets: Dict[int, List[np.ndarray]],
+    bucket_heap: List[int],
+) -> None:
+    """Apply improving candidates and file the improved nodes into their buckets."""
+    improved = candidates < distances[targets]
+    targets = targets[improved]
+    if targets.size == 0:
+        return
+    candidates = candidates[improved]
+    distances[targets] = candidates
+
+    bucket_ids = np.floor(candidates / delta).astype(np.int64)
+    order = np.argsort(bucket_ids, kind="stable")
+    keys, starts = np.unique(bucket_ids[order], return_index=True)
+    for key, nodes in zip(keys.tolist(), np.split(targets[order], starts[1:])):
+        if key not in buckets:
+            buckets[key] = []
+            heapq.heappush(bucket_heap, key)
+        buckets[key].append(nodes)
+
+
+def _init_worker(offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> None:
+    """Store the CSR arrays once per worker process."""
+    global _worker_arrays
+    _worker_arrays = (offsets, targets, weights)
+
+
+def _relax_chunk(
+    frontier: np.ndarray, frontier_distances: np.ndarray, delta: float, light: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Relax one frontier partition inside a worker process."""
+    return _relax_edges(*_worker_arrays, frontier, frontier_distances, delta, light)
@@ -1,5 +1,7 @@
-from typing import Set, Union
+from typing import List, Optional, Set, Union
 from graph import Graph
+from algorithms.budget import Budget
+from algorithms.stats import AlgorithmStats
 
 
 def dfs(graph: Graph, start_node: Union[int, str]) -> None:
@@ -9,16 +11,54 @@ def dfs(graph: Graph, start_node: Union[int, str]) -> None:
     :param graph: The graph instance
     :param start_node: The node ID where DFS should start (can be int or str)
     """
-    visited: Set[Union[int, str]] = set()
-    _dfs_helper(graph, start_node, visited)
+    print(" ".join(str(node) for node in dfs_order(graph, start_node)), end=" ")
 
 
-def _dfs_helper(graph: Graph, node_id: Union[int, str], visited: Set[Union[int, str]]) -> None:
-    """Helper method for DFS traversal."""
-    if node_id not in visited:
-        print(node_id, end=" ")
-        visited.add(node_id)
+def dfs_order(
+    graph: Graph,
+    start_node: Union[int, str],
+    stats: Optional[AlgorithmStats] = None,
+    budget: Optional[Budget] = None,
+) -> List[Union[int, str]]:
+    """
+    Get the nodes in Depth-First Search (DFS) order starting from the given node.
+
+    Uses an explicit stack of edge iterators, so deep graphs don't hit the recursion limit.
+
+    :param graph: The graph instance
+    :param start_node: The node ID where DFS should start (can be int or str)
+    :param stats: Counters to fill in
+    :param budget: Limits checked while searching; on running out the order so far is returned
+    :return: The visited node IDs in visiting order
+    """
+    order: List[Union[int, str]] = [start_node]
+    visited: Set[Union[int, str]] = {start_node}
+    stack = [iter(graph.get_edges(start_node))]
+    edges_relaxed = 0
+    reported = 0
+    peak_frontier = 1
+
+    while stack:
+        for edge in stack[-1]:
+            edges_relaxed += 1
+            neighbor = edge.target.id
+            if neighbor not in visited:
+                visited.add(neighbor)
+                order.append(neighbor)
+                stack.append(iter(graph.get_edges(neighbor)))
+                if len(stack) > peak_frontier:
+                    peak_frontier = len(stack)
+                break
+        else:
+            stack.pop()
+        if budget is not None and edges_relaxed - reported >= budget.check_every:
+            if not budget.spend(edges_relaxed - reported, len(stack)):
+                break
+            reported = edges_relaxed
 
-        # Get all edges from current node
-        for edge in graph.get_edges(node_id):
-            _dfs_helper(graph, edge.target.id, visited)
+    if stats is not None:
+        stats.nodes_settled += len(order)
+        stats.edges_relaxed += edges_relaxed
+        stats.heap_pushes += len(order)  # Every visited node was pushed once
+        stats.peak_frontier = max(stats.peak_frontier, peak_frontier)
+    return order
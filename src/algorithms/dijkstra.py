@@ -1,14 +1,66 @@
-from typing import Dict, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from graph import Graph
+from algorithms.budget import Budget
+from algorithms.stats import AlgorithmStats
 import heapq
 
+# Largest edge weight for which dijkstra picks the bucket queue; the ring holds
+# max_weight + 1 buckets, and past about a hundred the binary heap is as fast
+_DIAL_MAX_WEIGHT = 64
 
-def dijkstra(graph: Graph, start_node: Union[int, str]) -> Dict[Union[int, str], float]:
+
+def dijkstra(
+    graph: Graph,
+    start_node: Union[int, str],
+    stats: Optional[AlgorithmStats] = None,
+    budget: Optional[Budget] = None,
+    weight: Optional[str] = None,
+) -> Dict[Union[int, str], float]:
     """
     Perform Dijkstra's algorithm for shortest paths from the start node.
 
+    Uses a bucket queue (Dial's algorithm) when all edge weights are non-negative
+    integers of at most 64, and a binary heap otherwise, or for a weight column.
+    Larger integer weights, such as travel times in seconds, go to the heap: the
+    bucket queue runs in Python and is no faster than the heap past about a
+    hundred buckets. Call dijkstra_dial directly to force it.
+
     :param graph: The graph instance
     :param start_node: The node ID where the algorithm should start (can be int or str)
+    :param stats: Counters to fill in
+    :param budget: Limits checked while searching; on running out, distances of the
+        nodes not settled yet are upper bounds or infinity
+    :param weight: Name of an edge column used as the weights instead of Edge.weight
+    :return: A dictionary containing the shortest distances to all nodes
+    :raises: ValueError if start_node doesn't exist in graph
+    """
+    if start_node not in graph.nodes:
+        raise ValueError(f"Start node {start_node} not found in graph")
+
+    if weight is not None:
+        return dijkstra_heap(graph, start_node, stats, budget, weight)
+    max_weight = graph.max_integer_weight()
+    if max_weight is not None and max_weight <= _DIAL_MAX_WEIGHT:
+        return dijkstra_dial(graph, start_node, max_weight, stats, budget)
+    return dijkstra_heap(graph, start_node, stats, budget)
+
+
+def dijkstra_heap(
+    graph: Graph,
+    start_node: Union[int, str],
+    stats: Optional[AlgorithmStats] = None,
+    budget: Optional[Budget] = None,
+    weight: Optional[str] = None,
+) -> Dict[Union[int, str], float]:
+    """
+    Perform Dijkstra's algorithm using a binary heap as the priority queue.
+
+    :param graph: The graph instance
+    :param start_node: The node ID where the algorithm should start (can be int or str)
+    :param stats: Counters to fill in
+    :param budget: Limits checked while searching; on running out, distances of the
+        nodes not settled yet are upper bounds or infinity
+    :param weight: Name of an edge column used as the weights instead of Edge.weight
     :return: A dictionary containing the shortest distances to all nodes
     :raises: ValueError if start_node doesn't exist in graph
     """
@@ -18,6 +70,8 @@ def dijkstra(graph: Graph, start_node: Union[int, str]) -> Dict[Union[int, str],
     # Initialize distances with infinity
     distances: Dict[Union[int, str], float] = {node.id: float("inf") for node in graph.node_list}
     distances[start_node] = 0
+    # Column values by Edge.index, as a list for fast scalar access
+    weights = None if weight is None else graph.edge_columns[weight].tolist()
 
     # Priority queue: (distance, node_id)
     priority_queue = []
@@ -25,6 +79,10 @@ def dijkstra(graph: Graph, start_node: Union[int, str]) -> Dict[Union[int, str],
 
     # Set of visited nodes for optimization
     visited = set()
+    edges_relaxed = 0
+    reported = 0
+    heap_pushes = 1
+    peak_frontier = 1
 
     while priority_queue:
         current_distance, current_node = heapq.heappop(priority_queue)
@@ -37,12 +95,239 @@ def dijkstra(graph: Graph, start_node: Union[int, str]) -> Dict[Union[int, str],
 
         # Explore all edges from current node
         for edge in graph.get_edges(current_node):
+            edges_relaxed += 1
             neighbor = edge.target.id
-            distance = current_distance + edge.weight
+            distance = current_distance + (edge.weight if weights is None else weights[edge.index])
 
             # If found a shorter path to neighbor
             if distance < distances[neighbor]:
                 distances[neighbor] = distance
                 heapq.heappush(priority_queue, (distance, neighbor))
+                heap_pushes += 1
+        if len(priority_queue) > peak_frontier:
+            peak_frontier = len(priority_queue)
+        if budget is not None and edges_relaxed - reported >= budget.check_every:
+            if not budget.spend(edges_relaxed - reported, len(priority_queue)):
+                break
+            reported = edges_relaxed
 
+    _record(stats, len(visited), edges_relaxed, heap_pushes, peak_frontier)
     return distances
+
+
+def dijkstra_dial(
+    graph: Graph,
+    start_node: Union[int, str],
+    max_weight: Optional[int] = None,
+    stats: Optional[AlgorithmStats] = None,
+    budget: Optional[Budget] = None,
+) -> Dict[Union[int, str], float]:
+    """
+    Perform Dijkstra's algorithm using a bucket queue (Dial's algorithm).
+
+    Requires non-negative integer edge weights. Pending nodes are kept in a ring
+    of ``max_weight + 1`` buckets indexed by distance, so every queue operation
+    is a list append or pop and no tuples are allocated.
+
+    :param graph: The graph instance
+    :param start_node: The node ID where the algorithm should start (can be int or str)
+    :param max_weight: The largest edge weight, computed from the graph if omitted
+    :param stats: Counters to fill in; pending bucket entries count as the frontier
+    :param budget: Limits checked while searching; on running out, distances of the
+        nodes not settled yet are upper bounds or infinity
+    :return: A dictionary containing the shortest distances to all nodes
+    :raises: ValueError if start_node doesn't exist in graph or a weight is not a non-negative integer
+    """
+    if start_node not in graph.nodes:
+        raise ValueError(f"Start node {start_node} not found in graph")
+    if max_weight is None:
+        max_weight = graph.max_integer_weight()
+        if max_weight is None:
+            raise ValueError("Edge weights must be non-negative integers")
+
+    distances: Dict[Union[int, str], float] = {node.id: float("inf") for node in graph.node_list}
+    distances[start_node] = 0
+
+    # All pending distances lie in [current, current + max_weight], so the ring never collides
+    size = max_weight + 1
+    buckets: List[List[Union[int, str]]] = [[] for _ in range(size)]
+    buckets[0].append(start_node)
+    # Distances of the non-empty buckets, so runs of empty buckets are skipped
+    levels = [0]
+    pending = 1
+
+    visited = set()
+    edges_relaxed = 0
+    reported = 0
+    pushes = 1
+    peak_frontier = 1
+
+    while levels:
+        current = heapq.heappop(levels)
+        bucket = buckets[current % size]
+        while bucket:
+            current_node = bucket.pop()
+            pending -= 1
+
+            # Stale entry: the node was settled from a smaller bucket
+            if current_node in visited:
+                continue
+
+            visited.add(current_node)
+            current_distance = distances[current_node]
+
+            for edge in graph.get_edges(current_node):
+                edges_relaxed += 1
+                neighbor = edge.target.id
+                distance = current_distance + edge.weight
+
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    target_bucket = buckets[int(distance) % size]
+                    if not target_bucket:
+                        heapq.heappush(levels, int(distance))
+                    target_bucket.append(neighbor)
+                    pending += 1
+                    pushes += 1
+            if pending > peak_frontier:
+                peak_frontier = pending
+            if budget is not None and edges_relaxed - reported >= budget.check_every:
+                if not budget.spend(edges_relaxed - reported, pending):
+                    break
+                reported = edges_relaxed
+        if budget is not None and budget.exhausted:
+            break
+
+    _record(stats, len(visited), edges_relaxed, pushes, peak_frontier)
+    return distances
+
+
+def shortest_paths_batch(
+    graph: Graph,
+    source_node: Union[int, str],
+    targets: Iterable[Union[int, str]],
+    stats: Optional[AlgorithmStats] = None,
+    budget: Optional[Budget] = None,
+) -> Dict[Union[int, str], List[Union[int, str]]]:
+    """
+    Find shortest paths from one source to many targets with a single Dijkstra search.
+
+    The search stops as soon as every target is settled and all paths are read
+    from the shared predecessor tree. Only visited nodes are stored, so there is
+    no per-query initialisation over the whole graph.
+
+    :param graph: The graph instance
+    :param source_node: The node ID where the paths start
+    :param targets: The node IDs to find paths to
+    :param stats: Counters to fill in
+    :param budget: Limits checked while searching; on running out, the paths of
+        targets not settled yet are empty
+    :return: A dictionary mapping each target to its path (empty if unreachable)
+    :raises: ValueError if source_node or a target doesn't exist in graph
+    """
+    if source_node not in graph.nodes:
+        raise ValueError(f"Start node {source_node} not found in graph")
+    targets = list(targets)
+    for target in targets:
+        if target not in graph.nodes:
+            raise ValueError(f"Goal node {target} not found in graph")
+
+    remaining = set(targets)
+    distances: Dict[Union[int, str], float] = {source_node: 0}
+    came_from: Dict[Union[int, str], Union[int, str]] = {}
+    visited = set()
+    inf = float("inf")
+
+    priority_queue = [(0, source_node)]
+    edges_relaxed = 0
+    reported = 0
+    heap_pushes = 1
+    peak_frontier = 1
+
+    while priority_queue and remaining:
+        current_distance, current_node = heapq.heappop(priority_queue)
+        if current_node in visited:
+            continue
+
+        visited.add(current_node)
+        remaining.discard(current_node)
+        if not remaining:
+            break
+
+        for edge in graph.get_edges(current_node):
+            edges_relaxed += 1
+            neighbor = edge.target.id
+            distance = current_distance + edge.weight
+
+            if distance < distances.get(neighbor, inf):
+                distances[neighbor] = distance
+                came_from[neighbor] = current_node
+                heapq.heappush(priority_queue, (distance, neighbor))
+                heap_pushes += 1
+        if len(priority_queue) > peak_frontier:
+            peak_frontier = len(priority_queue)
+        if budget is not None and edges_relaxed - reported >= budget.check_every:
+            if not budget.spend(edges_relaxed - reported, len(priority_queue)):
+                break
+            reported = edges_relaxed
+
+    _record(stats, len(visited), edges_relaxed, heap_pushes, peak_frontier)
+
+    paths: Dict[Union[int, str], List[Union[int, str]]] = {}
+    for target in targets:
+        if target not in visited:
+            paths[target] = []
+            continue
+        path = [target]
+        while path[-1] != source_node:
+            path.append(came_from[path[-1]])
+        paths[target] = path[::-1]
+    return paths
+
+
+def shortest_paths_many(
+    graph: Graph,
+    pairs: Iterable[Tuple[Union[int, str], Union[int, str]]],
+    stats: Optional[AlgorithmStats] = None,
+    budget: Optional[Budget] = None,
+) -> Dict[Tuple[Union[int, str], Union[int, str]], List[Union[int, str]]]:
+    """
+    Answer many (source, target) path queries with one search per distinct source.
+
+    :param graph: The graph instance
+    :param pairs: The (source, target) node ID pairs to find paths for
+    :param stats: Counters to fill in, summed over all searches
+    :param budget: Limits shared by all searches; on running out, the paths of
+        the pairs not answered yet are empty
+    :return: A dictionary mapping each pair to its path (empty if unreachable)
+    :raises: ValueError if a node doesn't exist in graph
+    """
+    by_source: Dict[Union[int, str], List[Union[int, str]]] = {}
+    for source_node, target in pairs:
+        by_source.setdefault(source_node, []).append(target)
+
+    paths: Dict[Tuple[Union[int, str], Union[int, str]], List[Union[int, str]]] = {}
+    for source_node, targets in by_source.items():
+        if budget is not None and budget.exhausted:
+            for target in targets:
+                paths[(source_node, target)] = []
+            continue
+        batch = shortest_paths_batch(graph, source_node, targets, stats, budget)
+        for target, path in batch.items():
+            paths[(source_node, target)] = path
+    return paths
+
+
+def _record(
+    stats: Optional[AlgorithmStats],
+    nodes_settled: int,
+    edges_relaxed: int,
+    heap_pushes: int,
+    peak_frontier: int,
+) -> None:
+    """Add the counters of one search to stats, if given."""
+    if stats is not None:
+        stats.nodes_settled += nodes_settled
+        stats.edges_relaxed += edges_relaxed
+        stats.heap_pushes += heap_pushes
+        stats.peak_frontier = max(stats.peak_frontier, peak_frontier)
@@ -0,0 +1,163 @@
+from collections import deque
+from typing import Dict, List, NamedTuple, Set, Tuple, Union
+from graph import Graph
+import numpy as np
+
+
+class MaxFlowResult(NamedTuple):
+    """Result of a maximum-flow computation"""
+
+    value: float
+    flows: Dict[Tuple[Union[int, str], Union[int, str]], float]
+    source_side: Set[Union[int, str]]
+    sink_side: Set[Union[int, str]]
+
+
+def max_flow(
+    graph: Graph, source_node: Union[int, str], sink_node: Union[int, str]
+) -> MaxFlowResult:
+    """
+    Compute a maximum flow and minimum cut with Dinic's algorithm.
+
+    Edge weights are used as capacities. The residual network is stored as flat
+    arrays: arc ``2 * i`` is the i-th edge of the graph and arc ``2 * i + 1`` its
+    reverse, so the partner of any arc ``a`` is ``a ^ 1``. Undirected edges are
+    stored in both directions by ``Graph``, so each direction gets its own capacity.
+
+    :param graph: The graph instance
+    :param source_node: The node ID flow leaves from
+    :param sink_node: The node ID flow arrives at
+    :return: The flow value, the flow on each (source, target) pair of nodes with
+        parallel edges summed, and the two sides of a minimum cut
+    :raises: ValueError if a node doesn't exist, source equals sink or a capacity is negative
+    """
+    if source_node not in graph.nodes:
+        raise ValueError(f"Source node {source_node} not found in graph")
+    if sink_node not in graph.nodes:
+        raise ValueError(f"Sink node {sink_node} not found in graph")
+    if source_node == sink_node:
+        raise ValueError("Source and sink must be different nodes")
+
+    ids = list(graph.nodes)
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    tails = [index[e.source.id] for edges in graph.edges.values() for e in edges]
+    heads = [index[e.target.id] for edges in graph.edges.values() for e in edges]
+    capacities = [e.weight for edges in graph.edges.values() for e in edges]
+    if any(c < 0 for c in capacities):
+        raise ValueError("Edge capacities must be non-negative")
+
+    n = len(ids)
+    m = len(tails)
+
+    # Arc arrays: forward arcs on even slots, reverse arcs on odd slots
+    arc_tail = np.empty(2 * m, dtype=np.int64)
+    arc_tail[0::2] = tails
+    arc_tail[1::2] = heads
+    arc_head = np.empty(2 * m, dtype=np.int64)
+    arc_head[0::2] = heads
+    arc_head[1::2] = tails
+    arc_cap = np.zeros(2 * m, dtype=np.float64)
+    arc_cap[0::2] = capacities
+
+    # Group arcs by tail node (CSR layout)
+    order = np.argsort(arc_tail, kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(arc_tail, minlength=n), out=offsets[1:])
+
+    # Plain lists are much faster than NumPy arrays for scalar access in the loops below
+    adj: List[int] = order.tolist()
+    start: List[int] = offsets.tolist()
+    head: List[int] = arc_head.tolist()
+    residual: List[float] = arc_cap.tolist()
+
+    s = index[source_node]
+    t = index[sink_node]
+    value = 0.0
+
+    while True:
+        level = _bfs_levels(n, s, adj, start, head, residual)
+        if level[t] < 0:
+            break
+        value += _blocking_flow(s, t, level, adj, start, head, residual)
+
+    source_side = {ids[i] for i, lvl in enumerate(level) if lvl >= 0}
+    sink_side = {node_id for node_id in ids if node_id not in source_side}
+
+    flows: Dict[Tuple[Union[int, str], Union[int, str]], float] = {}
+    for i in range(m):
+        key = (ids[tails[i]], ids[heads[i]])
+        flows[key] = flows.get(key, 0.0) + residual[2 * i + 1]
+
+    return MaxFlowResult(value, flows, source_side, sink_side)
+
+
+def _bfs_levels(
+    n: int, s: int, adj: List[int], start: List[int], head: List[int], residual: List[float]
+) -> List[int]:
+    """Build the level graph: BFS distance from s over arcs with residual capacity."""
+    level = [-1] * n
+    level[s] = 0
+    queue = deque([s])
+    while queue:
+        u = queue.popleft()
+        next_level = level[u] + 1
+        for k in range(start[u], start[u + 1]):
+            a = adj[k]
+            v = head[a]
+            if level[v] < 0 and residual[a] > 0:
+                level[v] = next_level
+                queue.append(v)
+    return level
+
+
+def _blocking_flow(
+    s: int,
+    t: int,
+    level: List[int],
+    adj: List[int],
+    start: List[int],
+    head: List[int],
+    residual: List[float],
+) -> float:
+    """Saturate the level graph with an iterative DFS using current-arc pointers."""
+    pointer = start[:-1]
+    path: List[int] = []
+    total = 0.0
+    u = s
+
+    while True:
+        if u == t:
+            pushed = min(residual[a] for a in path)
+            total += pushed
+            cut = len(path)
+            for i, a in enumerate(path):
+                residual[a] -= pushed
+                residual[a ^ 1] += pushed
+                if residual[a] <= 0 and i < cut:
+                    cut = i
+            # Retreat to the tail of the first saturated arc
+            del path[cut:]
+            u = head[path[-1]] if path else s
+            continue
+
+        end = start[u + 1]
+        k = pointer[u]
+        next_level = level[u] + 1
+        while k < end:
+            a = adj[k]
+            if residual[a] > 0 and level[head[a]] == next_level:
+                break
+            k += 1
+        pointer[u] = k
+
+        if k < end:
+            path.append(adj[k])
+            u = head[adj[k]]
+        elif u == s:
+            return total
+        else:
+            # Dead end: prune the node and advance the parent's pointer
+            level[u] = -1
+            path.pop()
+            u = head[path[-1]] if path else s
+            pointer[u] += 1
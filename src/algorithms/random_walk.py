@@ -0,0 +1,213 @@
+from collections import deque
+from typing import Iterator, Optional, Tuple, Union
+from multiprocessing import Pool
+from array_graph import ArrayGraph
+from graph import Graph
+import numpy as np
+
+# Sampler used by worker processes, set once per worker by _init_worker
+_worker_walker: Optional["RandomWalker"] = None
+
+
+class RandomWalker:
+    """Random walk generator with weight-proportional and node2vec-biased steps"""
+
+    def __init__(self, graph: Union[Graph, ArrayGraph], p: float = 1.0, q: float = 1.0):
+        """
+        Precompute the alias tables used to sample edges in O(1).
+
+        Walks are sequences of node indices into ``self.ids``. Each step picks an
+        edge with probability proportional to its weight; with ``p`` or ``q``
+        different from 1 the step is biased as in node2vec and drawn by rejection
+        sampling from the same tables, so no per-edge-pair tables are needed.
+
+        :param graph: The graph instance or its array form; weights must be non-negative
+        :param p: Return parameter, a low value makes walks step back more often
+        :param q: In-out parameter, a low value makes walks move away from the previous node
+        :raises: ValueError if p or q is not positive or a weight is negative
+        """
+        if p <= 0 or q <= 0:
+            raise ValueError("p and q must be positive")
+        array_graph = graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph)
+        if array_graph.num_edges and array_graph.weights.min() < 0:
+            raise ValueError("Edge weights must be non-negative")
+
+        self.ids = array_graph.ids
+        self.p = p
+        self.q = q
+        self.offsets = array_graph.offsets
+        self.targets = array_graph.targets
+        self.probabilities, self.aliases = _alias_tables(array_graph.offsets, array_graph.weights)
+        self._biased = p != 1.0 or q != 1.0
+
+    def walks(
+        self,
+        walk_length: int,
+        walks_per_node: int = 1,
+        batch_size: int = 4096,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        Generate walks lazily, in batches.
+
+        Each round starts one walk from every node in a shuffled order. Walks that
+        reach a node without outgoing edges are padded with -1. Every batch has its
+        own seed derived from ``seed``, so the output is the same for any number of
+        workers.
+
+        :param walk_length: Number of nodes in every walk, including the start node
+        :param walks_per_node: Number of rounds over all nodes
+        :param batch_size: Number of walks per yielded array
+        :param seed: Seed for the start order and all steps
+        :param workers: Number of worker processes generating batches in parallel
+        :return: An iterator of int64 arrays of shape (walks in batch, walk_length)
+        """
+        tasks = self._tasks(walks_per_node, batch_size, seed)
+        if workers is None or workers <= 1:
+            for starts, batch_seed in tasks:
+                yield self.walk_batch(starts, walk_length, batch_seed)
+            return
+
+        # Keep a bounded number of batches in flight so memory stays flat
+        with Pool(workers, initializer=_init_worker, initargs=(self,)) as pool:
+            pending: deque = deque()
+            for starts, batch_seed in tasks:
+                pending.append(pool.apply_async(_walk_batch, (starts, walk_length, batch_seed)))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+
+    def walk_batch(
+        self, starts: np.ndarray, walk_length: int, seed: Union[int, np.random.SeedSequence, None]
+    ) -> np.ndarray:
+        """
+        Generate one walk from each start node.
+
+        :param starts: Start node indices
+        :param walk_length: Number of nodes in every walk, including the start node
+        :param seed: Seed for the steps
+        :return: An int64 array of shape (len(starts), walk_length)
+        """
+        rng = np.random.default_rng(seed)
+        walks = np.full((starts.shape[0], walk_length), -1, dtype=np.int64)
+        if walk_length == 0:
+            return walks
+        walks[:, 0] = starts
+
+        active = np.arange(starts.shape[0])
+        for step in range(1, walk_length):
+            current = walks[active, step - 1]
+            degrees = self.offsets[current + 1] - self.offsets[current]
+            active = active[degrees > 0]
+            if active.size == 0:
+                break
+            if self._biased and step > 1:
+                walks[active, step] = self._biased_step(
+                    walks[active, step - 1], walks[active, step - 2], rng
+                )
+            else:
+                walks[active, step] = self.targets[self._sample_edges(walks[active, step - 1], rng)]
+        return walks
+
+    def _sample_edges(self, nodes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Pick one outgoing edge of every node with weight-proportional probability."""
+        start = self.offsets[nodes]
+        degrees = self.offsets[nodes + 1] - start
+        edges = start + (rng.random(nodes.shape[0]) * degrees).astype(np.int64)
+        keep = rng.random(nodes.shape[0]) < self.probabilities[edges]
+        return np.where(keep, edges, self.aliases[edges])
+
+    def _biased_step(
+        self, nodes: np.ndarray, previous: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        """Take one node2vec step by rejection sampling against the largest bias."""
+        result = np.empty(nodes.shape[0], dtype=np.int64)
+        max_bias = max(1.0 / self.p, 1.0, 1.0 / self.q)
+        pending = np.arange(nodes.shape[0])
+
+        while pending.size:
+            candidates = self.targets[self._sample_edges(nodes[pending], rng)]
+            back = previous[pending]
+            bias = np.where(self._has_edges(back, candidates), 1.0, 1.0 / self.q)
+            bias[candidates == back] = 1.0 / self.p
+
+            accept = rng.random(pending.shape[0]) * max_bias < bias
+            result[pending[accept]] = candidates[accept]
+            pending = pending[~accept]
+        return result
+
+    def _has_edges(self, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Test for every pair whether an edge source -> target exists."""
+        # Binary search inside each source's row, whose targets are sorted
+        low = self.offsets[sources]
+        high = self.offsets[sources + 1]
+        end = high.copy()
+        last = self.targets.shape[0] - 1
+        searching = low < high
+        while searching.any():
+            middle = (low + high) // 2
+            right = searching & (self.targets[np.minimum(middle, last)] < targets)
+            low = np.where(right, middle + 1, low)
+            high = np.where(searching & ~right, middle, high)
+            searching = low < high
+        return (low < end) & (self.targets[np.minimum(low, last)] == targets)
+
+    def _tasks(
+        self, walks_per_node: int, batch_size: int, seed: Optional[int]
+    ) -> Iterator[Tuple[np.ndarray, np.random.SeedSequence]]:
+        """Yield (start nodes, seed) for every batch, one shuffled round at a time."""
+        seed_sequence = np.random.SeedSequence(seed)
+        n = len(self.ids)
+        for _ in range(walks_per_node):
+            (round_seed,) = seed_sequence.spawn(1)
+            order = np.random.default_rng(round_seed).permutation(n)
+            for begin in range(0, n, batch_size):
+                end = begin + batch_size
+                (batch_seed,) = seed_sequence.spawn(1)
+                yield order[begin:end], batch_seed
+
+
+def _alias_tables(offsets: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Build per-node alias tables (Vose's method) laid out along the CSR edge arrays."""
+    num_edges = weights.shape[0]
+    probabilities = np.ones(num_edges)
+    aliases = np.arange(num_edges, dtype=np.int64)
+    if num_edges == 0:
+        return probabilities, aliases
+
+    # Rows with equal weights are already uniform; only the others need a table
+    n = offsets.shape[0] - 1
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    row_max = np.full(n, -np.inf)
+    row_min = np.full(n, np.inf)
+    np.maximum.at(row_max, sources, weights)
+    np.minimum.at(row_min, sources, weights)
+
+    offset_list = offsets.tolist()
+    for node in np.flatnonzero(row_max > row_min).tolist():
+        start, end = offset_list[node], offset_list[node + 1]
+        row = weights[start:end]
+        scaled = (row * (row.shape[0] / row.sum())).tolist()
+        small = [k for k, value in enumerate(scaled) if value < 1.0]
+        large = [k for k, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probabilities[start + less] = scaled[less]
+            aliases[start + less] = start + more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+    return probabilities, aliases
+
+
+def _init_worker(walker: RandomWalker) -> None:
+    """Store the sampler once per worker process."""
+    global _worker_walker
+    _worker_walker = walker
+
+
+def _walk_batch(starts: np.ndarray, walk_length: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Generate one batch of walks inside a worker process."""
+    return _worker_walker.walk_batch(starts, walk_length, seed)
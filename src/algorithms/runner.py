@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set
+import inspect
+import time
+from algorithms.astar import a_star
+from algorithms.bfs import bfs_order
+from algorithms.clustering import clustering, transitivity, triangles
+from algorithms.community import label_propagation, louvain
+from algorithms.delta_stepping import delta_stepping
+from algorithms.dfs import dfs_order
+from algorithms.dijkstra import dijkstra, shortest_paths_batch
+from algorithms.max_flow import max_flow
+from algorithms.stats import AlgorithmStats
+
+# Registered algorithms by name; each is called as function(graph, **params)
+ALGORITHMS: Dict[str, Callable[..., Any]] = {}
+
+# Names of the registered algorithms that fill in an AlgorithmStats
+_WITH_STATS: Set[str] = set()
+
+
+@dataclass
+class AlgorithmResult:
+    """Output of an algorithm run together with its metrics"""
+
+    name: str
+    output: Any
+    stats: Optional[AlgorithmStats]  # None if the algorithm keeps no counters
+    elapsed: float  # Wall-clock seconds
+    cpu_time: float  # CPU seconds of this process
+    complete: bool = True  # False if a budget ran out and the output is partial
+
+
+def register(name: str, function: Callable[..., Any]) -> None:
+    """
+    Register an algorithm under a name, replacing any previous one.
+
+    :param name: The name to run the algorithm by
+    :param function: Called as function(graph, **params); a ``stats`` parameter is
+        passed a fresh AlgorithmStats on every run
+    """
+    ALGORITHMS[name] = function
+    if "stats" in inspect.signature(function).parameters:
+        _WITH_STATS.add(name)
+    else:
+        _WITH_STATS.discard(name)
+
+
+def run(name: str, graph: Any, **params: Any) -> AlgorithmResult:
+    """
+    Run a registered algorithm and measure it.
+
+    :param name: The registered algorithm name
+    :param graph: The graph to run on
+    :param params: Keyword arguments for the algorithm, e.g. start_node or budget
+    :return: The algorithm output, its counters and timings
+    :raises: ValueError if no algorithm is registered under name
+    """
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {name}")
+
+    stats = AlgorithmStats() if name in _WITH_STATS else None
+    if stats is not None:
+        params["stats"] = stats
+
+    start_time = time.perf_counter()
+    start_cpu = time.process_time()
+    output = ALGORITHMS[name](graph, **params)
+    cpu_time = time.process_time() - start_cpu
+    elapsed = time.perf_counter() - start_time
+
+    budget = params.get("budget")
+    complete = budget is None or not budget.exhausted
+    return AlgorithmResult(name, output, stats, elapsed, cpu_time, complete)
+
+
+register("bfs", bfs_order)
+register("dfs", dfs_order)
+register("dijkstra", dijkstra)
+register("a_star", a_star)
+register("shortest_paths_batch", shortest_paths_batch)
+register("delta_stepping", delta_stepping)
+register("max_flow", max_flow)
+register("triangles", triangles)
+register("clustering", clustering)
+register("transitivity", transitivity)
+register("label_propagation", label_propagation)
+register("louvain", louvain)
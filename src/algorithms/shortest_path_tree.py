@@ -0,0 +1,219 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from graph import Graph
+import heapq
+
+
+class ShortestPathTree:
+    """
+    Shortest-path tree from a fixed source that is repaired as the graph changes.
+
+    The tree subscribes to the graph's mutation events. Weight decreases and edge
+    insertions propagate improvements from the changed edge with a Dijkstra seeded
+    at its head; weight increases and deletions of tree edges reset only the
+    subtree below the edge and rebuild it from its unaffected in-neighbours
+    (Ramalingam-Reps). Repair cost depends on the affected region, not on the graph size.
+    """
+
+    def __init__(self, graph: Graph, source_node: Union[int, str]):
+        """
+        Build the tree and start following the graph's changes.
+
+        :param graph: The graph instance; edge weights must be non-negative
+        :param source_node: The node ID the shortest paths start from
+        :raises: ValueError if source_node doesn't exist in graph
+        """
+        if source_node not in graph.nodes:
+            raise ValueError(f"Source node {source_node} not found in graph")
+
+        self.graph = graph
+        self.source = source_node
+        self.distances: Dict[Union[int, str], float] = {}
+        self.parents: Dict[Union[int, str], Optional[Union[int, str]]] = {}
+        self._children: Dict[Union[int, str], Set[Union[int, str]]] = {}
+        # In-neighbours of every node; entries for removed edges are dropped lazily
+        self._incoming: Dict[Union[int, str], Set[Union[int, str]]] = {}
+
+        inf = float("inf")
+        for node_id in graph.nodes:
+            self.distances[node_id] = inf
+            self.parents[node_id] = None
+            self._children[node_id] = set()
+            self._incoming[node_id] = set()
+        for edges in graph.edges.values():
+            for edge in edges:
+                self._incoming[edge.target.id].add(edge.source.id)
+
+        self.distances[source_node] = 0
+        self._propagate([(0, source_node)])
+        graph.subscribe(self._on_change)
+
+    def close(self) -> None:
+        """Stop following the graph's changes"""
+        self.graph.unsubscribe(self._on_change)
+
+    def distance(self, node_id: Union[int, str]) -> float:
+        """Get the shortest distance from the source to a node"""
+        return self.distances[node_id]
+
+    def path_to(self, node_id: Union[int, str]) -> List[Union[int, str]]:
+        """Get the shortest path from the source to a node, or an empty list if unreachable"""
+        if self.distances.get(node_id, float("inf")) == float("inf"):
+            return []
+        path = [node_id]
+        while path[-1] != self.source:
+            path.append(self.parents[path[-1]])
+        return path[::-1]
+
+    def _on_change(self, event: str, *args: Any) -> None:
+        """Dispatch a graph mutation event to the matching repair."""
+        if event == "add_node":
+            node_id = args[0]
+            self.distances[node_id] = float("inf")
+            self.parents[node_id] = None
+            self._children[node_id] = set()
+            self._incoming[node_id] = set()
+        elif event == "add_edge":
+            for source_id, target_id in self._arcs(args[0], args[1]):
+                self._incoming[target_id].add(source_id)
+                self._edge_decreased(source_id, target_id)
+        elif event == "set_edge_weight":
+            for source_id, target_id in self._arcs(args[0], args[1]):
+                if self._edge_decreased(source_id, target_id):
+                    continue
+                if (
+                    self.parents[target_id] == source_id
+                    and self.distances[source_id] + self._weight(source_id, target_id)
+                    > self.distances[target_id]
+                ):
+                    self._repair([target_id])
+        elif event == "remove_edge":
+            orphans = [
+                target_id
+                for source_id, target_id in self._arcs(args[0], args[1])
+                if target_id in self.parents and self.parents[target_id] == source_id
+            ]
+            self._repair(orphans)
+        elif event == "remove_node":
+            self._remove_node(args[0])
+
+    def _arcs(
+        self, source_id: Union[int, str], target_id: Union[int, str]
+    ) -> List[Tuple[Union[int, str], Union[int, str]]]:
+        """Directed arcs affected by a change of the edge between two nodes."""
+        if self.graph.directed or source_id == target_id:
+            return [(source_id, target_id)]
+        return [(source_id, target_id), (target_id, source_id)]
+
+    def _weight(self, source_id: Union[int, str], target_id: Union[int, str]) -> float:
+        """Smallest weight among the current edges from source to target."""
+        return min(
+            (e.weight for e in self.graph.get_edges(source_id) if e.target.id == target_id),
+            default=float("inf"),
+        )
+
+    def _edge_decreased(self, source_id: Union[int, str], target_id: Union[int, str]) -> bool:
+        """Propagate an improvement through an edge, returning whether there was one."""
+        distance = self.distances[source_id] + self._weight(source_id, target_id)
+        if distance < self.distances[target_id]:
+            self.distances[target_id] = distance
+            self._set_parent(target_id, source_id)
+            self._propagate([(distance, target_id)])
+            return True
+        return False
+
+    def _remove_node(self, node_id: Union[int, str]) -> None:
+        """Forget a removed node and rebuild the subtree it was holding up."""
+        orphans = list(self._children.pop(node_id, ()))
+        self._set_parent(node_id, None)
+        for orphan in orphans:
+            self.parents[orphan] = None
+        del self.distances[node_id]
+        del self.parents[node_id]
+        del self._incoming[node_id]
+
+        if node_id == self.source:
+            # Nothing is reachable any more
+            self._reset(self._subtree(orphans))
+        else:
+            self._repair(orphans)
+
+    def _repair(self, roots: Iterable[Union[int, str]]) -> None:
+        """Recompute the subtrees under roots whose tree edge got longer or disappeared."""
+        affected = self._subtree(roots)
+        if not affected:
+            return
+        self._reset(affected)
+
+        # Seed every affected node with its best edge from the unaffected part of the tree
+        inf = float("inf")
+        seeds = []
+        for node_id in affected:
+            best = inf
+            best_parent = None
+            incoming = self._incoming[node_id]
+            for neighbor in list(incoming):
+                if neighbor in affected:
+                    continue
+                if neighbor not in self.distances:
+                    incoming.discard(neighbor)
+                    continue
+                weight = self._weight(neighbor, node_id)
+                if weight == inf:
+                    incoming.discard(neighbor)
+                    continue
+                distance = self.distances[neighbor] + weight
+                if distance < best:
+                    best = distance
+                    best_parent = neighbor
+            if best_parent is not None:
+                self.distances[node_id] = best
+                self._set_parent(node_id, best_parent)
+                seeds.append((best, node_id))
+
+        self._propagate(seeds)
+
+    def _subtree(self, roots: Iterable[Union[int, str]]) -> Set[Union[int, str]]:
+        """Collect the given nodes and all their descendants in the tree."""
+        affected: Set[Union[int, str]] = set()
+        stack = list(roots)
+        while stack:
+            node_id = stack.pop()
+            if node_id not in affected:
+                affected.add(node_id)
+                stack.extend(self._children[node_id])
+        return affected
+
+    def _reset(self, nodes: Set[Union[int, str]]) -> None:
+        """Mark nodes as unreachable and detach them from the tree."""
+        inf = float("inf")
+        for node_id in nodes:
+            self._set_parent(node_id, None)
+            self.distances[node_id] = inf
+
+    def _set_parent(self, node_id: Union[int, str], parent: Optional[Union[int, str]]) -> None:
+        """Move a node under a new parent in the tree."""
+        old_parent = self.parents.get(node_id)
+        if old_parent is not None and old_parent in self._children:
+            self._children[old_parent].discard(node_id)
+        self.parents[node_id] = parent
+        if parent is not None:
+            self._children[parent].add(node_id)
+
+    def _propagate(self, seeds: List[Tuple[float, Union[int, str]]]) -> None:
+        """Run Dijkstra from seeded nodes, improving distances and parents as it goes."""
+        priority_queue = list(seeds)
+        heapq.heapify(priority_queue)
+        distances = self.distances
+
+        while priority_queue:
+            current_distance, current_node = heapq.heappop(priority_queue)
+            if current_distance > distances[current_node]:
+                continue
+
+            for edge in self.graph.get_edges(current_node):
+                neighbor = edge.target.id
+                distance = current_distance + edge.weight
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    self._set_parent(neighbor, current_node)
+                    heapq.heappush(priority_queue, (distance, neighbor))
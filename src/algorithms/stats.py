@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class AlgorithmStats:
+    """Work counters filled in by an algorithm run"""
+
+    nodes_settled: int = 0  # Nodes whose result became final
+    edges_relaxed: int = 0  # Edges examined
+    heap_pushes: int = 0  # Insertions into the queue, stack or heap
+    peak_frontier: int = 0  # Largest size of the queue, stack or heap
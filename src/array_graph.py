@@ -0,0 +1,149 @@
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+from graph import Graph
+
+
+class ArrayGraph:
+    """Frozen array form of a graph in CSR (compressed sparse row) layout"""
+
+    def __init__(
+        self,
+        ids: Sequence[Union[int, str]],
+        offsets: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        directed: bool = False,
+        index: Optional[Dict[Union[int, str], int]] = None,
+    ):
+        """
+        Initialize an array graph.
+
+        :param ids: Node IDs; node ``i`` of the arrays is ``ids[i]``
+        :param offsets: Row offsets, the edges of node ``i`` are ``offsets[i]:offsets[i + 1]``
+        :param targets: Target node index of every edge
+        :param weights: Weight of every edge
+        :param directed: Whether the graph is directed
+        :param index: Mapping from node ID to node index, built from ids if omitted
+        """
+        self.directed = directed
+        self.ids: List[Union[int, str]] = list(ids)
+        if index is None:
+            index = {node_id: i for i, node_id in enumerate(self.ids)}
+        self.index: Dict[Union[int, str], int] = index
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_graph(cls, graph: Graph, weight: Optional[str] = None) -> "ArrayGraph":
+        """
+        Build the array form of a graph.
+
+        Nodes keep the insertion order of ``graph.nodes``; the edges of every node
+        are sorted by target index. Undirected edges are stored in both directions,
+        as in ``Graph``.
+
+        :param graph: The graph to convert
+        :param weight: Name of an edge column used as the weights instead of Edge.weight
+        """
+        ids = list(graph.nodes)
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        rows = [graph.edges[node] for node in graph.nodes.values()]
+
+        degrees = np.array([len(edges) for edges in rows], dtype=np.int64)
+        targets = np.array([index[e.target.id] for edges in rows for e in edges], dtype=np.int64)
+        if weight is None:
+            weights = np.array([e.weight for edges in rows for e in edges], dtype=np.float64)
+        else:
+            slots = np.array([e.index for edges in rows for e in edges], dtype=np.int64)
+            weights = graph.edge_columns.get(weight, slots).astype(np.float64)
+
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+
+        sources = np.repeat(np.arange(len(ids), dtype=np.int64), degrees)
+        order = np.lexsort((targets, sources))
+        return cls(ids, offsets, targets[order], weights[order], graph.directed)
+
+    def to_graph(self) -> Graph:
+        """
+        Build a graph from the array form.
+
+        For undirected graphs every edge is stored in both rows, so only one copy
+        of each is added; self-loops are stored twice in their row.
+        """
+        graph = Graph(directed=self.directed)
+        for node_id in self.ids:
+            graph.add_node(node_id)
+
+        sources = self.edge_sources()
+        targets = np.asarray(self.targets)
+        weights = np.asarray(self.weights)
+        if not self.directed:
+            keep = sources < targets
+            keep[np.flatnonzero(sources == targets)[::2]] = True
+            sources, targets, weights = sources[keep], targets[keep], weights[keep]
+
+        ids = self.ids
+        graph.add_edges_from(
+            (ids[source], ids[target], weight)
+            for source, target, weight in zip(sources.tolist(), targets.tolist(), weights.tolist())
+        )
+        return graph
+
+    @property
+    def num_nodes(self) -> int:
+        """Get number of nodes"""
+        return len(self.ids)
+
+    @property
+    def num_edges(self) -> int:
+        """Get number of stored edges (undirected edges count twice)"""
+        return int(self.targets.shape[0])
+
+    def degrees(self) -> np.ndarray:
+        """Get the out-degree of every node"""
+        return np.diff(self.offsets)
+
+    def edge_sources(self) -> np.ndarray:
+        """Get the source node index of every edge"""
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int64), self.degrees())
+
+    def neighbors(self, i: int) -> np.ndarray:
+        """Get the target node indices of the edges of node ``i``"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.targets[start:end]
+
+    def undirected(self) -> "ArrayGraph":
+        """
+        Get the simple undirected form of the graph.
+
+        Reverse edges are added for directed graphs, self-loops are dropped and
+        parallel edges are merged into one edge carrying the sum of their weights.
+        """
+        sources = self.edge_sources()
+        targets = self.targets
+        weights = self.weights
+        if self.directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate(
+                (targets, sources)
+            )
+            weights = np.concatenate((weights, weights))
+
+        keep = sources != targets
+        n = self.num_nodes
+        keys, inverse = np.unique(sources[keep] * n + targets[keep], return_inverse=True)
+        merged = np.bincount(inverse, weights=weights[keep], minlength=keys.shape[0])
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // n, minlength=n), out=offsets[1:])
+        return ArrayGraph(self.ids, offsets, keys % n, merged, False, self.index)
+
+    def to_dict(self, values: Any) -> Dict[Union[int, str], Any]:
+        """Map a per-node array back to a dictionary keyed by node ID"""
+        return dict(zip(self.ids, np.asarray(values).tolist()))
+
+    def __repr__(self):
+        return (
+            f"ArrayGraph(directed={self.directed}, nodes={self.num_nodes}, edges={self.num_edges})"
+        )
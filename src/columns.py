@@ -0,0 +1,88 @@
+from typing import Any, Dict, Iterator
+import numpy as np
+
+
+class ColumnStore:
+    """
+    Attribute columns of the nodes or edges of a graph, one NumPy array per attribute.
+
+    Every node or edge owns a slot index (``Node.index``/``Edge.index``, shared by
+    an undirected edge and its reverse). A column holds one value per slot, so an
+    attribute shared by millions of edges costs one array entry each instead of a
+    dict per edge, and columns can be combined with vectorized NumPy operations.
+    """
+
+    def __init__(self):
+        self.size = 0  # Number of allocated slots
+        self._columns: Dict[str, np.ndarray] = {}
+        self._fills: Dict[str, Any] = {}  # Value of the slots not set yet, per column
+
+    def allocate(self, count: int = 1) -> int:
+        """Reserve slots for new nodes or edges, returning the first slot index"""
+        first = self.size
+        self.size += count
+        return first
+
+    def add_column(self, name: str, dtype: Any = np.float64, fill: Any = None) -> np.ndarray:
+        """
+        Create a column, replacing any column of the same name.
+
+        :param name: The attribute name
+        :param dtype: NumPy dtype of the values; strings are stored with dtype object
+        :param fill: Value of the slots not set yet; defaults to NaN for floats,
+            0 for integers, False for booleans and None otherwise
+        :return: The new column
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind in "US":
+            dtype = np.dtype(object)
+        if fill is None:
+            fill = {"f": np.nan, "c": np.nan, "i": 0, "u": 0, "b": False}.get(dtype.kind)
+        self._columns[name] = np.full(max(self.size, 1), fill, dtype=dtype)
+        self._fills[name] = fill
+        return self[name]
+
+    def get(self, name: str, indices: Any) -> np.ndarray:
+        """Get the values of a column at the given slot indices"""
+        return self[name][indices]
+
+    def set(self, name: str, indices: Any, values: Any) -> None:
+        """
+        Set the values of a column at the given slot indices.
+
+        The column is created on first use, with the dtype of the values.
+        """
+        if name not in self._columns:
+            self.add_column(name, np.asarray(values).dtype)
+        self[name][indices] = values
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Get a column as an array with one entry per slot; writes go to the store"""
+        column = self._columns[name]
+        if column.shape[0] < self.size:
+            grown = np.full(max(self.size, 2 * column.shape[0]), self._fills[name], column.dtype)
+            grown[: column.shape[0]] = column
+            self._columns[name] = column = grown
+        return column[: self.size]
+
+    def __setitem__(self, name: str, values: Any) -> None:
+        """Set a whole column from an array with one entry per slot, or a scalar"""
+        values = np.asarray(values)
+        column = self.add_column(name, values.dtype)
+        column[:] = values
+
+    def __delitem__(self, name: str) -> None:
+        del self._columns[name]
+        del self._fills[name]
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self._columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __repr__(self):
+        return f"ColumnStore(slots={self.size}, columns={list(self._columns)})"
@@ -0,0 +1,151 @@
+from typing import Any, Union
+import numpy as np
+import networkx as nx
+from array_graph import ArrayGraph
+from graph import Graph
+
+"""
+Conversion of graphs to NumPy/SciPy matrices and networkx graphs.
+
+Matrix rows and columns follow node insertion order, i.e. ``ArrayGraph.ids``.
+Parallel edges are summed; an undirected self-loop counts once, as in networkx.
+"""
+
+
+def to_numpy_adjacency(graph: Union[Graph, ArrayGraph], dtype: Any = np.float64) -> np.ndarray:
+    """Build the dense weighted adjacency matrix of the graph."""
+    array_graph = _as_array_graph(graph)
+    n = array_graph.num_nodes
+    keys = array_graph.edge_sources() * n + array_graph.targets
+    matrix = np.bincount(keys, weights=_matrix_weights(array_graph), minlength=n * n)
+    return matrix.reshape(n, n).astype(dtype, copy=False)
+
+
+def to_sparse_csr(graph: Union[Graph, ArrayGraph]) -> Any:
+    """
+    Build the weighted adjacency matrix as a ``scipy.sparse.csr_matrix``.
+
+    The matrix is built directly on the CSR arrays of the array form, without
+    copying them when SciPy accepts their index type. Parallel edges are kept
+    as duplicate entries, which SciPy sums in arithmetic and conversions.
+
+    :raises: ImportError if SciPy is not installed
+    """
+    try:
+        from scipy.sparse import csr_matrix
+    except ImportError as error:
+        raise ImportError("to_sparse_csr requires SciPy (pip install scipy)") from error
+
+    array_graph = _as_array_graph(graph)
+    n = array_graph.num_nodes
+    return csr_matrix(
+        (_matrix_weights(array_graph), array_graph.targets, array_graph.offsets),
+        shape=(n, n),
+        copy=False,
+    )
+
+
+def laplacian(
+    graph: Union[Graph, ArrayGraph], normalized: bool = False, sparse: bool = False
+) -> Any:
+    """
+    Build the Laplacian matrix ``D - A`` of the graph, using out-degrees for directed graphs.
+
+    :param graph: The graph instance or its array form
+    :param normalized: Return ``I - D^-1/2 A D^-1/2`` instead, with zero rows for isolated nodes
+    :param sparse: Return a SciPy sparse matrix instead of a NumPy array
+    :raises: ImportError if sparse is set and SciPy is not installed
+    """
+    array_graph = _as_array_graph(graph)
+    n = array_graph.num_nodes
+    degrees = np.bincount(
+        array_graph.edge_sources(), weights=_matrix_weights(array_graph), minlength=n
+    )
+
+    if sparse:
+        try:
+            from scipy.sparse import diags
+        except ImportError as error:
+            raise ImportError(
+                "laplacian(sparse=True) requires SciPy (pip install scipy)"
+            ) from error
+
+        adjacency = to_sparse_csr(array_graph)
+        if not normalized:
+            return (diags(degrees) - adjacency).tocsr()
+        scale = _inverse_sqrt(degrees)
+        identity = diags((degrees > 0).astype(np.float64))
+        return (identity - diags(scale) @ adjacency @ diags(scale)).tocsr()
+
+    adjacency = to_numpy_adjacency(array_graph)
+    if not normalized:
+        return np.diag(degrees) - adjacency
+    scale = _inverse_sqrt(degrees)
+    return np.diag((degrees > 0).astype(np.float64)) - scale[:, None] * adjacency * scale[None, :]
+
+
+def to_networkx(graph: Graph) -> nx.Graph:
+    """
+    Convert a graph to a ``networkx.Graph`` or ``networkx.DiGraph``.
+
+    Edge weights are stored in the ``weight`` attribute next to the edge data;
+    of several parallel edges only the last one is kept.
+    """
+    nx_graph = nx.DiGraph() if graph.directed else nx.Graph()
+    nx_graph.add_nodes_from((node.id, node.data) for node in graph.nodes.values())
+    nx_graph.add_edges_from(
+        (e.source.id, e.target.id, {**e.data, "weight": e.weight})
+        for edges in graph.edges.values()
+        for e in edges
+    )
+    return nx_graph
+
+
+def from_networkx(nx_graph: nx.Graph, weight: str = "weight") -> Graph:
+    """
+    Convert a networkx graph to a graph.
+
+    :param nx_graph: The networkx graph; multigraphs keep all parallel edges
+    :param weight: Edge attribute used as the weight, defaulting to 1.0 when missing
+    """
+    graph = Graph(directed=nx_graph.is_directed())
+    for node_id, node_data in nx_graph.nodes(data=True):
+        graph.add_node(node_id, dict(node_data))
+    graph.add_edges_from(
+        (
+            source,
+            target,
+            edge_data.get(weight, 1.0),
+            {key: value for key, value in edge_data.items() if key != weight},
+        )
+        for source, target, edge_data in nx_graph.edges(data=True)
+    )
+    return graph
+
+
+def _as_array_graph(graph: Union[Graph, ArrayGraph]) -> ArrayGraph:
+    """Use the array form as is, or freeze a graph."""
+    return graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph)
+
+
+def _matrix_weights(array_graph: ArrayGraph) -> np.ndarray:
+    """
+    Get the stored edge weights as matrix entries.
+
+    An undirected self-loop is stored twice in its node's row, so both copies
+    get half the weight. Without such loops the weights array is returned as is.
+    """
+    weights = array_graph.weights
+    if array_graph.directed:
+        return weights
+    loops = array_graph.edge_sources() == array_graph.targets
+    if not loops.any():
+        return weights
+    return np.where(loops, weights / 2, weights)
+
+
+def _inverse_sqrt(degrees: np.ndarray) -> np.ndarray:
+    """Compute 1 / sqrt(degree), with 0 for isolated nodes."""
+    scale = np.zeros_like(degrees, dtype=np.float64)
+    np.divide(1.0, np.sqrt(degrees), out=scale, where=degrees > 0)
+    return scale
@@ -4,6 +4,8 @@ from typing import Dict, Optional, Any
 class Edge:
     """Class representing a graph edge"""
 
+    __slots__ = ("source", "target", "weight", "directed", "index", "_data")
+
     def __init__(
         self,
         source: Any,
@@ -11,6 +13,7 @@ class Edge:
         weight: float = 1.0,
         directed: bool = False,
         data: Optional[Dict] = None,
+        index: Optional[int] = None,
     ):
         """
         Initialize an edge.
@@ -20,12 +23,25 @@ class Edge:
         :param weight: Edge weight
         :param directed: Whether edge is directed
         :param data: Additional edge data
+        :param index: Slot of the edge in the graph's edge columns, shared with its reverse
         """
         self.source = source
         self.target = target
         self.weight = weight
         self.directed = directed
-        self.data = data or {}
+        self.index = index
+        self._data = data or None  # Created on first access, as most edges carry no data
+
+    @property
+    def data(self) -> Dict:
+        """Additional edge data"""
+        if self._data is None:
+            self._data = {}
+        return self._data
+
+    @data.setter
+    def data(self, data: Dict) -> None:
+        self._data = data
 
     def __repr__(self):
         direction = "→" if self.directed else "↔"
@@ -33,4 +49,4 @@ class Edge:
 
     def reverse(self):
         """Return reversed edge (for undirected graphs)"""
-        return Edge(self.target, self.source, self.weight, self.directed, self.data)
+        return Edge(self.target, self.source, self.weight, self.directed, self._data, self.index)
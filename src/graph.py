@@ -1,6 +1,13 @@
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from node import Node
 from edge import Edge
+from columns import ColumnStore
+
+if TYPE_CHECKING:
+    from array_graph import ArrayGraph
+
+# Marks a cached value that has to be computed again
+_UNKNOWN = object()
 
 
 class Graph:
@@ -10,17 +17,45 @@ class Graph:
         self.directed = directed
         self.nodes: Dict[Union[int, str], Node] = {}
         self.edges: Dict[Node, List[Edge]] = {}
+        self._listeners: List[Callable[..., None]] = []
+        # Attribute columns indexed by Node.index and Edge.index
+        self.node_columns = ColumnStore()
+        self.edge_columns = ColumnStore()
+        # Result of max_integer_weight, reset by every edge mutation
+        self._max_integer_weight: Any = _UNKNOWN
 
     @property
     def node_list(self) -> List[Node]:
         """Get list of all nodes"""
         return list(self.nodes.values())
 
+    def subscribe(self, listener: Callable[..., None]) -> None:
+        """
+        Register a listener called as ``listener(event, *args)`` after every mutation.
+
+        Events: ``("add_node", node_id, data)``, ``("add_edge", source_id, target_id, weight, data)``,
+        ``("remove_node", node_id)``, ``("remove_edge", source_id, target_id)`` and
+        ``("set_edge_weight", source_id, target_id, weight)``.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[..., None]) -> None:
+        """Remove a previously registered listener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, *args: Any) -> None:
+        """Call all listeners with a mutation event"""
+        for listener in list(self._listeners):
+            listener(event, *args)
+
     def add_node(self, node_id: Union[int, str], data: Optional[Dict] = None) -> Node:
         """Add or get existing node"""
         if node_id not in self.nodes:
-            self.nodes[node_id] = Node(node_id, data)
+            self.nodes[node_id] = Node(node_id, data, self.node_columns.allocate())
             self.edges[self.nodes[node_id]] = []
+            if self._listeners:
+                self._notify("add_node", node_id, data)
         return self.nodes[node_id]
 
     def add_edge(
@@ -34,13 +69,54 @@ class Graph:
         source = self.add_node(source_id)
         target = self.add_node(target_id)
 
-        edge = Edge(source, target, weight, self.directed, data)
+        edge = Edge(source, target, weight, self.directed, data, self.edge_columns.allocate())
         self.edges[source].append(edge)
 
         if not self.directed:
             reverse_edge = edge.reverse()
             self.edges[target].append(reverse_edge)
 
+        self._max_integer_weight = _UNKNOWN
+        if self._listeners:
+            self._notify("add_edge", source_id, target_id, weight, data)
+
+    def add_edges_from(self, edges: Iterable[Tuple]) -> None:
+        """
+        Add many edges at once.
+
+        :param edges: Tuples of (source_id, target_id), (source_id, target_id, weight)
+            or (source_id, target_id, weight, data)
+        """
+        nodes = self.nodes
+        directed = self.directed
+        notify = bool(self._listeners)
+        self._max_integer_weight = _UNKNOWN
+        columns = self.edge_columns
+        # Adjacency lists by node ID, avoiding repeated Node hashing in self.edges lookups
+        rows: Dict[Union[int, str], List[Edge]] = {}
+
+        for item in edges:
+            source_id = item[0]
+            target_id = item[1]
+            weight = item[2] if len(item) > 2 else 1.0
+            data = item[3] if len(item) > 3 else None
+
+            source_row = rows.get(source_id)
+            if source_row is None:
+                source_row = rows[source_id] = self.edges[self.add_node(source_id)]
+            target_row = rows.get(target_id)
+            if target_row is None:
+                target_row = rows[target_id] = self.edges[self.add_node(target_id)]
+
+            index = columns.allocate()
+            edge = Edge(nodes[source_id], nodes[target_id], weight, directed, data, index)
+            source_row.append(edge)
+            if not directed:
+                target_row.append(edge.reverse())
+
+            if notify:
+                self._notify("add_edge", source_id, target_id, weight, data)
+
     def remove_node(self, node_id: Union[int, str]) -> None:
         """Remove node and all connected edges"""
         if node_id not in self.nodes:
@@ -55,6 +131,10 @@ class Graph:
 
         # Remove the node itself
         del self.nodes[node_id]
+        self._max_integer_weight = _UNKNOWN
+
+        if self._listeners:
+            self._notify("remove_node", node_id)
 
     def remove_edge(self, source_id: Union[int, str], target_id: Union[int, str]) -> None:
         """Remove edge between two nodes"""
@@ -70,6 +150,31 @@ class Graph:
         # For undirected graphs, also remove target -> source edge
         if not self.directed:
             self.edges[target] = [e for e in self.edges[target] if e.target.id != source_id]
+        self._max_integer_weight = _UNKNOWN
+
+        if self._listeners:
+            self._notify("remove_edge", source_id, target_id)
+
+    def set_edge_weight(
+        self, source_id: Union[int, str], target_id: Union[int, str], weight: float
+    ) -> None:
+        """Change the weight of all edges between two nodes"""
+        found = False
+        for edge in self.get_edges(source_id):
+            if edge.target.id == target_id:
+                edge.weight = weight
+                found = True
+        if not found:
+            raise ValueError(f"Edge {source_id} -> {target_id} not found in graph")
+
+        if not self.directed:
+            for edge in self.get_edges(target_id):
+                if edge.target.id == source_id:
+                    edge.weight = weight
+        self._max_integer_weight = _UNKNOWN
+
+        if self._listeners:
+            self._notify("set_edge_weight", source_id, target_id, weight)
 
     def get_edges(self, node_id: Union[int, str]) -> List[Edge]:
         """Get all edges for a node"""
@@ -77,6 +182,43 @@ class Graph:
             return self.edges.get(self.nodes[node_id], [])
         return []
 
+    def freeze(self, weight: Optional[str] = None) -> "ArrayGraph":
+        """
+        Get an array (CSR) snapshot of the graph.
+
+        :param weight: Name of an edge column used as the weights instead of Edge.weight
+        """
+        from array_graph import ArrayGraph
+
+        return ArrayGraph.from_graph(self, weight)
+
+    def max_integer_weight(self) -> Optional[int]:
+        """
+        Get the largest edge weight if all weights are non-negative integers, else None.
+
+        The result is cached until the edges change through the Graph methods;
+        assigning ``Edge.weight`` directly is not noticed.
+        """
+        if self._max_integer_weight is _UNKNOWN:
+            self._max_integer_weight = self._scan_integer_weights()
+        return self._max_integer_weight
+
+    def _scan_integer_weights(self) -> Optional[int]:
+        """Compute max_integer_weight with a pass over all edges."""
+        largest = 0
+        for edges in self.edges.values():
+            for edge in edges:
+                weight = edge.weight
+                if not (
+                    isinstance(weight, int) or (isinstance(weight, float) and weight.is_integer())
+                ):
+                    return None
+                if weight < 0:
+                    return None
+                if weight > largest:
+                    largest = weight
+        return int(largest)
+
     def to_dict(self) -> Dict:
         """Serialize graph to dictionary"""
         return {
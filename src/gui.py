@@ -1,7 +1,6 @@
-import json
 import sys
-import numpy as np
 import time
+import numpy as np
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -17,22 +16,72 @@ from PyQt6.QtWidgets import (
     QComboBox,
     QTextEdit,
 )
-from PyQt6.QtCore import Qt
-from pyqtgraph import GraphItem, PlotWidget, TextItem
+from PyQt6.QtCore import QRectF, Qt, QThread, pyqtSignal
+from pyqtgraph import ImageItem, PlotCurveItem, PlotWidget, ScatterPlotItem, TextItem, mkColor
 from graph import Graph
-from algorithms.bfs import bfs
-from algorithms.dfs import dfs
-from algorithms.dijkstra import dijkstra
-from algorithms.astar import a_star
+from layout import ForceLayout
+from spatial import SpatialGrid
+from algorithms.runner import run
+from storage import load_graph, load_neighbourhood, save_graph
+
+# Above this many moved nodes the spatial index is rebuilt on its next query instead
+_PLACE_NODES_MAX = 1024
+
+
+class LayoutWorker(QThread):
+    """Runs a force-directed layout in a background thread, emitting positions at a throttled rate"""
+
+    positions_changed = pyqtSignal(object, object)  # Node IDs, (n, 2) array of positions
+
+    def __init__(self, graph, positions, iterations=300, interval=0.1, tol=1e-3, parent=None):
+        super().__init__(parent)
+        self.graph = graph
+        # Snapshot the graph here, on the GUI thread, which may edit it while the layout runs
+        self.layout = ForceLayout(graph, positions)
+        self.iterations = iterations
+        self.interval = interval  # Minimum seconds between two emitted updates
+        self.tol = tol  # Stop once no node moves farther in a step
+
+    def run(self):
+        layout = self.layout
+        last_emit = time.monotonic()
+        for _ in range(self.iterations):
+            if self.isInterruptionRequested():
+                break
+            moved = layout.step()
+            if moved < self.tol:
+                break
+            if time.monotonic() - last_emit >= self.interval:
+                self.positions_changed.emit(layout.ids, layout.positions.copy())
+                last_emit = time.monotonic()
+        self.positions_changed.emit(layout.ids, layout.positions.copy())
 
 
 class GraphVisualizer(QMainWindow):
+    # Registered runner names of the algorithms offered in the selector
+    ALGORITHM_NAMES = {"BFS": "bfs", "DFS": "dfs", "Dijkstra": "dijkstra", "A*": "a_star"}
+
     def __init__(self):
         super().__init__()
         self.graph = Graph()
         self.node_positions = {}  # {node_id: (x, y)}
-        self.text_items = []  # Хранит текстовые метки узлов
+        self.text_items = {}  # Метки узлов в области просмотра: {node_id: TextItem}
         self.selected_node = None  # Узел для перетаскивания
+        self.selected_nodes = []  # Nodes picked by Shift+drag box selection
+        self.hovered_node = None
+        self.spatial_index = SpatialGrid()  # Node positions, for hit-testing
+        self._box_start = None  # View position where a box selection started
+        self._index_stale = False  # Set when spatial_index must be rebuilt from _positions
+        self.layout_worker = None
+
+        # Render state kept between updates so only changes are redrawn
+        self._rendered_graph = None  # Graph the structure below was built from
+        self._structure_dirty = True  # Set by graph mutations; nodes or edges changed
+        self._node_order = []  # Node IDs in the row order of the arrays below
+        self._node_rows = {}  # {node_id: row}
+        self._positions = np.zeros((0, 2))
+        self._adjacency = np.zeros((0, 2), dtype=np.int64)  # (E, 2) array of node rows
+        self._label_zoom = None  # Zoom the label fonts were last sized for
 
         # Obsidian-inspired visual parameters
         self.visual_params = {
@@ -51,6 +100,10 @@ class GraphVisualizer(QMainWindow):
             "hover_color": "#FF4500",  # Orange red
             "text_color": "#333333",
             "background_color": "#F5F6F5",  # Light gray background
+            "label_min_zoom": 0.5,  # Labels are hidden below this zoom
+            "max_labels": 500,  # Labels are hidden while more nodes are in view
+            "density_node_limit": 20000,  # More nodes in view are drawn as density tiles
+            "density_bins": 256,  # Density tiles across the view
         }
 
         self.current_zoom = 1.0
@@ -69,8 +122,20 @@ class GraphVisualizer(QMainWindow):
         self.plot_widget.setMouseEnabled(x=True, y=True)
         self.plot_widget.setLimits(xMin=-1000, xMax=1000, yMin=-1000, yMax=1000)
         self.plot_widget.sigRangeChanged.connect(self.handle_zoom)
-        self.graph_item = GraphItem()
-        self.plot_widget.addItem(self.graph_item)
+        # Edges are drawn as one batched line item, with nodes on top of them
+        self.edge_item = PlotCurveItem(pen=self.visual_params["edge_color"], skipFiniteCheck=True)
+        self.node_item = ScatterPlotItem(pen=self.visual_params["node_border_color"])
+        self.density_item = ImageItem()
+        self.density_item.setLookupTable(self._density_colors())
+        self.density_item.setVisible(False)
+        self.plot_widget.addItem(self.density_item)
+        self.plot_widget.addItem(self.edge_item)
+        self.plot_widget.addItem(self.node_item)
+        self.selection_item = ScatterPlotItem(pen=None)
+        self.hover_item = ScatterPlotItem(pen=None)
+        self.plot_widget.addItem(self.selection_item)
+        self.plot_widget.addItem(self.hover_item)
+        self.plot_widget.scene().sigMouseMoved.connect(self.handle_hover)
         main_layout.addWidget(self.plot_widget, stretch=3)
 
         # Control panel
@@ -163,6 +228,18 @@ class GraphVisualizer(QMainWindow):
         self.format_selector = QComboBox()
         self.format_selector.addItems(["JSON", "XML", "CSV"])
         file_layout.addWidget(self.format_selector)
+        self.neighbourhood_node = QLineEdit()
+        self.neighbourhood_node.setPlaceholderText("Node ID")
+        self.neighbourhood_hops = QSpinBox()
+        self.neighbourhood_hops.setRange(0, 10)
+        self.neighbourhood_hops.setValue(3)
+        file_layout.addWidget(QLabel("Neighbourhood (binary graph):"))
+        file_layout.addWidget(self.neighbourhood_node)
+        file_layout.addWidget(QLabel("Hops:"))
+        file_layout.addWidget(self.neighbourhood_hops)
+        neighbourhood_btn = QPushButton("Load Neighbourhood")
+        neighbourhood_btn.clicked.connect(self.open_neighbourhood)
+        file_layout.addWidget(neighbourhood_btn)
         layout.addWidget(file_group)
 
     def setupVisualization(self, layout):
@@ -175,50 +252,74 @@ class GraphVisualizer(QMainWindow):
         reset_zoom_btn = QPushButton("Reset Zoom")
         reset_zoom_btn.clicked.connect(self.reset_zoom)
         vis_layout.addWidget(reset_zoom_btn)
+        start_layout_btn = QPushButton("Start Layout")
+        start_layout_btn.clicked.connect(self.start_layout)
+        vis_layout.addWidget(start_layout_btn)
+        stop_layout_btn = QPushButton("Stop Layout")
+        stop_layout_btn.clicked.connect(self.stop_layout)
+        vis_layout.addWidget(stop_layout_btn)
         layout.addWidget(vis_group)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
-            pos = self.plot_widget.mapToScene(event.pos())
-            for node_id, node_pos in self.node_positions.items():
-                distance = np.linalg.norm(np.array(node_pos) - np.array([pos.x(), pos.y()]))
-                if distance < 0.5 * self.current_zoom:  # Adjust for zoom
-                    self.selected_node = node_id
-                    break
+            pos = self._event_view_pos(event)
+            if event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+                self._box_start = pos
+            else:
+                self.selected_node = self.node_at(pos.x(), pos.y())
         super().mousePressEvent(event)
 
     def mouseMoveEvent(self, event):
         if self.selected_node:
-            pos = self.plot_widget.mapToScene(event.pos())
-            self.node_positions[self.selected_node] = [pos.x(), pos.y()]
-            self.update_graph()
+            pos = self._event_view_pos(event)
+            self.move_node(self.selected_node, pos.x(), pos.y())
         super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.selected_node = None
+            if self._box_start is not None:
+                pos = self._event_view_pos(event)
+                self.select_nodes_in_rect(
+                    self._box_start.x(), self._box_start.y(), pos.x(), pos.y()
+                )
+                self._box_start = None
         super().mouseReleaseEvent(event)
 
+    def handle_hover(self, scene_pos):
+        pos = self.plot_widget.plotItem.vb.mapSceneToView(scene_pos)
+        node_id = self.node_at(pos.x(), pos.y())
+        if node_id != self.hovered_node:
+            self.hovered_node = node_id
+            self._draw_highlights()
+
+    def node_at(self, x, y):
+        """Get the node under a view position, or None"""
+        return self._node_index().nearest(x, y, 0.5 * self.current_zoom)  # Adjust for zoom
+
+    def select_nodes_in_rect(self, x0, y0, x1, y1):
+        """Select the nodes inside a view rectangle given by two opposite corners"""
+        self.selected_nodes = self._node_index().query_rect(x0, y0, x1, y1)
+        self._draw_highlights()
+        return self.selected_nodes
+
     def handle_zoom(self, _, view_range):
         x_range = view_range[0][1] - view_range[0][0]
         self.current_zoom = max(0.2, min(5.0, 100 / x_range))
-        self.update_graph()
+        self.restyle()
 
     def reset_zoom(self):
         self.plot_widget.setRange(xRange=[-10, 10], yRange=[-10, 10])
         self.current_zoom = 1.0
-        self.update_graph()
+        self.restyle()
 
     def update_node_dropdowns(self):
-        nodes = [str(node.id) for node in self.graph.node_list]
-        self.edge_from.clear()
-        self.edge_to.clear()
-        self.start_node_input.clear()
-        self.end_node_input.clear()
-        self.edge_from.addItems(nodes)
-        self.edge_to.addItems(nodes)
-        self.start_node_input.addItems(nodes)
-        self.end_node_input.addItems(nodes)
+        """Fill the node selectors; items show str(node.id) and carry the node ID as data"""
+        node_ids = list(self.graph.nodes)
+        for combo in (self.edge_from, self.edge_to, self.start_node_input, self.end_node_input):
+            combo.clear()
+            for node_id in node_ids:
+                combo.addItem(str(node_id), node_id)
 
     def add_node(self):
         name = self.node_name_input.text()
@@ -232,120 +333,295 @@ class GraphVisualizer(QMainWindow):
             QMessageBox.warning(self, "Warning", "Node name must be unique and not empty")
 
     def remove_node(self):
-        name = self.edge_from.currentText()
-        if name in [str(node.id) for node in self.graph.node_list]:
-            self.graph.remove_node(name)
-            if name in self.node_positions:
-                del self.node_positions[name]
+        node_id = self.edge_from.currentData()
+        if node_id is not None and node_id in self.graph.nodes:
+            self.graph.remove_node(node_id)
+            if node_id in self.node_positions:
+                del self.node_positions[node_id]
             self.update_node_dropdowns()
             self.update_graph()
 
     def add_edge(self):
-        from_node = self.edge_from.currentText()
-        to_node = self.edge_to.currentText()
+        from_node = self.edge_from.currentData()
+        to_node = self.edge_to.currentData()
         weight = self.edge_weight.value()
-        if from_node and to_node:
+        if from_node is not None and to_node is not None:
             self.graph.add_edge(from_node, to_node, weight)
             self.update_graph()
 
     def remove_edge(self):
-        from_node = self.edge_from.currentText()
-        to_node = self.edge_to.currentText()
-        if from_node and to_node:
+        from_node = self.edge_from.currentData()
+        to_node = self.edge_to.currentData()
+        if from_node is not None and to_node is not None:
             self.graph.remove_edge(from_node, to_node)
             self.update_graph()
 
     def update_graph(self):
-        params = self.visual_params
-        nodes = self.graph.node_list
-        if not nodes:
+        """Sync the plot with the graph and node positions, redrawing only what changed"""
+        if self.graph is not self._rendered_graph:
+            if self._rendered_graph is not None:
+                self._rendered_graph.unsubscribe(self._on_graph_change)
+            self.graph.subscribe(self._on_graph_change)
+            self._rendered_graph = self.graph
+            self._structure_dirty = True
+
+        if self._structure_dirty:
+            self._rebuild_structure()
+
+        for node_id in self._node_order:
+            if node_id not in self.node_positions:
+                self.node_positions[node_id] = np.random.rand(2) * 10
+        positions = np.array(
+            [self.node_positions[node_id] for node_id in self._node_order], dtype=float
+        ).reshape(-1, 2)
+        if positions.shape == self._positions.shape:
+            moved = np.flatnonzero((positions != self._positions).any(axis=1))
+        else:
+            moved = range(len(positions))
+        if len(moved) > _PLACE_NODES_MAX:
+            self._index_stale = True
+            for node_id, text in self.text_items.items():
+                pos = positions[self._node_rows[node_id]]
+                text.setPos(pos[0], pos[1] + 0.5)  # Offset to place above node
+        else:
+            for row in moved:
+                self._place_node(self._node_order[row], positions[row])
+        self._positions = positions
+        self.restyle()
+
+    def move_node(self, node_id, x, y):
+        """Move one node, updating only its label, index entry and the drawn arrays"""
+        self.node_positions[node_id] = [x, y]
+        row = self._node_rows.get(node_id)
+        if row is None or self._structure_dirty or self.graph is not self._rendered_graph:
+            self.update_graph()
             return
+        self._positions[row] = (x, y)
+        self._place_node(node_id, self._positions[row])
+        self._draw()
+
+    def restyle(self):
+        """Apply the current zoom to nodes, edges and label fonts"""
+        if self._label_zoom != self.current_zoom:
+            self._label_zoom = self.current_zoom
+            self._style_labels(self.text_items.values())
+        self._draw()
+
+    def _on_graph_change(self, event, *args):
+        if event != "set_edge_weight":
+            self._structure_dirty = True
+
+    def _rebuild_structure(self):
+        """Rebuild the node rows and edge array after nodes or edges changed."""
+        removed = set(self._node_order)
+        self._node_order = [node.id for node in self.graph.node_list]
+        self._node_rows = {node_id: row for row, node_id in enumerate(self._node_order)}
+
+        # The array form keeps the node order of graph.node_list
+        array_graph = self.graph.freeze()
+        sources = array_graph.edge_sources()
+        targets = np.asarray(array_graph.targets)
+        if not self.graph.directed:
+            # Undirected edges are stored from both ends; draw each once
+            keep = sources <= targets
+            sources, targets = sources[keep], targets[keep]
+        self._adjacency = np.column_stack((sources, targets)).astype(np.int64)
+
+        rows = self._node_rows
+        removed.difference_update(rows)
+        for node_id in removed:
+            self.spatial_index.remove(node_id)
+            if node_id in self.text_items:
+                self.plot_widget.removeItem(self.text_items.pop(node_id))
+        self.selected_nodes = [node_id for node_id in self.selected_nodes if node_id in rows]
+        if self.hovered_node not in rows:
+            self.hovered_node = None
+        self._positions = np.zeros((0, 2))  # Place every node again
+        self._structure_dirty = False
+
+    def _node_index(self):
+        """Get the spatial index of the nodes, rebuilding it if many nodes moved."""
+        if self._index_stale:
+            self.spatial_index.clear()
+            self.spatial_index.update(zip(self._node_order, self._positions.tolist()))
+            self._index_stale = False
+        return self.spatial_index
+
+    def _place_node(self, node_id, pos):
+        """Move the index entry and any label of a node to its new position."""
+        if not self._index_stale:
+            self.spatial_index.insert(node_id, pos[0], pos[1])
+        text = self.text_items.get(node_id)
+        if text is not None:
+            text.setPos(pos[0], pos[1] + 0.5)  # Offset to place above node
 
-        node_ids = {str(node.id): idx for idx, node in enumerate(nodes)}
-        edges = []
-        for node in nodes:
-            for edge in self.graph.get_edges(node.id):
-                source_idx = node_ids.get(str(edge.source.id))
-                target_idx = node_ids.get(str(edge.target.id))
-                if source_idx is not None and target_idx is not None:
-                    edges.append((source_idx, target_idx))
-
-        valid_nodes = [node for node in nodes if str(node.id) in node_ids]
-        if not valid_nodes:
-            return
+    def _style_labels(self, labels):
+        params = self.visual_params
+        size = max(params["min_font_size"], params["base_font_size"] * self.current_zoom)
+        for text in labels:
+            font = text.textItem.font()
+            font.setPointSizeF(size)
+            text.setFont(font)
 
-        # Clear all old text labels
-        for text_item in self.text_items:
-            self.plot_widget.removeItem(text_item)
-        self.text_items.clear()
+    def _draw(self):
+        """
+        Draw the part of the graph inside the view, at the detail the zoom allows.
 
-        # Add new text labels for nodes
-        for node in valid_nodes:
-            pos = self.node_positions[node.id]
-            text = TextItem(str(node.id), anchor=(0.5, 0.5))
-            text.setPos(pos[0], pos[1] + 0.5)  # Offset to place above node
-            text.setColor(params["text_color"])
-            font = text.textItem.font()
-            font.setPointSizeF(
-                max(params["min_font_size"], params["base_font_size"] * self.current_zoom)
+        Only nodes in view and edges touching them are drawn. With more than
+        ``density_node_limit`` nodes in view they are binned into density tiles
+        instead, and labels are only shown for up to ``max_labels`` nodes in view
+        from ``label_min_zoom`` on.
+        """
+        params = self.visual_params
+        positions = self._positions
+        (x0, x1), (y0, y1) = self.plot_widget.viewRange()
+        inside = (
+            (positions[:, 0] >= x0)
+            & (positions[:, 0] <= x1)
+            & (positions[:, 1] >= y0)
+            & (positions[:, 1] <= y1)
+        )
+        visible = np.flatnonzero(inside)
+
+        dense = len(visible) > params["density_node_limit"]
+        self.density_item.setVisible(dense)
+        self.node_item.setVisible(not dense)
+        self.edge_item.setVisible(not dense)
+        if dense:
+            counts, _, _ = np.histogram2d(
+                positions[visible, 0],
+                positions[visible, 1],
+                bins=params["density_bins"],
+                range=[[x0, x1], [y0, y1]],
             )
-            text.setFont(font)
-            self.plot_widget.addItem(text)
-            self.text_items.append(text)
-
-        self.graph_item.setData(
-            pos=np.array([self.node_positions[node.id] for node in valid_nodes]),
-            adj=np.array(edges) if edges else None,
-            size=params["base_pixel_size"] * self.current_zoom,
-            symbolBrush=params["node_color"],
-            pen=params["edge_color"],
+            counts = np.log1p(counts)
+            self.density_item.setImage(counts, levels=(0, max(counts.max(), 1.0)))
+            self.density_item.setRect(QRectF(x0, y0, x1 - x0, y1 - y0))
+        else:
+            self.node_item.setData(
+                pos=positions[visible],
+                size=params["base_pixel_size"] * self.current_zoom,
+                brush=params["node_color"],
+            )
+            adjacency = self._adjacency
+            if len(visible) < len(positions):
+                adjacency = adjacency[inside[adjacency[:, 0]] | inside[adjacency[:, 1]]]
+            segments = positions[adjacency].reshape(-1, 2)
+            self.edge_item.setData(segments[:, 0], segments[:, 1], connect="pairs")
+
+        labelled = self.current_zoom >= params["label_min_zoom"]
+        self._show_labels(visible if labelled and len(visible) <= params["max_labels"] else ())
+        self._draw_highlights()
+
+    def _show_labels(self, rows):
+        """Keep labels for exactly the nodes in the given rows, creating missing ones."""
+        wanted = {self._node_order[row]: self._positions[row] for row in rows}
+        for node_id in list(self.text_items):
+            if node_id not in wanted:
+                self.plot_widget.removeItem(self.text_items.pop(node_id))
+        new_labels = []
+        for node_id, pos in wanted.items():
+            if node_id not in self.text_items:
+                text = TextItem(str(node_id), anchor=(0.5, 0.5))
+                text.setColor(self.visual_params["text_color"])
+                text.setPos(pos[0], pos[1] + 0.5)  # Offset to place above node
+                self.plot_widget.addItem(text)
+                self.text_items[node_id] = text
+                new_labels.append(text)
+        self._style_labels(new_labels)
+
+    def _density_colors(self):
+        """Lookup table fading from the background color to the node color."""
+        background = np.array(mkColor(self.visual_params["background_color"]).getRgb())
+        node = np.array(mkColor(self.visual_params["node_color"]).getRgb())
+        steps = np.linspace(0.0, 1.0, 256)[:, None]
+        return (background + (node - background) * steps).astype(np.ubyte)
+
+    def _draw_highlights(self):
+        """Draw the hovered and box-selected nodes on top of the graph."""
+        params = self.visual_params
+        size = params["base_pixel_size"] * self.current_zoom
+        positions, rows = self._positions, self._node_rows
+        self.selection_item.setData(
+            pos=positions[[rows[node_id] for node_id in self.selected_nodes]],
+            size=size,
+            brush=params["hover_color"],
+        )
+        hovered = [] if self.hovered_node is None else positions[[rows[self.hovered_node]]]
+        self.hover_item.setData(pos=hovered, size=size * 1.5, brush=params["hover_color"])
+
+    def start_layout(self):
+        """Run the force-directed layout in the background, starting from the current positions"""
+        self.stop_layout()
+        if not self.graph.nodes:
+            return
+        self.layout_worker = LayoutWorker(self.graph, self.node_positions, parent=self)
+        self.layout_worker.positions_changed.connect(self.apply_layout_positions)
+        self.layout_worker.start()
+
+    def stop_layout(self):
+        """Stop the background layout, keeping the positions reached so far"""
+        if self.layout_worker is not None:
+            self.layout_worker.requestInterruption()
+            self.layout_worker.wait()
+            self.layout_worker = None
+
+    def apply_layout_positions(self, ids, positions):
+        worker = self.layout_worker
+        if worker is None or worker.graph is not self.graph:
+            return  # Update of a stopped layout, or of a graph replaced since
+        nodes = self.graph.nodes
+        self.node_positions.update(
+            (node_id, pos) for node_id, pos in zip(ids, positions.tolist()) if node_id in nodes
         )
+        self.update_graph()
+
+    def closeEvent(self, event):
+        self.stop_layout()
+        super().closeEvent(event)
+
+    def _event_view_pos(self, event):
+        """Map the position of a window mouse event to view (graph) coordinates."""
+        widget_pos = self.plot_widget.mapFromGlobal(event.globalPosition().toPoint())
+        scene_pos = self.plot_widget.mapToScene(widget_pos)
+        return self.plot_widget.plotItem.vb.mapSceneToView(scene_pos)
 
     def run_algorithm(self):
         algo = self.algo_selector.currentText()
-        start_node = self.start_node_input.currentText()
-        end_node = self.end_node_input.currentText() if algo == "A*" else None
+        start_node = self.start_node_input.currentData()
+        end_node = self.end_node_input.currentData() if algo == "A*" else None
 
-        if not start_node:
+        if start_node is None:
             QMessageBox.warning(self, "Warning", "Please select a start node")
             return
 
+        params = {"start_node": start_node}
+        if algo == "A*":
+            if end_node is None:
+                QMessageBox.warning(self, "Warning", "Please select an end node for A*")
+                return
+            params["goal_node"] = end_node
+            params["heuristic"] = {node_id: 0.0 for node_id in self.graph.nodes}
+
         try:
-            start_time = time.perf_counter()
-            result = None
-
-            if algo == "BFS":
-                from io import StringIO
-
-                old_stdout = sys.stdout
-                sys.stdout = StringIO()
-                bfs(self.graph, start_node)
-                result = sys.stdout.getvalue().strip()
-                sys.stdout = old_stdout
-            elif algo == "DFS":
-                from io import StringIO
-
-                old_stdout = sys.stdout
-                sys.stdout = StringIO()
-                dfs(self.graph, start_node)
-                result = sys.stdout.getvalue().strip()
-                sys.stdout = old_stdout
+            run_result = run(self.ALGORITHM_NAMES[algo], self.graph, **params)
+            output = run_result.output
+            if algo in ("BFS", "DFS"):
+                result = " ".join(str(node) for node in output)
             elif algo == "Dijkstra":
-                distances = dijkstra(self.graph, start_node)
-                result = "\n".join(f"{node}: {dist}" for node, dist in distances.items())
-            elif algo == "A*":
-                if not end_node:
-                    QMessageBox.warning(self, "Warning", "Please select an end node for A*")
-                    return
-                heuristic = {str(node.id): 0.0 for node in self.graph.node_list}
-                path = a_star(self.graph, start_node, end_node, heuristic)
-                result = " -> ".join(path) if path else "No path found"
-
-            end_time = time.perf_counter()
-            execution_time = end_time - start_time
+                result = "\n".join(f"{node}: {dist}" for node, dist in output.items())
+            else:
+                result = " -> ".join(map(str, output)) if output else "No path found"
 
+            stats = run_result.stats
             self.result_display.setText(
-                f"Result:\n{result}\n\nExecution Time: {execution_time:.6f} seconds"
+                f"Result:\n{result}\n\n"
+                f"Nodes settled: {stats.nodes_settled}\n"
+                f"Edges relaxed: {stats.edges_relaxed}\n"
+                f"Queue pushes: {stats.heap_pushes}\n"
+                f"Peak frontier: {stats.peak_frontier}\n\n"
+                f"Execution Time: {run_result.elapsed:.6f} seconds\n"
+                f"CPU Time: {run_result.cpu_time:.6f} seconds"
             )
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to run algorithm: {str(e)}")
@@ -356,82 +632,39 @@ class GraphVisualizer(QMainWindow):
             self,
             f"Save Graph As {file_format}",
             "",
-            f"{file_format} Files (*.{file_format.lower()})",
+            f"{file_format} Files (*.{file_format.lower()});;"
+            f"Compressed {file_format} Files (*.{file_format.lower()}.gz "
+            f"*.{file_format.lower()}.bz2 *.{file_format.lower()}.xz)",
         )
         if not filename:
             return
         try:
-            if file_format == "JSON":
-                graph_data = {
-                    "graph": self.graph.to_dict(),
-                    "node_positions": {
-                        str(k): v.tolist() if isinstance(v, np.ndarray) else list(v)
-                        for k, v in self.node_positions.items()
-                    },
-                }
-                with open(filename, "w", encoding="utf-8") as f:
-                    json.dump(graph_data, f, indent=4)
-            else:
-                from storage import save_to_xml, save_to_csv
-
-                if file_format == "XML":
-                    save_to_xml(self.graph, filename, node_positions=self.node_positions)
-                elif file_format == "CSV":
-                    save_to_csv(self.graph, filename, node_positions=self.node_positions)
+            save_graph(
+                self.graph,
+                filename,
+                node_positions={str(k): v for k, v in self.node_positions.items()},
+                file_format=file_format.lower(),
+            )
             QMessageBox.information(self, "Success", "Graph saved successfully")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save graph: {str(e)}")
 
     def load_graph(self):
-        file_format = self.format_selector.currentText()
         filename, _ = QFileDialog.getOpenFileName(
-            self, f"Load {file_format} Graph", "", f"{file_format} Files (*.{file_format.lower()})"
+            self,
+            "Load Graph",
+            "",
+            "Graph Files (*.json *.ndjson *.jsonl *.xml *.csv *.tsv *.txt *.gz *.bz2 *.xz);;"
+            "All Files (*)",
         )
         if filename:
             try:
-                if file_format == "JSON":
-                    with open(filename, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    self.graph = Graph(directed=data["graph"]["directed"])
-                    for node_id, node_data in data["graph"]["nodes"].items():
-                        self.graph.add_node(node_id, node_data)
-                    added_edges = set()
-                    for edge_data in data["graph"]["edges"]:
-                        source = edge_data["source"]
-                        target = edge_data["target"]
-                        if not self.graph.directed:
-                            edge_key = tuple(sorted((source, target)))
-                            if edge_key in added_edges:
-                                continue
-                            added_edges.add(edge_key)
-                        self.graph.add_edge(
-                            source,
-                            target,
-                            edge_data.get("weight", 1.0),
-                            edge_data.get("data", {}),
-                        )
-                    self.node_positions = {
-                        k: (
-                            tuple(v)
-                            if isinstance(v, list)
-                            and len(v) == 2
-                            and all(isinstance(x, (int, float)) for x in v)
-                            else np.random.rand(2) * 10
-                        )
-                        for k, v in data.get("node_positions", {}).items()
-                    }
-                else:
-                    from storage import load_from_xml, load_from_csv
-
-                    if file_format == "XML":
-                        self.graph, self.node_positions = load_from_xml(filename)
-                    elif file_format == "CSV":
-                        self.graph, self.node_positions = load_from_csv(
-                            filename, directed=self.graph.directed
-                        )
-                for node in self.graph.node_list:
-                    if str(node.id) not in self.node_positions:
-                        self.node_positions[str(node.id)] = np.random.rand(2) * 10
+                self.graph, positions = load_graph(filename, directed=self.graph.directed)
+                # Files key positions by str(node.id); the view keys them by node ID
+                self.node_positions = {
+                    node.id: positions.get(str(node.id), np.random.rand(2) * 10)
+                    for node in self.graph.node_list
+                }
                 self.reset_zoom()
                 self.update_node_dropdowns()
                 self.update_graph()
@@ -439,6 +672,27 @@ class GraphVisualizer(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to load graph: {str(e)}")
 
+    def open_neighbourhood(self):
+        node_id = self.neighbourhood_node.text().strip()
+        if not node_id:
+            QMessageBox.warning(self, "Warning", "Please enter a node ID")
+            return
+        path = QFileDialog.getExistingDirectory(self, "Open Binary Graph")
+        if path:
+            try:
+                self.graph, positions = load_neighbourhood(
+                    path, node_id, self.neighbourhood_hops.value()
+                )
+                self.node_positions = {
+                    node.id: positions.get(str(node.id), np.random.rand(2) * 10)
+                    for node in self.graph.node_list
+                }
+                self.reset_zoom()
+                self.update_node_dropdowns()
+                self.update_graph()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to load neighbourhood: {str(e)}")
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
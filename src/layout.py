@@ -0,0 +1,259 @@
+from typing import Dict, Optional, Tuple, Union
+from array_graph import ArrayGraph
+from graph import Graph
+import numpy as np
+
+"""
+Force-directed graph layout (Fruchterman–Reingold).
+
+Every pair of nodes repels with force ``k^2 / d`` and every edge pulls its ends
+together with force ``d^2 / k``. The moves of each step are capped by a
+temperature that cools geometrically. Repulsion is computed exactly for small
+graphs and with a Barnes–Hut quadtree for large ones; both are vectorized with
+NumPy.
+"""
+
+# Graphs with more nodes use the Barnes–Hut approximation by default
+_BARNES_HUT_MIN_NODES = 1000
+
+# Depth limit of the quadtree; cells this deep are leaves even with several nodes
+_QUADTREE_MAX_DEPTH = 24
+
+
+class ForceLayout:
+    """Fruchterman–Reingold layout advanced one step at a time"""
+
+    def __init__(
+        self,
+        graph: Union[Graph, ArrayGraph],
+        positions: Optional[Dict] = None,
+        seed: Optional[int] = None,
+        scale: float = 10.0,
+        theta: float = 1.0,
+        barnes_hut: Optional[bool] = None,
+        cooling: float = 0.95,
+    ):
+        """
+        Set up the layout state.
+
+        :param graph: The graph instance or its array form; edge directions are ignored
+        :param positions: Starting positions keyed by node ID; other nodes start at random
+        :param seed: Seed for the random starting positions
+        :param scale: Side of the square the random starting positions are drawn from;
+            also sets the ideal edge length ``k = scale / sqrt(n)``
+        :param theta: Barnes–Hut opening angle; cells smaller than theta times their
+            distance are treated as one body, 0 gives exact forces
+        :param barnes_hut: Use the quadtree approximation, by default for graphs with
+            more than 1000 nodes
+        :param cooling: Factor the temperature is multiplied with after every step
+        """
+        array_graph = graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph)
+        n = array_graph.num_nodes
+        rng = np.random.default_rng(seed)
+
+        self.ids = array_graph.ids
+        self.positions = rng.random((n, 2)) * scale
+        for row, node_id in enumerate(self.ids):
+            if positions is not None and node_id in positions:
+                self.positions[row] = positions[node_id]
+
+        sources = array_graph.edge_sources()
+        targets = np.asarray(array_graph.targets)
+        keep = sources != targets
+        sources, targets = sources[keep], targets[keep]
+        if array_graph.directed:
+            # Undirected graphs store both arcs; pull both ends of directed ones too
+            sources, targets = np.concatenate((sources, targets)), np.concatenate(
+                (targets, sources)
+            )
+        self._sources = sources
+        self._targets = targets
+
+        self.k = scale / np.sqrt(max(n, 1))
+        self.theta = theta
+        self.barnes_hut = n > _BARNES_HUT_MIN_NODES if barnes_hut is None else barnes_hut
+        self.temperature = scale / 10
+        self.cooling = cooling
+
+    def step(self) -> float:
+        """
+        Move every node once along its net force, capped by the temperature.
+
+        :return: The largest distance a node moved
+        """
+        positions = self.positions
+        if len(positions) == 0:
+            return 0.0
+
+        if self.barnes_hut:
+            forces = _repulsion_barnes_hut(positions, self.k, self.theta)
+        else:
+            forces = _repulsion_exact(positions, self.k)
+
+        delta = positions[self._targets] - positions[self._sources]
+        distance = np.sqrt((delta**2).sum(axis=1))
+        pull = delta * (distance / self.k)[:, None]
+        forces[:, 0] += np.bincount(self._sources, pull[:, 0], minlength=len(positions))
+        forces[:, 1] += np.bincount(self._sources, pull[:, 1], minlength=len(positions))
+
+        length = np.sqrt((forces**2).sum(axis=1))
+        moves = np.minimum(length, self.temperature)
+        scale = np.divide(moves, length, out=np.zeros_like(length), where=length > 0)
+        positions += forces * scale[:, None]
+        self.temperature *= self.cooling
+        return float(moves.max())
+
+    def run(self, iterations: int = 50, tol: float = 1e-4) -> Dict:
+        """
+        Advance the layout for a number of steps.
+
+        :param iterations: Maximum number of steps
+        :param tol: Stop early once no node moves farther than this
+        :return: The positions keyed by node ID
+        """
+        for _ in range(iterations):
+            if self.step() < tol:
+                break
+        return self.to_dict()
+
+    def to_dict(self) -> Dict:
+        """Get the current positions keyed by node ID"""
+        return dict(zip(self.ids, map(tuple, self.positions.tolist())))
+
+
+def force_layout(
+    graph: Union[Graph, ArrayGraph],
+    iterations: int = 50,
+    positions: Optional[Dict] = None,
+    seed: Optional[int] = None,
+    barnes_hut: Optional[bool] = None,
+) -> Dict:
+    """
+    Lay out a graph with the Fruchterman–Reingold algorithm.
+
+    :param graph: The graph instance or its array form
+    :param iterations: Maximum number of steps
+    :param positions: Starting positions keyed by node ID; other nodes start at random
+    :param seed: Seed for the random starting positions
+    :param barnes_hut: Use the quadtree approximation, by default for graphs with
+        more than 1000 nodes
+    :return: The positions keyed by node ID
+    """
+    return ForceLayout(graph, positions, seed, barnes_hut=barnes_hut).run(iterations)
+
+
+def _repulsion_exact(positions: np.ndarray, k: float) -> np.ndarray:
+    """Sum the repulsive forces between all pairs of nodes."""
+    delta = positions[:, None, :] - positions[None, :, :]
+    distance2 = (delta**2).sum(axis=2)
+    np.fill_diagonal(distance2, np.inf)
+    distance2[distance2 == 0] = np.inf  # Coincident nodes don't push each other
+    return (delta * (k * k / distance2)[:, :, None]).sum(axis=1)
+
+
+def _repulsion_barnes_hut(positions: np.ndarray, k: float, theta: float) -> np.ndarray:
+    """
+    Approximate the repulsive forces with a Barnes–Hut quadtree.
+
+    All nodes walk the tree together: each (node, cell) pair either applies the
+    cell's mass at its centre, when the cell is a leaf or looks smaller than theta
+    from the node, or is replaced by pairs with the cell's children.
+    """
+    n = len(positions)
+    masses, centres, sizes, child_starts, child_counts = _quadtree(positions)
+    # Nodes closer to a cell's centre than this squared distance open it; leaves never open
+    opening = np.where(child_counts > 0, sizes**2 / max(theta * theta, 1e-300), -1.0)
+    # Coordinates as separate arrays, which gather faster than rows of a 2D array
+    px, py = positions[:, 0].copy(), positions[:, 1].copy()
+    cx, cy = centres[:, 0].copy(), centres[:, 1].copy()
+    fx = np.zeros(n)
+    fy = np.zeros(n)
+
+    bodies = np.arange(n)
+    cells = np.zeros(n, dtype=np.int64)
+    while bodies.size:
+        dx = px[bodies] - cx[cells]
+        dy = py[bodies] - cy[cells]
+        distance2 = dx * dx + dy * dy
+        near = distance2 <= opening[cells]
+
+        far = ~near & (distance2 > 0)
+        push = k * k * masses[cells[far]] / distance2[far]
+        fx += np.bincount(bodies[far], dx[far] * push, minlength=n)
+        fy += np.bincount(bodies[far], dy[far] * push, minlength=n)
+
+        opened = cells[near]
+        counts = child_counts[opened]
+        bodies = np.repeat(bodies[near], counts)
+        ends = np.cumsum(counts)
+        cells = np.repeat(child_starts[opened] - (ends - counts), counts) + np.arange(
+            ends[-1] if counts.size else 0
+        )
+    return np.column_stack((fx, fy))
+
+
+def _quadtree(
+    positions: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build a quadtree of the positions, one level at a time.
+
+    Cells are numbered level by level with the root as cell 0, and the children of
+    every cell are consecutive.
+
+    :return: Per cell: mass (node count), centre of mass, side length, index of the
+        first child and number of children (0 for leaves)
+    """
+    n = len(positions)
+    origin = positions.min(axis=0)
+    extent = float((positions.max(axis=0) - origin).max()) or 1.0
+    unit = (positions - origin) / (extent * (1 + 1e-9))  # In [0, 1)
+
+    masses = [np.array([n], dtype=np.float64)]
+    centres = [positions.mean(axis=0)[None, :]]
+    sizes = [np.array([extent])]
+    child_starts = []
+    child_counts = []
+
+    points = np.arange(n)
+    point_cells = np.zeros(n, dtype=np.int64)  # Cell of every point in points, within its level
+    next_cell = 1
+    for depth in range(1, _QUADTREE_MAX_DEPTH + 1):
+        level_masses = masses[-1]
+        # Points in cells holding more than one node go down a level
+        split = level_masses[point_cells] > 1
+        points, point_cells = points[split], point_cells[split]
+        starts = np.zeros(len(level_masses), dtype=np.int64)
+        counts = np.zeros(len(level_masses), dtype=np.int64)
+        if points.size == 0:
+            child_starts.append(starts)
+            child_counts.append(counts)
+            break
+
+        quadrant = (np.floor(unit[points] * (1 << depth)).astype(np.int64) & 1) @ np.array([2, 1])
+        keys, point_cells = np.unique(point_cells * 4 + quadrant, return_inverse=True)
+        parents = keys // 4
+        counts[:] = np.bincount(parents, minlength=len(level_masses))
+        starts[:] = next_cell + np.searchsorted(parents, np.arange(len(level_masses)))
+        child_starts.append(starts)
+        child_counts.append(counts)
+
+        cell_masses = np.bincount(point_cells).astype(np.float64)
+        cell_centres = np.column_stack(
+            [np.bincount(point_cells, positions[points, axis]) for axis in (0, 1)]
+        )
+        masses.append(cell_masses)
+        centres.append(cell_centres / cell_masses[:, None])
+        sizes.append(np.full(len(keys), extent / (1 << depth)))
+        next_cell += len(keys)
+    else:
+        child_starts.append(np.zeros(len(masses[-1]), dtype=np.int64))
+        child_counts.append(np.zeros(len(masses[-1]), dtype=np.int64))
+
+    return (
+        np.concatenate(masses),
+        np.concatenate(centres),
+        np.concatenate(sizes),
+        np.concatenate(child_starts),
+        np.concatenate(child_counts),
+    )
@@ -4,15 +4,17 @@ from typing import Dict, Any, Optional
 class Node:
     """Class representing a graph node"""
 
-    def __init__(self, id: Any, data: Optional[Dict] = None):
+    def __init__(self, id: Any, data: Optional[Dict] = None, index: Optional[int] = None):
         """
         Initialize a node.
 
         :param id: Unique identifier for the node (int or str)
         :param data: Additional node data as dictionary
+        :param index: Slot of the node in the graph's node columns
         """
         self.id = id
         self.data = data or {}
+        self.index = index
         self.position = None  # Will store (x, y) coordinates for visualization
 
     def __str__(self):
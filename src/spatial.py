@@ -0,0 +1,115 @@
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+import math
+
+
+class SpatialGrid:
+    """
+    Uniform grid index of 2D points, for hit-testing and range queries.
+
+    Points are bucketed into square cells of side ``cell_size``; a query only
+    looks at the cells overlapping its area, so with evenly spread points it
+    costs about the number of points found instead of the number indexed.
+    Moving a point with ``insert`` is O(1).
+    """
+
+    def __init__(self, cell_size: float = 1.0):
+        """
+        Create an empty index.
+
+        :param cell_size: Side of the grid cells; about the typical query radius works best
+        :raises: ValueError if cell_size is not positive
+        """
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._points: Dict[Hashable, Tuple[float, float, Tuple[int, int]]] = {}
+
+    def insert(self, key: Hashable, x: float, y: float) -> None:
+        """Add a point, or move it if the key is already indexed"""
+        entry = self._points.get(key)
+        cell = self._cell(x, y)
+        if entry is not None and entry[2] != cell:
+            self._discard(key, entry[2])
+        if entry is None or entry[2] != cell:
+            self._cells.setdefault(cell, set()).add(key)
+        self._points[key] = (float(x), float(y), cell)
+
+    def update(self, points: Iterable[Tuple[Hashable, Any]]) -> None:
+        """Add or move many points given as (key, (x, y)) pairs"""
+        for key, (x, y) in points:
+            self.insert(key, x, y)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a point if it is indexed"""
+        entry = self._points.pop(key, None)
+        if entry is not None:
+            self._discard(key, entry[2])
+
+    def clear(self) -> None:
+        """Remove all points"""
+        self._cells.clear()
+        self._points.clear()
+
+    def position(self, key: Hashable) -> Tuple[float, float]:
+        """Get the indexed position of a point"""
+        x, y, _ = self._points[key]
+        return x, y
+
+    def nearest(self, x: float, y: float, radius: float) -> Optional[Hashable]:
+        """
+        Find the point closest to (x, y) within a radius.
+
+        :return: The key of the closest point, or None if none is within the radius
+        """
+        best = None
+        best_distance = radius * radius
+        for key in self._keys_in(x - radius, y - radius, x + radius, y + radius):
+            px, py, _ = self._points[key]
+            distance = (px - x) ** 2 + (py - y) ** 2
+            if distance <= best_distance:
+                best, best_distance = key, distance
+        return best
+
+    def query_rect(self, x0: float, y0: float, x1: float, y1: float) -> List[Hashable]:
+        """Get the keys of all points inside a rectangle, given by any two opposite corners"""
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        found = []
+        for key in self._keys_in(x0, y0, x1, y1):
+            px, py, _ = self._points[key]
+            if x0 <= px <= x1 and y0 <= py <= y1:
+                found.append(key)
+        return found
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._points
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _discard(self, key: Hashable, cell: Tuple[int, int]) -> None:
+        members = self._cells[cell]
+        members.discard(key)
+        if not members:
+            del self._cells[cell]
+
+    def _keys_in(self, x0: float, y0: float, x1: float, y1: float) -> Iterable[Hashable]:
+        """Yield the keys in all cells overlapping a rectangle."""
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        cells = self._cells
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+            # Scanning the occupied cells is cheaper than the empty area
+            for (cx, cy), members in cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield from members
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                members = cells.get((cx, cy))
+                if members:
+                    yield from members
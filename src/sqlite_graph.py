@@ -0,0 +1,296 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import json
+import sqlite3
+import numpy as np
+from array_graph import ArrayGraph
+from edge import Edge
+from node import Node
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS nodes (id PRIMARY KEY, data TEXT);
+CREATE TABLE IF NOT EXISTS edges (source, target, weight REAL NOT NULL, data TEXT);
+CREATE INDEX IF NOT EXISTS edges_source_target ON edges (source, target);
+CREATE INDEX IF NOT EXISTS edges_target ON edges (target);
+"""
+
+
+class SQLiteGraph:
+    """
+    Graph stored in a SQLite database, for graphs that don't fit in memory.
+
+    Nodes and edges live in indexed tables; only the adjacency lists of recently
+    visited nodes are kept in memory, in an LRU cache. The ``nodes``, ``node_list``,
+    ``get_edges`` and ``max_integer_weight`` members match ``Graph``, so the
+    search algorithms run on it unchanged. Undirected edges are stored in both
+    directions, as in ``Graph``.
+    """
+
+    def __init__(self, path: str = ":memory:", directed: bool = False, cache_size: int = 4096):
+        """
+        Open or create a graph database.
+
+        :param path: Database file, or ":memory:" for a temporary in-memory database
+        :param directed: Whether a new graph is directed; an existing database keeps its own
+        :param cache_size: Number of adjacency lists kept in memory
+        """
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('directed', ?)", (int(directed),)
+            )
+        (stored,) = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'directed'"
+        ).fetchone()
+        self.directed = bool(stored)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Union[int, str], List[Edge]]" = OrderedDict()
+        self.nodes = _NodeView(self.connection)
+
+    @property
+    def node_list(self) -> List[Node]:
+        """Get list of all nodes"""
+        return [
+            Node(node_id, _load_data(data))
+            for node_id, data in self.connection.execute(
+                "SELECT id, data FROM nodes ORDER BY rowid"
+            )
+        ]
+
+    def add_node(self, node_id: Union[int, str], data: Optional[Dict] = None) -> Node:
+        """Add or get existing node"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO nodes (id, data) VALUES (?, ?)", (node_id, _dump_data(data))
+            )
+        return self.nodes[node_id]
+
+    def add_edge(
+        self,
+        source_id: Union[int, str],
+        target_id: Union[int, str],
+        weight: float = 1.0,
+        data: Optional[Dict] = None,
+    ) -> None:
+        """Add edge between nodes"""
+        self.add_edges_from([(source_id, target_id, weight, data)])
+
+    def add_edges_from(self, edges: Iterable[Tuple], batch_size: int = 65536) -> None:
+        """
+        Add many edges in one transaction.
+
+        :param edges: Tuples of (source_id, target_id), (source_id, target_id, weight)
+            or (source_id, target_id, weight, data)
+        :param batch_size: Number of edges passed to SQLite per statement
+        """
+        with self.connection:
+            batch = []
+            for item in edges:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    self._insert_edges(batch)
+                    batch = []
+            self._insert_edges(batch)
+
+    def remove_node(self, node_id: Union[int, str]) -> None:
+        """Remove node and all connected edges"""
+        with self.connection:
+            self.connection.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+            # Two deletes, as each side uses its own index where the OR would scan
+            self.connection.execute("DELETE FROM edges WHERE source = ?", (node_id,))
+            self.connection.execute("DELETE FROM edges WHERE target = ?", (node_id,))
+            self._forget_max_integer_weight()
+        self._cache.clear()
+
+    def remove_edge(self, source_id: Union[int, str], target_id: Union[int, str]) -> None:
+        """Remove edge between two nodes"""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM edges WHERE source = ? AND target = ?", (source_id, target_id)
+            )
+            if not self.directed:
+                self.connection.execute(
+                    "DELETE FROM edges WHERE source = ? AND target = ?", (target_id, source_id)
+                )
+            self._forget_max_integer_weight()
+        self._cache.pop(source_id, None)
+        self._cache.pop(target_id, None)
+
+    def set_edge_weight(
+        self, source_id: Union[int, str], target_id: Union[int, str], weight: float
+    ) -> None:
+        """Change the weight of all edges between two nodes"""
+        pairs = [(source_id, target_id)]
+        if not self.directed:
+            pairs.append((target_id, source_id))
+        with self.connection:
+            cursor = self.connection.executemany(
+                "UPDATE edges SET weight = ? WHERE source = ? AND target = ?",
+                [(weight, source, target) for source, target in pairs],
+            )
+            if cursor.rowcount == 0:
+                raise ValueError(f"Edge {source_id} -> {target_id} not found in graph")
+            self._forget_max_integer_weight()
+        self._cache.pop(source_id, None)
+        self._cache.pop(target_id, None)
+
+    def get_edges(self, node_id: Union[int, str]) -> List[Edge]:
+        """Get all edges for a node"""
+        cache = self._cache
+        edges = cache.get(node_id)
+        if edges is not None:
+            cache.move_to_end(node_id)
+            return edges
+
+        rows = self.connection.execute(
+            "SELECT target, weight, data FROM edges WHERE source = ? ORDER BY rowid", (node_id,)
+        ).fetchall()
+        if not rows and node_id not in self.nodes:
+            return []
+        source = Node(node_id)
+        edges = [
+            Edge(source, Node(target_id), weight, self.directed, _load_data(data))
+            for target_id, weight, data in rows
+        ]
+        cache[node_id] = edges
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return edges
+
+    def max_integer_weight(self) -> Optional[int]:
+        """
+        Get the largest edge weight if all weights are non-negative integers, else None.
+
+        The result is kept in the meta table until the edges change through the
+        SQLiteGraph methods, so only the first call scans the edges table.
+        """
+        cached = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'max_integer_weight'"
+        ).fetchone()
+        if cached is not None:
+            return cached[0]
+
+        (invalid,) = self.connection.execute(
+            "SELECT EXISTS (SELECT 1 FROM edges WHERE weight < 0 OR weight != CAST(weight AS INTEGER))"
+        ).fetchone()
+        largest = None
+        if not invalid:
+            (largest,) = self.connection.execute("SELECT MAX(weight) FROM edges").fetchone()
+            largest = int(largest or 0)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('max_integer_weight', ?)",
+                (largest,),
+            )
+        return largest
+
+    def freeze(self) -> ArrayGraph:
+        """Get an array (CSR) snapshot of the graph, for the vectorized algorithms"""
+        ids = list(self.nodes)
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        sources = []
+        targets = []
+        weights = []
+        for source_id, target_id, weight in self.connection.execute(
+            "SELECT source, target, weight FROM edges ORDER BY rowid"
+        ):
+            sources.append(index[source_id])
+            targets.append(index[target_id])
+            weights.append(weight)
+
+        sources = np.array(sources, dtype=np.int64)
+        targets = np.array(targets, dtype=np.int64)
+        order = np.lexsort((targets, sources))
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(ids)), out=offsets[1:])
+        return ArrayGraph(
+            ids,
+            offsets,
+            targets[order],
+            np.array(weights, dtype=np.float64)[order],
+            self.directed,
+            index,
+        )
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self.connection.close()
+
+    def __enter__(self) -> "SQLiteGraph":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _insert_edges(self, edges: List[Tuple]) -> None:
+        """Insert edges and their end nodes inside the current transaction."""
+        if not edges:
+            return
+        rows = []
+        for item in edges:
+            source_id, target_id = item[0], item[1]
+            weight = item[2] if len(item) > 2 else 1.0
+            data = _dump_data(item[3] if len(item) > 3 else None)
+            rows.append((source_id, target_id, weight, data))
+            if not self.directed:
+                rows.append((target_id, source_id, weight, data))
+
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO nodes (id) VALUES (?)",
+            ((node_id,) for item in edges for node_id in item[:2]),
+        )
+        self.connection.executemany(
+            "INSERT INTO edges (source, target, weight, data) VALUES (?, ?, ?, ?)", rows
+        )
+        for source_id, target_id, _, _ in rows:
+            self._cache.pop(source_id, None)
+        self._forget_max_integer_weight()
+
+    def _forget_max_integer_weight(self) -> None:
+        """Drop the stored max_integer_weight inside the current transaction."""
+        self.connection.execute("DELETE FROM meta WHERE key = 'max_integer_weight'")
+
+    def __repr__(self):
+        (edge_count,) = self.connection.execute("SELECT COUNT(*) FROM edges").fetchone()
+        return f"SQLiteGraph(directed={self.directed}, nodes={len(self.nodes)}, edges={edge_count})"
+
+
+class _NodeView(Mapping):
+    """Read-only mapping of node IDs to nodes, backed by the nodes table"""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def __getitem__(self, node_id: Union[int, str]) -> Node:
+        row = self._connection.execute("SELECT data FROM nodes WHERE id = ?", (node_id,)).fetchone()
+        if row is None:
+            raise KeyError(node_id)
+        return Node(node_id, _load_data(row[0]))
+
+    def __contains__(self, node_id: Any) -> bool:
+        return (
+            self._connection.execute("SELECT 1 FROM nodes WHERE id = ?", (node_id,)).fetchone()
+            is not None
+        )
+
+    def __iter__(self) -> Iterator[Union[int, str]]:
+        for (node_id,) in self._connection.execute("SELECT id FROM nodes ORDER BY rowid"):
+            yield node_id
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+
+def _dump_data(data: Optional[Dict]) -> Optional[str]:
+    """Serialize node or edge data for storage, storing nothing for empty data."""
+    return json.dumps(data) if data else None
+
+
+def _load_data(text: Optional[str]) -> Dict:
+    """Deserialize stored node or edge data."""
+    return json.loads(text) if text else {}
@@ -1,91 +1,494 @@
+import bz2
+import functools
+import gc
+import gzip
+import hashlib
 import json
+import lzma
+import os
+import pickle
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
 import csv
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing import Pool
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from array_graph import ArrayGraph
+from edge import Edge
 from graph import Graph
 
 """
-Storage module for saving and loading graphs in JSON, XML, and CSV formats.
+Storage module for saving and loading graphs in JSON, NDJSON, XML, CSV, and binary formats.
+
+Text formats may be gzip, bz2 or xz compressed: files are compressed on saving
+according to their extension and decompressed on loading according to their
+magic bytes.
+
+After ``enable_cache()``, the file loaders keep the parsed graphs in an on-disk
+pickle cache and skip parsing on later loads of an unchanged file.
 """
 
+# Version of the binary directory format written by save_binary
+_BINARY_VERSION = 1
+
+# Bytes read per chunk by load_edge_list
+_EDGE_LIST_CHUNK = 1 << 24
+
+# Header row written by save_to_csv, which tells its files apart from edge lists
+_CSV_HEADER = b"type,id,source,target,weight,x,y"
+
+# Compression modules by file extension, used when writing
+_COMPRESSION_EXTENSIONS = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+
+# Compression modules by leading magic bytes, used when reading
+_COMPRESSION_MAGIC = ((b"\x1f\x8b", gzip), (b"BZh", bz2), (b"\xfd7zXZ\x00", lzma))
+
+# Formats by file extension (after any compression extension), used by save_graph
+_FORMAT_EXTENSIONS = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".xml": "xml",
+    ".csv": "csv",
+}
+
+# Parsed-graph cache used by the file loaders, set by enable_cache
+_cache: Optional["_GraphCache"] = None
+
+
+def enable_cache(directory: Optional[str] = None, max_bytes: int = 1 << 32) -> None:
+    """
+    Cache the graphs parsed by the file loaders on disk.
+
+    Entries are keyed by the file path, size, modification time and a hash of
+    its content, together with the loader and its arguments. A hit unpickles the
+    stored result instead of parsing the file. Once the cache grows past
+    ``max_bytes``, the least recently used entries are removed.
+
+    Entries are pickles, and unpickling runs code chosen by whoever wrote them,
+    so the directory must only be writable by the current user. It is created
+    with mode 0700, an existing one is narrowed to 0700, and a directory owned
+    by another user is refused.
+
+    :param directory: Cache directory, by default ``~/.cache/graph-storage``
+    :param max_bytes: Size limit of the cache directory
+    :raises: PermissionError if the directory is owned by another user
+    """
+    global _cache
+    if directory is None:
+        directory = os.path.join(os.path.expanduser("~"), ".cache", "graph-storage")
+    _cache = _GraphCache(directory, max_bytes)
+
+
+def disable_cache() -> None:
+    """Stop caching parsed graphs; the cache directory is kept"""
+    global _cache
+    _cache = None
+
+
+def _cached(loader: Callable[..., Any]) -> Callable[..., Any]:
+    """Route calls of a file loader through the parsed-graph cache while it's enabled."""
+
+    @functools.wraps(loader)
+    def load(filename: str, *args: Any, **kwargs: Any) -> Any:
+        if _cache is None:
+            return loader(filename, *args, **kwargs)
+        return _cache.load(loader, filename, args, kwargs)
+
+    return load
+
 
 def save_to_json(graph: Graph, filename: str) -> None:
     """Save the graph to a JSON file."""
-    with open(filename, "w", encoding="utf-8") as f:
+    with _open(filename, "w") as f:
         json.dump(graph.to_dict(), f, indent=4)
 
 
+@_cached
 def load_from_json(filename: str) -> Graph:
     """Load a graph from a JSON file."""
-    with open(filename, "r", encoding="utf-8") as f:
+    with _open(filename, "r") as f:
         data = json.load(f)
     return Graph.from_dict(data)
 
 
-def save_to_xml(graph: Graph, filename: str, node_positions: dict = None) -> None:
-    """Save the graph to an XML file, including node positions if provided."""
-    root = ET.Element("graph", directed=str(graph.directed).lower())
-
-    nodes_elem = ET.SubElement(root, "nodes")
-    for node in graph.node_list:
-        node_attrs = {"id": str(node.id)}
-        if node_positions and str(node.id) in node_positions:
-            pos = node_positions[str(node.id)]
-            node_attrs["x"] = str(pos[0])
-            node_attrs["y"] = str(pos[1])
-        ET.SubElement(nodes_elem, "node", **node_attrs)
-
-    edges_elem = ET.SubElement(root, "edges")
-    for edges in graph.edges.values():
+def save_to_ndjson(graph: Graph, filename: str, node_positions: dict = None) -> None:
+    """
+    Save the graph to a newline-delimited JSON file, streaming from the adjacency.
+
+    The first line is a ``{"type": "graph", "directed": ...}`` header, followed by
+    one ``node`` record per node and one ``edge`` record per edge, grouped by source.
+    Undirected edges are written once. Node positions are looked up by ``str(node.id)``.
+    """
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    with _open(filename, "w") as f:
+        f.write(encode({"type": "graph", "directed": graph.directed}) + "\n")
+
+        for node in graph.nodes.values():
+            record = {"type": "node", "id": node.id, "data": node.data}
+            if node_positions and str(node.id) in node_positions:
+                pos = node_positions[str(node.id)]
+                record["x"] = float(pos[0])
+                record["y"] = float(pos[1])
+            f.write(encode(record) + "\n")
+
+        for edges in _edge_rows(graph):
+            lines = []
+            for edge in edges:
+                record = {
+                    "type": "edge",
+                    "source": edge.source.id,
+                    "target": edge.target.id,
+                    "weight": edge.weight,
+                }
+                if edge.data:
+                    record["data"] = edge.data
+                lines.append(encode(record) + "\n")
+            f.writelines(lines)
+
+
+def _edge_rows(graph: Graph) -> Iterator[List[Edge]]:
+    """Yield the edges of every node, listing each undirected edge only once."""
+    if graph.directed:
+        yield from graph.edges.values()
+        return
+
+    index = {node_id: k for k, node_id in enumerate(graph.nodes)}
+    for node, edges in graph.edges.items():
+        source_index = index[node.id]
+        row = []
+        loop_seen = False
         for edge in edges:
-            if edge.directed == graph.directed:
-                ET.SubElement(
-                    edges_elem,
-                    "edge",
-                    source=str(edge.source.id),
-                    target=str(edge.target.id),
-                    weight=str(edge.weight),
+            target_index = index[edge.target.id]
+            # Each undirected edge is stored in both rows; keep the copy in the lower row
+            if target_index < source_index:
+                continue
+            if target_index == source_index:
+                # A self-loop is stored twice in the same row
+                loop_seen = not loop_seen
+                if not loop_seen:
+                    continue
+            row.append(edge)
+        yield row
+
+
+@_cached
+def load_from_ndjson(filename: str, batch_size: int = 65536) -> tuple[Graph, dict]:
+    """
+    Load a graph and node positions from a newline-delimited JSON file.
+
+    The file is read line by line and edges are added in batches of ``batch_size``,
+    so the whole document is never held in memory.
+
+    :raises: ValueError if the file doesn't start with a graph header or has an unknown record
+    """
+    with _open(filename, "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("type") != "graph":
+            raise ValueError(f"{filename} is not an NDJSON graph file")
+        graph = Graph(directed=header.get("directed", False))
+        node_positions = {}
+        batch = []
+
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_type = record.get("type")
+            if record_type == "edge":
+                batch.append(
+                    (
+                        record["source"],
+                        record["target"],
+                        record.get("weight", 1.0),
+                        record.get("data"),
+                    )
                 )
+                if len(batch) >= batch_size:
+                    graph.add_edges_from(batch)
+                    batch = []
+            elif record_type == "node":
+                node_id = record["id"]
+                graph.add_node(node_id, record.get("data"))
+                if "x" in record and "y" in record:
+                    node_positions[str(node_id)] = (float(record["x"]), float(record["y"]))
+            else:
+                raise ValueError(f"Unknown record type {record_type!r} in {filename}")
 
-    tree = ET.ElementTree(root)
-    tree.write(filename, encoding="utf-8", xml_declaration=True)
+        graph.add_edges_from(batch)
 
+    return graph, node_positions
 
-def load_from_xml(filename: str) -> tuple[Graph, dict]:
-    """Load a graph and node positions from an XML file."""
-    tree = ET.parse(filename)
-    root = tree.getroot()
 
-    directed = root.get("directed", "false").lower() == "true"
-    graph = Graph(directed=directed)
+def save_binary(graph: Union[Graph, ArrayGraph], path: str, node_positions: dict = None) -> None:
+    """
+    Save the graph as a directory of NumPy arrays that can be memory-mapped.
+
+    The directory holds ``offsets.npy``, ``targets.npy`` and ``weights.npy`` (the
+    CSR arrays of ``ArrayGraph``), ``ids.npy``, ``id_order.npy`` (the node indices
+    sorted by ID, for lookups without loading all IDs) and ``meta.json``, plus
+    ``positions.npy`` (NaN for nodes without a position) if positions are given.
+    Edge and node data are not stored.
+
+    :raises: ValueError if the node IDs are not all int or all str
+    """
+    array_graph = graph if isinstance(graph, ArrayGraph) else ArrayGraph.from_graph(graph)
+    ids = array_graph.ids
+    if all(isinstance(node_id, int) for node_id in ids):
+        id_type = "int"
+        id_array = np.array(ids, dtype=np.int64)
+    elif all(isinstance(node_id, str) for node_id in ids):
+        id_type = "str"
+        id_array = np.array(ids, dtype=str)
+    else:
+        raise ValueError("Node IDs must be all int or all str for the binary format")
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "offsets.npy"), np.asarray(array_graph.offsets, dtype=np.int64))
+    np.save(os.path.join(path, "targets.npy"), np.asarray(array_graph.targets, dtype=np.int64))
+    np.save(os.path.join(path, "weights.npy"), np.asarray(array_graph.weights, dtype=np.float64))
+    np.save(os.path.join(path, "ids.npy"), id_array)
+    np.save(os.path.join(path, "id_order.npy"), np.argsort(id_array, kind="stable"))
+
+    positions_path = os.path.join(path, "positions.npy")
+    if node_positions:
+        positions = np.full((len(ids), 2), np.nan)
+        for i, node_id in enumerate(ids):
+            pos = node_positions.get(str(node_id))
+            if pos is not None:
+                positions[i] = (pos[0], pos[1])
+        np.save(positions_path, positions)
+    elif os.path.exists(positions_path):
+        os.remove(positions_path)
+
+    meta = {"version": _BINARY_VERSION, "directed": array_graph.directed, "id_type": id_type}
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def load_binary(path: str, mmap: bool = True) -> tuple[ArrayGraph, dict]:
+    """
+    Load a graph and node positions saved by save_binary.
+
+    With ``mmap`` the edge arrays are memory-mapped read-only, so loading costs
+    no parsing and processes opening the same files share the OS page cache.
+    Use ``ArrayGraph.to_graph()`` to get a mutable graph.
+
+    :raises: ValueError if the directory was written by a newer format version
+    """
+    meta = _read_binary_meta(path)
+    mmap_mode = "r" if mmap else None
+    offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode=mmap_mode)
+    targets = np.load(os.path.join(path, "targets.npy"), mmap_mode=mmap_mode)
+    weights = np.load(os.path.join(path, "weights.npy"), mmap_mode=mmap_mode)
+    ids = np.load(os.path.join(path, "ids.npy")).tolist()
+    array_graph = ArrayGraph(ids, offsets, targets, weights, meta["directed"])
+
+    node_positions = {}
+    positions_path = os.path.join(path, "positions.npy")
+    if os.path.exists(positions_path):
+        positions = np.load(positions_path)
+        for node_id, (x, y) in zip(ids, positions.tolist()):
+            if x == x and y == y:  # NaN marks a node without a position
+                node_positions[str(node_id)] = (x, y)
+
+    return array_graph, node_positions
+
+
+def load_neighbourhood(path: str, node_id: Union[int, str], hops: int = 1) -> tuple[Graph, dict]:
+    """
+    Load the nodes within ``hops`` edges of a node from a binary graph directory.
+
+    All arrays are memory-mapped and the node is found by binary search in the
+    sorted ID index, so only the pages holding the visited rows are read.
+    Directed graphs are followed along edge direction. The result holds every
+    edge between the loaded nodes.
+
+    :param path: Directory written by save_binary
+    :param node_id: The node to start from, matched as an int or str like the stored IDs
+    :param hops: Number of edges to follow
+    :return: The neighbourhood graph and its node positions keyed by ``str(node.id)``
+    :raises: ValueError if the node doesn't exist
+    """
+    meta = _read_binary_meta(path)
+    offsets = np.load(os.path.join(path, "offsets.npy"), mmap_mode="r")
+    targets = np.load(os.path.join(path, "targets.npy"), mmap_mode="r")
+    weights = np.load(os.path.join(path, "weights.npy"), mmap_mode="r")
+    ids = np.load(os.path.join(path, "ids.npy"), mmap_mode="r")
+    start = _binary_node_index(path, ids, meta["id_type"], node_id)
+
+    visited = np.array([start], dtype=np.int64)
+    frontier = visited
+    for _ in range(hops):
+        reached = np.unique(targets[_row_edges(offsets, frontier)])
+        frontier = np.setdiff1d(reached, visited, assume_unique=True)
+        if frontier.size == 0:
+            break
+        visited = np.union1d(visited, frontier)
+
+    # Keep the edges between visited nodes, renumbered in the (sorted) visited order
+    counts = offsets[visited + 1] - offsets[visited]
+    edges = _row_edges(offsets, visited)
+    sources = np.repeat(np.arange(visited.shape[0]), counts)
+    edge_targets = np.asarray(targets[edges])
+    local_targets = np.minimum(np.searchsorted(visited, edge_targets), visited.shape[0] - 1)
+    keep = visited[local_targets] == edge_targets
+    sub_offsets = np.zeros(visited.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources[keep], minlength=visited.shape[0]), out=sub_offsets[1:])
+    neighbourhood = ArrayGraph(
+        ids[visited].tolist(),
+        sub_offsets,
+        local_targets[keep],
+        np.asarray(weights[edges])[keep],
+        meta["directed"],
+    )
+
+    node_positions = {}
+    positions_path = os.path.join(path, "positions.npy")
+    if os.path.exists(positions_path):
+        positions = np.load(positions_path, mmap_mode="r")[visited]
+        for neighbour_id, (x, y) in zip(neighbourhood.ids, positions.tolist()):
+            if x == x and y == y:  # NaN marks a node without a position
+                node_positions[str(neighbour_id)] = (x, y)
+
+    return neighbourhood.to_graph(), node_positions
+
+
+def _read_binary_meta(path: str) -> dict:
+    """Read the meta data of a binary graph directory."""
+    with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version", 0) > _BINARY_VERSION:
+        raise ValueError(f"Unsupported binary graph version {meta['version']} in {path}")
+    return meta
+
+
+def _binary_node_index(path: str, ids: np.ndarray, id_type: str, node_id: Union[int, str]) -> int:
+    """Find the index of a node by binary search over the sorted ID index."""
+    try:
+        key = int(node_id) if id_type == "int" else str(node_id)
+    except ValueError:
+        raise ValueError(f"Node {node_id} not found in {path}") from None
+
+    order_path = os.path.join(path, "id_order.npy")
+    if os.path.exists(order_path):
+        order = np.load(order_path, mmap_mode="r")
+    else:
+        order = np.argsort(ids, kind="stable")
+
+    low, high = 0, order.shape[0]
+    while low < high:
+        middle = (low + high) // 2
+        if ids[order[middle]] < key:
+            low = middle + 1
+        else:
+            high = middle
+    if low < order.shape[0] and ids[order[low]] == key:
+        return int(order[low])
+    raise ValueError(f"Node {node_id} not found in {path}")
+
+
+def _row_edges(offsets: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Get the edge positions of the given CSR rows, row by row."""
+    starts = np.asarray(offsets[rows])
+    counts = np.asarray(offsets[rows + 1]) - starts
+    total = int(counts.sum())
+    return np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+
+
+def save_to_xml(graph: Graph, filename: str, node_positions: dict = None) -> None:
+    """
+    Save the graph to an XML file, including node positions if provided.
+
+    Elements are written one by one as the adjacency is walked, so no document
+    tree is built in memory. Undirected edges are written once.
+    """
+    with _open(filename, "w") as f:
+        f.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        f.write(f'<graph directed="{str(graph.directed).lower()}">\n<nodes>\n')
+
+        for node in graph.nodes.values():
+            attrs = f"id={_xml_attr(node.id)}"
+            if node_positions and str(node.id) in node_positions:
+                pos = node_positions[str(node.id)]
+                attrs += f" x={_xml_attr(pos[0])} y={_xml_attr(pos[1])}"
+            f.write(f"<node {attrs} />\n")
+
+        f.write("</nodes>\n<edges>\n")
+        for edges in _edge_rows(graph):
+            f.writelines(
+                f"<edge source={_xml_attr(edge.source.id)} target={_xml_attr(edge.target.id)}"
+                f" weight={_xml_attr(edge.weight)} />\n"
+                for edge in edges
+            )
+        f.write("</edges>\n</graph>\n")
+
+
+@_cached
+def load_from_xml(filename: str, batch_size: int = 65536) -> tuple[Graph, dict]:
+    """
+    Load a graph and node positions from an XML file.
+
+    The file is parsed incrementally with ``iterparse``; every node and edge
+    element is dropped once consumed and edges are added in batches of
+    ``batch_size``, so memory stays close to the size of the resulting graph.
+    """
+    with _open(filename, "rb") as f:
+        return _parse_xml(f, batch_size)
+
+
+def _parse_xml(f: Any, batch_size: int) -> tuple[Graph, dict]:
+    """Build a graph and node positions from an open XML stream."""
+    graph = None
     node_positions = {}
+    batch = []
+    open_elements = []  # Ancestors of the current element, innermost last
 
-    nodes_elem = root.find("nodes")
-    if nodes_elem is not None:
-        for node_elem in nodes_elem.findall("node"):
-            node_id = node_elem.get("id")
+    for event, elem in ET.iterparse(f, events=("start", "end")):
+        if event == "start":
+            if graph is None:
+                graph = Graph(directed=elem.get("directed", "false").lower() == "true")
+            open_elements.append(elem)
+            continue
+        open_elements.pop()
+
+        tag = elem.tag
+        if tag == "node":
+            node_id = elem.get("id")
             graph.add_node(node_id)
-            x = node_elem.get("x")
-            y = node_elem.get("y")
+            x = elem.get("x")
+            y = elem.get("y")
             if x is not None and y is not None:
                 try:
                     node_positions[node_id] = (float(x), float(y))
                 except ValueError:
                     pass  # Игнорируем некорректные позиции
+        elif tag == "edge":
+            batch.append((elem.get("source"), elem.get("target"), float(elem.get("weight", 1.0))))
+            if len(batch) >= batch_size:
+                graph.add_edges_from(batch)
+                batch = []
 
-    edges_elem = root.find("edges")
-    if edges_elem is not None:
-        for edge_elem in edges_elem.findall("edge"):
-            source = edge_elem.get("source")
-            target = edge_elem.get("target")
-            weight = float(edge_elem.get("weight", 1.0))
-            graph.add_edge(source, target, weight)
+        # Drop every finished element, whatever its tag, so the tree never grows
+        elem.clear()
+        if open_elements:
+            open_elements[-1].remove(elem)
 
+    graph.add_edges_from(batch)
     return graph, node_positions
 
 
+def _xml_attr(value: Any) -> str:
+    """Quote a value for use as an XML attribute."""
+    return '"' + escape(str(value), {'"': "&quot;", "\n": "&#10;"}) + '"'
+
+
 def save_to_csv(graph: Graph, filename: str, node_positions: dict = None) -> None:
     """Save the graph to a CSV file, including node positions if provided."""
-    with open(filename, "w", newline="", encoding="utf-8") as f:
+    with _open(filename, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["type", "id", "source", "target", "weight", "x", "y"])
 
@@ -109,12 +512,13 @@ def save_to_csv(graph: Graph, filename: str, node_positions: dict = None) -> Non
                         saved_edges.add(edge_key)
 
 
+@_cached
 def load_from_csv(filename: str, directed: bool = False) -> tuple[Graph, dict]:
     """Load a graph and node positions from a CSV file."""
     graph = Graph(directed=directed)
     node_positions = {}
 
-    with open(filename, "r", newline="", encoding="utf-8") as f:
+    with _open(filename, "r", newline="") as f:
         reader = csv.reader(f)
 
         for row in reader:
@@ -136,3 +540,595 @@ def load_from_csv(filename: str, directed: bool = False) -> tuple[Graph, dict]:
                 continue
 
     return graph, node_positions
+
+
+@_cached
+def load_edge_list(
+    filename: str,
+    delimiter: Optional[str] = ",",
+    directed: bool = False,
+    header: bool = False,
+    node_type: type = str,
+    chunk_size: int = _EDGE_LIST_CHUNK,
+    workers: Optional[int] = None,
+) -> Graph:
+    """
+    Load a graph from a plain CSV/TSV edge list of ``source, target[, weight]`` rows.
+
+    The file is read in chunks of about ``chunk_size`` bytes cut at line ends.
+    Every chunk is split into columns at once, the weight column is converted
+    with NumPy and the edges are added with ``Graph.add_edges_from``. Blank lines
+    and lines starting with ``#`` are skipped; a missing weight is 1.0. The cyclic
+    garbage collector is paused meanwhile, as the millions of new objects would
+    otherwise trigger repeated full collections.
+
+    :param filename: Path of the edge list
+    :param delimiter: Column separator, or None to split on any whitespace
+    :param directed: Whether the graph is directed
+    :param header: Skip the first line
+    :param node_type: Type of the node IDs, str or int
+    :param chunk_size: Bytes per chunk
+    :param workers: Number of worker processes parsing chunks in parallel
+    :return: The loaded graph
+    :raises: ValueError if a row has fewer than two columns or a value doesn't parse
+    """
+    graph = Graph(directed=directed)
+    chunks = _read_chunks(filename, chunk_size, header)
+    tasks = ((chunk, delimiter, node_type) for chunk in chunks)
+
+    with _gc_paused():
+        if workers is not None and workers > 1:
+            # Keep a bounded number of parsed chunks in flight so memory stays flat
+            with Pool(workers, initializer=gc.disable) as pool:
+                pending: deque = deque()
+                for task in tasks:
+                    pending.append(pool.apply_async(_parse_edge_chunk_arrays, (task,)))
+                    if len(pending) >= 2 * workers:
+                        graph.add_edges_from(_array_rows(pending.popleft().get()))
+                while pending:
+                    graph.add_edges_from(_array_rows(pending.popleft().get()))
+        else:
+            for task in tasks:
+                sources, targets, weights = _parse_edge_chunk_task(task)
+                graph.add_edges_from(zip(sources, targets, weights))
+
+    return graph
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Disable the cyclic garbage collector for the duration of a bulk load."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _read_chunks(filename: str, chunk_size: int, header: bool) -> Iterator[bytes]:
+    """Read a file in chunks of whole lines."""
+    with _open(filename, "rb") as f:
+        if header:
+            f.readline()
+        rest = b""
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            data = rest + data
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                rest = data
+                continue
+            rest = data[end:]
+            yield data[:end]
+        if rest:
+            yield rest
+
+
+def _parse_edge_chunk_task(
+    task: Tuple[bytes, Optional[str], type],
+) -> Tuple[List[Union[int, str]], List[Union[int, str]], List[float]]:
+    """Parse one chunk of edge list lines into source, target and weight lists."""
+    data, delimiter, node_type = task
+    rows = [
+        line.split(delimiter)
+        for line in data.decode("utf-8").splitlines()
+        if line.strip() and not line.startswith("#")
+    ]
+    if any(len(row) < 2 for row in rows):
+        raise ValueError("Edge list rows need at least a source and a target column")
+
+    sources = [row[0].strip() for row in rows]
+    targets = [row[1].strip() for row in rows]
+    weights = np.array([row[2] if len(row) > 2 else "1" for row in rows], dtype=np.float64)
+    if node_type is not str:
+        sources = np.array(sources).astype(np.int64).tolist()
+        targets = np.array(targets).astype(np.int64).tolist()
+    return sources, targets, weights.tolist()
+
+
+def _parse_edge_chunk_arrays(
+    task: Tuple[bytes, Optional[str], type],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse one chunk in a worker process into NumPy columns.
+
+    Arrays go back to the parent as flat buffers, which pickle several times
+    faster than lists of Python strings or ints.
+    """
+    sources, targets, weights = _parse_edge_chunk_task(task)
+    return np.array(sources), np.array(targets), np.array(weights, dtype=np.float64)
+
+
+def _array_rows(
+    columns: Tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> Iterator[Tuple[Union[int, str], Union[int, str], float]]:
+    """Turn parsed NumPy columns back into (source, target, weight) rows of Python values."""
+    sources, targets, weights = columns
+    return zip(sources.tolist(), targets.tolist(), weights.tolist())
+
+
+def save_graph(
+    graph: Graph, path: str, node_positions: dict = None, file_format: Optional[str] = None
+) -> None:
+    """
+    Save the graph in the format given by the file extension.
+
+    ``.json`` files hold ``{"graph": graph.to_dict(), "node_positions": ...}``;
+    ``.ndjson``/``.jsonl``, ``.xml`` and ``.csv`` use save_to_ndjson, save_to_xml
+    and save_to_csv. An extra ``.gz``, ``.bz2`` or ``.xz`` extension compresses the file.
+
+    :param graph: The graph instance
+    :param path: File path, or directory path for the binary format
+    :param node_positions: Node positions keyed by ``str(node.id)``
+    :param file_format: One of "json", "ndjson", "xml", "csv" or "binary",
+        overriding the extension
+    :raises: ValueError if the format can't be told from the extension
+    """
+    if file_format is None:
+        file_format = _FORMAT_EXTENSIONS.get(_format_extension(path))
+        if file_format is None:
+            raise ValueError(f"Unknown graph file extension in {path}")
+
+    if file_format == "json":
+        data = {
+            "graph": graph.to_dict(),
+            "node_positions": {
+                str(k): [float(v[0]), float(v[1])] for k, v in (node_positions or {}).items()
+            },
+        }
+        with _open(path, "w") as f:
+            json.dump(data, f, indent=4)
+    elif file_format == "ndjson":
+        save_to_ndjson(graph, path, node_positions)
+    elif file_format == "xml":
+        save_to_xml(graph, path, node_positions)
+    elif file_format == "csv":
+        save_to_csv(graph, path, node_positions)
+    elif file_format == "binary":
+        save_binary(graph, path, node_positions)
+    else:
+        raise ValueError(f"Unknown graph format {file_format}")
+
+
+def load_graph(path: str, directed: bool = False) -> tuple[Graph, dict]:
+    """
+    Load a graph and node positions, detecting the format from the content.
+
+    Compressed files are decompressed on the fly. Directories are read as the
+    binary format; files are told apart by their first line: XML, JSON (plain
+    ``graph.to_dict()`` or with node positions, as written by save_graph), NDJSON,
+    this module's CSV format, or else a plain CSV/TSV edge list.
+
+    :param path: File path, or directory path for the binary format
+    :param directed: Whether the graph is directed, for CSV and edge-list files
+    :return: The graph and the node positions keyed by ``str(node.id)``
+    """
+    file_format = _detect_format(path)
+    if file_format == "binary":
+        array_graph, node_positions = load_binary(path)
+        return array_graph.to_graph(), node_positions
+    if file_format == "xml":
+        return load_from_xml(path)
+    if file_format == "ndjson":
+        return load_from_ndjson(path)
+    if file_format == "csv":
+        return load_from_csv(path, directed=directed)
+    if file_format == "json":
+        return _load_json_document(path)
+
+    with _open(path, "r") as f:
+        first_line = f.readline()
+        second_line = f.readline()
+    delimiter = "\t" if "\t" in first_line else "," if "," in first_line else None
+    header = _is_edge_list_header(first_line, second_line, delimiter)
+    return load_edge_list(path, delimiter=delimiter, directed=directed, header=header), {}
+
+
+def _is_edge_list_header(first_line: str, second_line: str, delimiter: Optional[str]) -> bool:
+    """
+    Tell whether the first line of an edge list is a header like ``source,target,weight``.
+
+    It is when its weight column is not a number, or, without a weight column,
+    when its node columns are not numbers but those of the next line are.
+    """
+
+    def is_number(value: str) -> bool:
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
+
+    first = [value.strip() for value in first_line.split(delimiter)]
+    if len(first) < 2:
+        return False
+    if len(first) > 2:
+        return not is_number(first[2])
+    second = [value.strip() for value in second_line.split(delimiter)]
+    return not any(map(is_number, first)) and len(second) >= 2 and all(map(is_number, second[:2]))
+
+
+@_cached
+def _load_json_document(filename: str) -> tuple[Graph, dict]:
+    """Load a graph and positions from a JSON file, with or without node positions."""
+    with _open(filename, "r") as f:
+        data = json.load(f)
+    if "graph" not in data:
+        # Plain graph.to_dict() output, which lists undirected edges twice as well
+        return _graph_from_json_document({"graph": data})
+    return _graph_from_json_document(data)
+
+
+def _graph_from_json_document(data: dict) -> tuple[Graph, dict]:
+    """Build a graph and positions from a JSON document written by save_graph."""
+    graph_data = data["graph"]
+    graph = Graph(directed=graph_data["directed"])
+    for node_id, node_data in graph_data["nodes"].items():
+        graph.add_node(node_id, node_data)
+
+    edges = graph_data["edges"]
+    if not graph.directed:
+        # graph.to_dict() lists every undirected edge from both ends; keep every second copy
+        seen = {}
+        once = []
+        for edge_data in edges:
+            source, target = edge_data["source"], edge_data["target"]
+            # A frozenset, as min/max fail on mixed int and str IDs
+            key = (frozenset((source, target)), edge_data.get("weight", 1.0))
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] % 2:
+                once.append(edge_data)
+        edges = once
+    graph.add_edges_from(
+        (e["source"], e["target"], e.get("weight", 1.0), e.get("data", {})) for e in edges
+    )
+
+    node_positions = {
+        str(k): (float(v[0]), float(v[1]))
+        for k, v in data.get("node_positions", {}).items()
+        if isinstance(v, list) and len(v) == 2 and all(isinstance(x, (int, float)) for x in v)
+    }
+    return graph, node_positions
+
+
+def _detect_format(path: str) -> str:
+    """Tell the graph format of a file or directory from its content."""
+    if os.path.isdir(path):
+        return "binary"
+    with _open(path, "rb") as f:
+        head = f.read(4096)
+
+    text = head.lstrip(b"\xef\xbb\xbf").lstrip()
+    first_line = text.split(b"\n", 1)[0].strip()
+    if text.startswith(b"<"):
+        return "xml"
+    if text.startswith(b"{"):
+        try:
+            if json.loads(first_line).get("type") == "graph":
+                return "ndjson"
+        except ValueError:
+            pass
+        return "json"
+    if first_line == _CSV_HEADER:
+        return "csv"
+    return "edge_list"
+
+
+def _format_extension(path: str) -> str:
+    """Get the lower-case format extension of a path, skipping a compression extension."""
+    root, extension = os.path.splitext(str(path))
+    if extension.lower() in _COMPRESSION_EXTENSIONS:
+        root, extension = os.path.splitext(root)
+    return extension.lower()
+
+
+def _open(filename: str, mode: str = "r", newline: Optional[str] = None) -> Any:
+    """
+    Open a file, decompressing by magic bytes when reading and compressing by extension when writing.
+
+    Text modes use UTF-8; modes containing "b" return a binary stream.
+    """
+    module = None
+    if "r" in mode:
+        with open(filename, "rb") as f:
+            head = f.read(6)
+        for magic, candidate in _COMPRESSION_MAGIC:
+            if head.startswith(magic):
+                module = candidate
+                break
+    else:
+        extension = os.path.splitext(str(filename))[1]
+        module = _COMPRESSION_EXTENSIONS.get(extension.lower())
+
+    if "b" in mode:
+        return open(filename, mode) if module is None else module.open(filename, mode)
+    if module is None:
+        return open(filename, mode, encoding="utf-8", newline=newline)
+    return module.open(filename, mode + "t", encoding="utf-8", newline=newline)
+
+
+class _GraphCache:
+    """Directory of pickled loader results, evicted least recently used first."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if hasattr(os, "getuid"):
+            # Pickles are only as trustworthy as everyone who can write the directory
+            stat = os.stat(directory)
+            if stat.st_uid != os.getuid():
+                raise PermissionError(f"Cache directory {directory} is owned by another user")
+            if stat.st_mode & 0o077:
+                os.chmod(directory, 0o700)
+
+    def load(self, loader: Callable[..., Any], filename: str, args: tuple, kwargs: dict) -> Any:
+        """Get the result of loader(filename, *args, **kwargs) from the cache or by loading."""
+        entry = os.path.join(self.directory, self._key(loader, filename, args, kwargs) + ".pickle")
+        try:
+            with open(entry, "rb") as f, _gc_paused():
+                result = pickle.load(f)
+            os.utime(entry)  # Mark as recently used
+            return result
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        result = loader(filename, *args, **kwargs)
+        temporary = f"{entry}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f, _gc_paused():
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, entry)
+        self._evict()
+        return result
+
+    @staticmethod
+    def _key(loader: Callable[..., Any], filename: str, args: tuple, kwargs: dict) -> str:
+        """Hash the file fingerprint and the loader call into an entry name."""
+        stat = os.stat(filename)
+        content = hashlib.blake2b()
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                content.update(chunk)
+        call = (loader.__name__, args, sorted(kwargs.items()))
+        fingerprint = (
+            os.path.abspath(filename),
+            stat.st_size,
+            stat.st_mtime_ns,
+            content.hexdigest(),
+            call,
+        )
+        return hashlib.blake2b(repr(fingerprint).encode("utf-8"), digest_size=20).hexdigest()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pickle"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        # The newest entry, just written, is kept even if it alone is too large
+        for _, size, path in sorted(entries)[:-1]:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+class DeltaLog:
+    """
+    Persist a graph as a base snapshot plus an append-only log of its mutations.
+
+    The graph lives in a directory holding ``snapshot-<n>.ndjson`` (save_to_ndjson)
+    and ``log-<n>.ndjson``, where every mutation of the followed graph is appended
+    as one JSON record. Saving a change costs one line instead of a full rewrite.
+    Once the log grows past ``compact_bytes`` the graph is written to the next
+    snapshot generation and the old files are removed; a crash during compaction
+    leaves either the old or the new generation complete.
+    """
+
+    def __init__(self, path: str, directed: bool = False, compact_bytes: int = 1 << 24):
+        """
+        Set up the log; call load() or attach() to start persisting a graph.
+
+        :param path: Directory of the snapshot and log, created if missing
+        :param directed: Whether a graph created for an empty directory is directed
+        :param compact_bytes: Log size above which the log is folded into a new snapshot
+        """
+        self.path = str(path)
+        self.directed = directed
+        self.compact_bytes = compact_bytes
+        self.graph: Optional[Graph] = None
+        self.node_positions: dict = {}
+        self.generation = 0
+        self._log = None
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def load(self) -> tuple[Graph, dict]:
+        """
+        Replay the latest snapshot and its log, then start following the graph.
+
+        A truncated last log line, left by a crash while appending, is dropped.
+
+        :return: The graph and the node positions keyed by ``str(node.id)``
+        """
+        os.makedirs(self.path, exist_ok=True)
+        generations = self._generations()
+        if generations:
+            self.generation = generations[-1]
+            graph, self.node_positions = load_from_ndjson(self._snapshot_path(self.generation))
+        else:
+            self.generation = 0
+            graph, self.node_positions = Graph(directed=self.directed), {}
+
+        log_path = self._log_path(self.generation)
+        if os.path.exists(log_path):
+            valid_bytes = self._replay(graph, log_path)
+            with open(log_path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+        self._remove_other_generations()
+        self._follow(graph)
+        if not generations:
+            self.compact()
+        return graph, self.node_positions
+
+    def attach(self, graph: Graph, node_positions: dict = None) -> None:
+        """Write a graph as the new snapshot and start following it."""
+        os.makedirs(self.path, exist_ok=True)
+        generations = self._generations()
+        self.generation = generations[-1] if generations else 0
+        self.node_positions = {str(k): tuple(v) for k, v in (node_positions or {}).items()}
+        self._follow(graph)
+        self.compact()
+
+    def set_position(self, node_id: Union[int, str], x: float, y: float) -> None:
+        """Record a new position for a node"""
+        self.node_positions[str(node_id)] = (float(x), float(y))
+        self._append({"op": "set_position", "id": node_id, "x": float(x), "y": float(y)})
+
+    def compact(self) -> None:
+        """Write the graph to a new snapshot generation and start an empty log"""
+        generation = self.generation + 1
+        snapshot_path = self._snapshot_path(generation)
+        save_to_ndjson(self.graph, snapshot_path + ".tmp", self.node_positions)
+        open(self._log_path(generation), "wb").close()
+        # The rename makes the new generation visible; until then loading uses the old one
+        os.replace(snapshot_path + ".tmp", snapshot_path)
+
+        if self._log is not None:
+            self._log.close()
+        self.generation = generation
+        self._log = open(self._log_path(generation), "a", encoding="utf-8")
+        self._remove_other_generations()
+
+    def close(self) -> None:
+        """Stop following the graph and close the log"""
+        if self.graph is not None:
+            self.graph.unsubscribe(self._on_change)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _follow(self, graph: Graph) -> None:
+        """Subscribe to the mutations of a graph, leaving any previous one."""
+        self.close()
+        self.graph = graph
+        graph.subscribe(self._on_change)
+        self._log = open(self._log_path(self.generation), "a", encoding="utf-8")
+
+    def _on_change(self, event: str, *args: Any) -> None:
+        """Append a graph mutation event to the log."""
+        if event == "add_node":
+            record = {"op": event, "id": args[0], "data": args[1]}
+        elif event == "add_edge":
+            record = {
+                "op": event,
+                "source": args[0],
+                "target": args[1],
+                "weight": args[2],
+                "data": args[3],
+            }
+        elif event == "remove_node":
+            record = {"op": event, "id": args[0]}
+            self.node_positions.pop(str(args[0]), None)
+        elif event == "remove_edge":
+            record = {"op": event, "source": args[0], "target": args[1]}
+        elif event == "set_edge_weight":
+            record = {"op": event, "source": args[0], "target": args[1], "weight": args[2]}
+        else:
+            return
+        self._append(record)
+
+    def _append(self, record: dict) -> None:
+        """Write one record and compact the log if it got too large."""
+        self._log.write(self._encode(record) + "\n")
+        self._log.flush()
+        if self._log.tell() > self.compact_bytes:
+            self.compact()
+
+    def _replay(self, graph: Graph, log_path: str) -> int:
+        """Apply the records of a log to a graph, returning the length of its valid part."""
+        valid_bytes = 0
+        with open(log_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+
+                op = record["op"]
+                if op == "add_node":
+                    graph.add_node(record["id"], record.get("data"))
+                elif op == "add_edge":
+                    graph.add_edge(
+                        record["source"],
+                        record["target"],
+                        record.get("weight", 1.0),
+                        record.get("data"),
+                    )
+                elif op == "remove_node":
+                    graph.remove_node(record["id"])
+                    self.node_positions.pop(str(record["id"]), None)
+                elif op == "remove_edge":
+                    graph.remove_edge(record["source"], record["target"])
+                elif op == "set_edge_weight":
+                    graph.set_edge_weight(record["source"], record["target"], record["weight"])
+                elif op == "set_position":
+                    self.node_positions[str(record["id"])] = (record["x"], record["y"])
+        return valid_bytes
+
+    def _generations(self) -> List[int]:
+        """Get the generations with a complete snapshot, in increasing order."""
+        generations = []
+        for name in os.listdir(self.path):
+            if name.startswith("snapshot-") and name.endswith(".ndjson"):
+                number = name.removeprefix("snapshot-").removesuffix(".ndjson")
+                if number.isdigit():
+                    generations.append(int(number))
+        return sorted(generations)
+
+    def _remove_other_generations(self) -> None:
+        """Delete the files of all generations but the current one."""
+        keep = {
+            os.path.basename(self._snapshot_path(self.generation)),
+            os.path.basename(self._log_path(self.generation)),
+        }
+        for name in os.listdir(self.path):
+            if name.startswith(("snapshot-", "log-")) and name not in keep:
+                os.remove(os.path.join(self.path, name))
+
+    def _snapshot_path(self, generation: int) -> str:
+        """Get the snapshot file of a generation."""
+        return os.path.join(self.path, f"snapshot-{generation}.ndjson")
+
+    def _log_path(self, generation: int) -> str:
+        """Get the log file of a generation."""
+        return os.path.join(self.path, f"log-{generation}.ndjson")
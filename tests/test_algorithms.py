@@ -1,11 +1,27 @@
 import sys
+import numpy as np
 import pytest
 
 from graph import Graph
-from algorithms.bfs import bfs
-from algorithms.dfs import dfs
-from algorithms.dijkstra import dijkstra
+from algorithms.bfs import bfs, bfs_order
+from algorithms.dfs import dfs, dfs_order
+from algorithms.dijkstra import (
+    dijkstra,
+    dijkstra_dial,
+    dijkstra_heap,
+    shortest_paths_batch,
+    shortest_paths_many,
+)
 from algorithms.astar import a_star
+from algorithms.max_flow import max_flow
+from algorithms.delta_stepping import delta_stepping
+from algorithms.shortest_path_tree import ShortestPathTree
+from algorithms.clustering import clustering, transitivity, triangles
+from algorithms.community import label_propagation, louvain
+from algorithms.random_walk import RandomWalker
+from algorithms.runner import run
+from algorithms.budget import Budget, CancelToken
+from algorithms.stats import AlgorithmStats
 from six import StringIO
 
 
@@ -82,6 +98,27 @@ def test_dfs_undirected():
     assert output == "1 2 3"
 
 
+def test_traversal_order_and_stats():
+    g = Graph(directed=True)
+    g.add_edge(1, 2)
+    g.add_edge(1, 3)
+    g.add_edge(2, 4)
+    g.add_edge(3, 4)
+
+    stats = AlgorithmStats()
+    assert bfs_order(g, 1, stats) == [1, 2, 3, 4]
+    assert stats.nodes_settled == 4
+    assert stats.edges_relaxed == 4
+    assert stats.heap_pushes == 4
+    assert stats.peak_frontier == 2
+
+    stats = AlgorithmStats()
+    assert dfs_order(g, 1, stats) == [1, 2, 4, 3]
+    assert stats.nodes_settled == 4
+    assert stats.edges_relaxed == 4
+    assert stats.heap_pushes == 4
+
+
 def test_dijkstra_basic():
     g = Graph(directed=True)
     g.add_edge(1, 2, 1.0)
@@ -107,6 +144,402 @@ def test_dijkstra_invalid_start():
         dijkstra(g, 99)
 
 
+def test_dijkstra_dial_matches_heap():
+    import random
+
+    rng = random.Random(7)
+    for directed in (True, False):
+        g = Graph(directed=directed)
+        for _ in range(300):
+            g.add_edge(rng.randrange(60), rng.randrange(60), rng.randint(0, 9))
+        for start in (0, 13, 42):
+            if start in g.nodes:
+                assert dijkstra_dial(g, start) == dijkstra_heap(g, start)
+                assert dijkstra(g, start) == dijkstra_heap(g, start)
+
+
+def test_dijkstra_dial_integral_float_weights():
+    g = Graph(directed=True)
+    g.add_edge(1, 2, 2.0)
+    g.add_edge(2, 3, 0.0)
+    g.add_edge(1, 3, 5.0)
+    assert dijkstra_dial(g, 1) == {1: 0, 2: 2.0, 3: 2.0}
+
+
+def test_dijkstra_dial_large_sparse_weights():
+    # Few distinct distances spread over a wide ring
+    g = Graph(directed=True)
+    g.add_edge(1, 2, 3000)
+    g.add_edge(2, 3, 3600)
+    g.add_edge(1, 3, 9000)
+    assert dijkstra_dial(g, 1, budget=Budget(max_relaxations=100)) == {1: 0, 2: 3000, 3: 6600}
+
+
+def _weighted_grid(size, low, high):
+    import random
+
+    rng = random.Random(3)
+    g = Graph()
+    edges = []
+    for i in range(size):
+        for j in range(size):
+            if i + 1 < size:
+                edges.append(((i, j), (i + 1, j), rng.randint(low, high)))
+            if j + 1 < size:
+                edges.append(((i, j), (i, j + 1), rng.randint(low, high)))
+    g.add_edges_from(edges)
+    return g
+
+
+def test_dijkstra_picks_heap_for_large_weights(monkeypatch):
+    import algorithms.dijkstra
+
+    g = _weighted_grid(10, 3000, 3600)
+    monkeypatch.setattr(algorithms.dijkstra, "dijkstra_dial", None)
+    assert dijkstra(g, (0, 0)) == dijkstra_heap(g, (0, 0))
+
+
+def test_dijkstra_picks_dial_for_small_weights(monkeypatch):
+    import algorithms.dijkstra
+
+    g = _weighted_grid(10, 1, 9)
+    monkeypatch.setattr(algorithms.dijkstra, "dijkstra_heap", None)
+    stats = AlgorithmStats()
+    distances = dijkstra(g, (0, 0), stats)
+    monkeypatch.undo()
+    assert distances == dijkstra_heap(g, (0, 0))
+    assert stats.nodes_settled == 100
+
+
+def test_dijkstra_dial_rejects_fractional_weights():
+    g = Graph(directed=True)
+    g.add_edge(1, 2, 0.5)
+    with pytest.raises(ValueError):
+        dijkstra_dial(g, 1)
+    assert dijkstra(g, 1) == {1: 0, 2: 0.5}
+
+
+def _random_graph(directed, seed, nodes=60, edges=300):
+    import random
+
+    rng = random.Random(seed)
+    g = Graph(directed=directed)
+    for _ in range(edges):
+        g.add_edge(rng.randrange(nodes), rng.randrange(nodes), rng.uniform(0.0, 10.0))
+    return g
+
+
+def _assert_distances_close(actual, expected):
+    assert actual.keys() == expected.keys()
+    for node_id, distance in expected.items():
+        assert actual[node_id] == pytest.approx(distance)
+
+
+def test_delta_stepping_matches_dijkstra():
+    for directed in (True, False):
+        g = _random_graph(directed, seed=3)
+        start = next(iter(g.nodes))
+        expected = dijkstra(g, start)
+        for delta in (None, 0.5, 3.0, 100.0):
+            _assert_distances_close(delta_stepping(g, start, delta=delta), expected)
+
+
+def test_delta_stepping_array_graph_and_unreachable():
+    g = Graph(directed=True)
+    g.add_edge(1, 2, 1.0)
+    g.add_edge(2, 3, 2.0)
+    g.add_edge(1, 3, 4.0)
+    g.add_node(4)
+    assert delta_stepping(g.freeze(), 1, delta=1.0) == {1: 0, 2: 1.0, 3: 3.0, 4: float("inf")}
+
+
+def test_delta_stepping_workers(monkeypatch):
+    import algorithms.delta_stepping
+
+    monkeypatch.setattr(algorithms.delta_stepping, "_PARALLEL_MIN_FRONTIER", 1)
+    g = _random_graph(True, seed=5)
+    start = next(iter(g.nodes))
+    _assert_distances_close(delta_stepping(g, start, delta=2.0, workers=2), dijkstra(g, start))
+
+
+def test_delta_stepping_invalid_input():
+    g = Graph(directed=True)
+    g.add_edge(1, 2, -1.0)
+    with pytest.raises(ValueError):
+        delta_stepping(g, 99)
+    with pytest.raises(ValueError):
+        delta_stepping(g, 1)
+    g.remove_edge(1, 2)
+    with pytest.raises(ValueError):
+        delta_stepping(g, 1, delta=0)
+
+
+def _assert_valid_tree(tree, g):
+    assert tree.distances == dijkstra_heap(g, tree.source)
+    for node_id, parent in tree.parents.items():
+        if parent is not None:
+            weight = min(e.weight for e in g.get_edges(parent) if e.target.id == node_id)
+            assert tree.distances[node_id] == tree.distances[parent] + weight
+
+
+def test_shortest_path_tree_random_updates():
+    import random
+
+    rng = random.Random(11)
+    for directed in (True, False):
+        g = Graph(directed=directed)
+        for _ in range(120):
+            g.add_edge(rng.randrange(40), rng.randrange(40), rng.randint(1, 9))
+        source = next(iter(g.nodes))
+        tree = ShortestPathTree(g, source)
+        _assert_valid_tree(tree, g)
+
+        for step in range(200):
+            ids = [node_id for node_id in g.nodes if node_id != source]
+            edges = [e for edges in g.edges.values() for e in edges]
+            action = step % 5
+            if action == 0 or not edges:
+                g.add_edge(rng.choice(ids + [source]), rng.randrange(45), rng.randint(1, 9))
+            elif action == 1:
+                edge = rng.choice(edges)
+                g.set_edge_weight(edge.source.id, edge.target.id, rng.randint(1, 3))
+            elif action == 2:
+                edge = rng.choice(edges)
+                g.set_edge_weight(edge.source.id, edge.target.id, rng.randint(5, 20))
+            elif action == 3:
+                edge = rng.choice(edges)
+                g.remove_edge(edge.source.id, edge.target.id)
+            elif step % 20 == 4 and ids:
+                g.remove_node(rng.choice(ids))
+            _assert_valid_tree(tree, g)
+
+
+def test_shortest_path_tree_paths_and_close():
+    g = Graph(directed=True)
+    g.add_edge("A", "B", 1)
+    g.add_edge("B", "C", 1)
+    g.add_edge("A", "C", 5)
+    tree = ShortestPathTree(g, "A")
+    assert tree.path_to("C") == ["A", "B", "C"]
+
+    g.set_edge_weight("B", "C", 10)
+    assert tree.path_to("C") == ["A", "C"]
+    assert tree.distance("C") == 5
+
+    g.remove_edge("A", "C")
+    assert tree.path_to("C") == ["A", "B", "C"]
+
+    g.add_node("D")
+    assert tree.path_to("D") == []
+
+    tree.close()
+    g.set_edge_weight("B", "C", 1)
+    assert tree.distance("C") == 11
+
+
+def test_shortest_path_tree_invalid_source():
+    with pytest.raises(ValueError):
+        ShortestPathTree(Graph(), 1)
+
+
+def _path_length(g, path):
+    return sum(
+        min(e.weight for e in g.get_edges(u) if e.target.id == v) for u, v in zip(path, path[1:])
+    )
+
+
+def test_shortest_paths_batch():
+    g = _random_graph(True, seed=17)
+    source = next(iter(g.nodes))
+    distances = dijkstra(g, source)
+    targets = list(g.nodes)[::3]
+
+    paths = shortest_paths_batch(g, source, targets)
+    assert list(paths) == targets
+    for target, path in paths.items():
+        if distances[target] == float("inf"):
+            assert path == []
+        else:
+            assert path[0] == source and path[-1] == target
+            assert _path_length(g, path) == pytest.approx(distances[target])
+
+
+def test_shortest_paths_batch_trivial_and_unreachable():
+    g = Graph(directed=True)
+    g.add_edge(1, 2, 1.0)
+    g.add_node(3)
+    assert shortest_paths_batch(g, 1, [1, 2, 3]) == {1: [1], 2: [1, 2], 3: []}
+    with pytest.raises(ValueError):
+        shortest_paths_batch(g, 1, [99])
+
+
+def test_shortest_paths_many():
+    g = Graph(directed=True)
+    g.add_edge(1, 2, 1.0)
+    g.add_edge(2, 3, 1.0)
+    g.add_edge(1, 3, 3.0)
+    g.add_edge(3, 1, 1.0)
+    paths = shortest_paths_many(g, [(1, 3), (3, 2), (1, 2)])
+    assert paths == {(1, 3): [1, 2, 3], (3, 2): [3, 1, 2], (1, 2): [1, 2]}
+
+
+def _to_networkx_undirected(g):
+    import networkx as nx
+
+    nx_graph = nx.Graph()
+    nx_graph.add_nodes_from(g.nodes)
+    nx_graph.add_edges_from((e.source.id, e.target.id) for edges in g.edges.values() for e in edges)
+    nx_graph.remove_edges_from(list(nx.selfloop_edges(nx_graph)))
+    return nx_graph
+
+
+def test_triangles_and_clustering_match_networkx():
+    import networkx as nx
+
+    for directed in (True, False):
+        g = _random_graph(directed, seed=23, nodes=40, edges=250)
+        nx_graph = _to_networkx_undirected(g)
+        assert triangles(g) == nx.triangles(nx_graph)
+        coefficients = clustering(g)
+        for node_id, value in nx.clustering(nx_graph).items():
+            assert coefficients[node_id] == pytest.approx(value)
+        assert transitivity(g) == pytest.approx(nx.transitivity(nx_graph))
+
+
+def test_triangles_chunked_and_workers(monkeypatch):
+    import algorithms.clustering
+
+    g = _random_graph(False, seed=29, nodes=50, edges=400)
+    expected = triangles(g)
+    monkeypatch.setattr(algorithms.clustering, "_WEDGE_CHUNK", 16)
+    assert triangles(g.freeze()) == expected
+    assert triangles(g, workers=2) == expected
+
+
+def test_clustering_small_graphs():
+    g = Graph()
+    g.add_edge(1, 2)
+    g.add_edge(2, 3)
+    g.add_edge(3, 1)
+    g.add_edge(3, 4)
+    assert triangles(g) == {1: 1, 2: 1, 3: 1, 4: 0}
+    assert clustering(g) == {1: 1.0, 2: 1.0, 3: pytest.approx(1 / 3), 4: 0.0}
+    assert transitivity(g) == pytest.approx(0.6)
+    assert triangles(Graph()) == {}
+    assert transitivity(Graph()) == 0.0
+
+
+def _two_cliques():
+    g = Graph()
+    for group in (range(0, 6), range(6, 12)):
+        for u in group:
+            for v in group:
+                if u < v:
+                    g.add_edge(u, v)
+    g.add_edge(5, 6)
+    return g
+
+
+def _partition(communities):
+    groups = {}
+    for node_id, community in communities.items():
+        groups.setdefault(community, set()).add(node_id)
+    return sorted(groups.values(), key=min)
+
+
+def test_label_propagation_two_cliques():
+    g = _two_cliques()
+    communities = label_propagation(g, seed=1)
+    assert _partition(communities) == [set(range(0, 6)), set(range(6, 12))]
+    assert communities == label_propagation(g, seed=1)
+
+
+def test_louvain_two_cliques():
+    g = _two_cliques()
+    communities = louvain(g, seed=1)
+    assert _partition(communities) == [set(range(0, 6)), set(range(6, 12))]
+    assert sorted(set(communities.values())) == [0, 1]
+
+
+def test_louvain_modularity_matches_networkx():
+    import networkx as nx
+
+    nx_graph = nx.planted_partition_graph(4, 25, 0.5, 0.02, seed=3)
+    g = Graph()
+    for u, v in nx_graph.edges():
+        g.add_edge(u, v)
+    for node_id in nx_graph.nodes():
+        g.add_node(node_id)
+
+    ours = nx.community.modularity(nx_graph, _partition(louvain(g, seed=0)))
+    reference = nx.community.modularity(
+        nx_graph, nx.community.louvain_communities(nx_graph, seed=0)
+    )
+    assert ours >= reference - 0.02
+
+
+def test_community_edge_cases():
+    g = Graph()
+    g.add_node("A")
+    g.add_node("B")
+    assert louvain(g) == {"A": 0, "B": 1}
+    assert label_propagation(g) == {"A": 0, "B": 1}
+    assert louvain(Graph()) == {}
+
+
+def test_random_walks_follow_edges():
+    g = _random_graph(True, seed=31, nodes=30, edges=90)
+    g.add_node("sink")
+    walker = RandomWalker(g)
+    batches = list(walker.walks(8, walks_per_node=2, batch_size=16, seed=4))
+
+    walks = np.concatenate(batches)
+    assert walks.dtype == np.int64
+    assert walks.shape == (2 * len(g.nodes), 8)
+    assert all(batch.shape[0] <= 16 for batch in batches)
+    assert sorted(walks[:, 0].tolist()) == sorted(list(range(len(g.nodes))) * 2)
+    for walk in walks.tolist():
+        for u, v in zip(walk, walk[1:]):
+            if v == -1:
+                assert u == -1 or not g.get_edges(walker.ids[u])
+            else:
+                targets = {e.target.id for e in g.get_edges(walker.ids[u])}
+                assert walker.ids[v] in targets
+
+
+def test_random_walks_weighted_and_reproducible():
+    g = Graph(directed=True)
+    g.add_edge(0, 1, 1.0)
+    g.add_edge(0, 2, 3.0)
+    g.add_edge(0, 3, 0.0)
+    walker = RandomWalker(g)
+    steps = walker.walk_batch(np.zeros(20000, dtype=np.int64), 2, seed=1)[:, 1]
+    assert np.mean(steps == walker.ids.index(2)) == pytest.approx(0.75, abs=0.02)
+    assert not np.any(steps == walker.ids.index(3))
+
+    first = np.concatenate(list(walker.walks(3, walks_per_node=3, batch_size=2, seed=9)))
+    second = np.concatenate(list(walker.walks(3, walks_per_node=3, batch_size=2, seed=9)))
+    parallel = np.concatenate(list(walker.walks(3, 3, batch_size=2, seed=9, workers=2)))
+    assert np.array_equal(first, second)
+    assert np.array_equal(first, parallel)
+
+
+def test_random_walks_node2vec_bias():
+    g = Graph()
+    g.add_edge(0, 1)
+    g.add_edge(1, 2)
+    starts = np.zeros(20000, dtype=np.int64)
+
+    # From 1 after 0, returning to 0 has weight 1/p and moving on to 2 has weight 1/q
+    walks = RandomWalker(g, p=0.1, q=1.0).walk_batch(starts, 3, seed=2)
+    assert np.mean(walks[:, 2] == 0) == pytest.approx(10 / 11, abs=0.02)
+    walks = RandomWalker(g, p=1.0, q=0.25).walk_batch(starts, 3, seed=2)
+    assert np.mean(walks[:, 2] == 2) == pytest.approx(4 / 5, abs=0.02)
+
+    with pytest.raises(ValueError):
+        RandomWalker(g, p=0)
+
+
 def test_a_star_basic():
     g = Graph(directed=True)
     g.add_edge(1, 2, 1.0)
@@ -132,3 +565,187 @@ def test_a_star_invalid_nodes():
     g = Graph()
     with pytest.raises(ValueError):
         a_star(g, 1, 2, {})
+
+
+def test_max_flow_basic():
+    g = Graph(directed=True)
+    g.add_edge("s", "a", 16)
+    g.add_edge("s", "c", 13)
+    g.add_edge("a", "b", 12)
+    g.add_edge("c", "a", 4)
+    g.add_edge("b", "c", 9)
+    g.add_edge("c", "d", 14)
+    g.add_edge("d", "b", 7)
+    g.add_edge("b", "t", 20)
+    g.add_edge("d", "t", 4)
+
+    result = max_flow(g, "s", "t")
+    assert result.value == 23
+    assert result.source_side | result.sink_side == set(g.nodes)
+    assert "s" in result.source_side and "t" in result.sink_side
+
+    # Flow is conserved and bounded by the capacities
+    for node_id in g.nodes:
+        if node_id in ("s", "t"):
+            continue
+        inflow = sum(f for (u, v), f in result.flows.items() if v == node_id)
+        outflow = sum(f for (u, v), f in result.flows.items() if u == node_id)
+        assert inflow == outflow
+    for edge in (e for edges in g.edges.values() for e in edges):
+        assert 0 <= result.flows[(edge.source.id, edge.target.id)] <= edge.weight
+
+    # The cut capacity equals the flow value
+    cut = sum(
+        e.weight
+        for edges in g.edges.values()
+        for e in edges
+        if e.source.id in result.source_side and e.target.id in result.sink_side
+    )
+    assert cut == result.value
+
+
+def test_max_flow_undirected_and_disconnected():
+    g = Graph(directed=False)
+    g.add_edge(1, 2, 3.0)
+    g.add_edge(2, 3, 2.0)
+    g.add_edge(1, 3, 1.0)
+    assert max_flow(g, 3, 1).value == 3.0
+
+    g.add_node(4)
+    result = max_flow(g, 1, 4)
+    assert result.value == 0
+    assert result.source_side == {1, 2, 3}
+    assert result.sink_side == {4}
+
+
+def test_max_flow_invalid_nodes():
+    g = Graph(directed=True)
+    g.add_edge(1, 2, 1.0)
+    with pytest.raises(ValueError):
+        max_flow(g, 1, 99)
+    with pytest.raises(ValueError):
+        max_flow(g, 1, 1)
+
+
+def test_dijkstra_stats():
+    g = Graph(directed=True)
+    g.add_edge(1, 2, 1.0)
+    g.add_edge(2, 3, 2.0)
+    g.add_edge(1, 3, 4.0)
+    g.add_node(4)
+
+    for search in (dijkstra_heap, dijkstra_dial):
+        stats = AlgorithmStats()
+        search(g, 1, stats=stats)
+        assert stats == AlgorithmStats(
+            nodes_settled=3, edges_relaxed=3, heap_pushes=4, peak_frontier=2
+        )
+
+    stats = AlgorithmStats()
+    a_star(g, 1, 3, {1: 0.0, 2: 0.0, 3: 0.0}, stats=stats)
+    assert stats.nodes_settled == 3
+    assert stats.edges_relaxed == 3
+
+    # Searching for an unreachable goal, A* with a zero heuristic does Dijkstra's work
+    stats = AlgorithmStats()
+    a_star(g, 1, 4, dict.fromkeys(g.nodes, 0.0), stats=stats)
+    expected = AlgorithmStats()
+    dijkstra_heap(g, 1, stats=expected)
+    assert stats == expected
+
+
+def test_run_registered_algorithms():
+    g = Graph(directed=True)
+    g.add_edge(1, 2, 1.0)
+    g.add_edge(2, 3, 2.0)
+    g.add_edge(1, 3, 4.0)
+
+    result = run("dijkstra", g, start_node=1)
+    assert result.name == "dijkstra"
+    assert result.output == {1: 0, 2: 1.0, 3: 3.0}
+    assert result.stats.nodes_settled == 3
+    assert result.elapsed >= 0 and result.cpu_time >= 0
+
+    result = run("a_star", g, start_node=1, goal_node=3, heuristic={1: 0.0, 2: 0.0, 3: 0.0})
+    assert result.output == [1, 2, 3]
+
+    result = run("max_flow", g, source_node=1, sink_node=3)
+    assert result.output.value == 5.0
+    assert result.stats is None
+
+    with pytest.raises(ValueError):
+        run("unknown", g)
+
+
+def _path_graph(length):
+    g = Graph(directed=True)
+    for i in range(length):
+        g.add_edge(i, i + 1, 1.0)
+    return g
+
+
+def test_budget_max_relaxations():
+    g = _path_graph(100)
+
+    budget = Budget(max_relaxations=10, check_every=5)
+    order = bfs_order(g, 0, budget=budget)
+    assert order == list(range(10))
+    assert budget.exhausted and budget.reason == "max_relaxations"
+
+    budget = Budget(max_relaxations=10, check_every=5)
+    distances = dijkstra(g, 0, budget=budget)
+    assert distances[9] == 9.0 and distances[50] == float("inf")
+    assert budget.exhausted
+
+    budget = Budget(max_relaxations=10, check_every=5)
+    assert a_star(g, 0, 100, {}, budget=budget) == []
+    assert budget.exhausted and budget.relaxations == 10
+
+    budget = Budget(max_relaxations=1000)
+    assert len(dfs_order(g, 0, budget=budget)) == 101
+    assert not budget.exhausted and budget.reason is None
+
+
+def test_budget_cancel_timeout_and_progress():
+    g = _path_graph(100)
+
+    token = CancelToken()
+    token.cancel()
+    budget = Budget(cancel_token=token, check_every=1)
+    assert dijkstra_heap(g, 0, budget=budget)[2] == float("inf")
+    assert budget.reason == "cancelled"
+
+    budget = Budget(timeout=0.0, check_every=1)
+    delta_stepping(g, 0, delta=1.0, budget=budget)
+    assert budget.reason == "timeout"
+
+    calls = []
+    budget = Budget(
+        progress=lambda relaxations, frontier: calls.append(relaxations), check_every=25
+    )
+    dijkstra_dial(g, 0, budget=budget)
+    assert calls == [25, 50, 75, 100]
+    assert not budget.exhausted
+
+    with pytest.raises(ValueError):
+        Budget(check_every=0)
+
+
+def test_run_with_budget():
+    g = _path_graph(100)
+    result = run("bfs", g, start_node=0, budget=Budget(max_relaxations=10, check_every=1))
+    assert not result.complete
+    assert result.output == list(range(10))
+    assert run("bfs", g, start_node=0).complete
+
+
+def test_weight_column_shortest_paths():
+    graph = Graph()
+    graph.add_edges_from([(1, 2), (2, 3), (1, 3)])
+    graph.edge_columns["time"] = [1.0, 1.0, 5.0]
+    assert dijkstra(graph, 1) == {1: 0, 2: 1.0, 3: 1.0}
+    assert dijkstra(graph, 1, weight="time") == {1: 0, 2: 1.0, 3: 2.0}
+    assert delta_stepping(graph, 1, weight="time") == {1: 0, 2: 1.0, 3: 2.0}
+    zero = {1: 0, 2: 0, 3: 0}
+    assert a_star(graph, 1, 3, zero) == [1, 3]
+    assert a_star(graph, 1, 3, zero, weight="time") == [1, 2, 3]
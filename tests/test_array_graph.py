@@ -0,0 +1,84 @@
+import numpy as np
+
+from graph import Graph
+from array_graph import ArrayGraph
+
+
+def test_from_graph_directed():
+    graph = Graph(directed=True)
+    graph.add_edge("A", "C", 2.0)
+    graph.add_edge("A", "B", 1.0)
+    graph.add_edge("C", "A", 3.0)
+    array_graph = ArrayGraph.from_graph(graph)
+
+    assert array_graph.directed is True
+    assert array_graph.ids == ["A", "C", "B"]
+    assert array_graph.index == {"A": 0, "C": 1, "B": 2}
+    assert array_graph.offsets.tolist() == [0, 2, 3, 3]
+    # Rows are sorted by target index
+    assert array_graph.targets.tolist() == [1, 2, 0]
+    assert array_graph.weights.tolist() == [2.0, 1.0, 3.0]
+    assert array_graph.num_nodes == 3
+    assert array_graph.num_edges == 3
+
+
+def test_from_graph_undirected():
+    graph = Graph(directed=False)
+    graph.add_edge(1, 2, 5.0)
+    graph.add_node(3)
+    array_graph = graph.freeze()
+
+    assert array_graph.num_edges == 2
+    assert array_graph.degrees().tolist() == [1, 1, 0]
+    assert array_graph.edge_sources().tolist() == [0, 1]
+    assert array_graph.neighbors(0).tolist() == [1]
+    assert array_graph.neighbors(2).tolist() == []
+
+
+def test_to_dict():
+    graph = Graph()
+    graph.add_edge("X", "Y")
+    array_graph = graph.freeze()
+    assert array_graph.to_dict(np.array([1.5, 2.5])) == {"X": 1.5, "Y": 2.5}
+
+
+def test_empty_graph():
+    array_graph = Graph().freeze()
+    assert array_graph.num_nodes == 0
+    assert array_graph.num_edges == 0
+    assert array_graph.offsets.tolist() == [0]
+    assert repr(array_graph) == "ArrayGraph(directed=False, nodes=0, edges=0)"
+
+
+def test_undirected():
+    graph = Graph(directed=True)
+    graph.add_edge("A", "B", 1.0)
+    graph.add_edge("B", "A", 2.0)
+    graph.add_edge("B", "C", 3.0)
+    graph.add_edge("C", "C", 4.0)
+    simple = graph.freeze().undirected()
+
+    assert simple.directed is False
+    assert simple.index is not None and simple.ids == ["A", "B", "C"]
+    assert simple.offsets.tolist() == [0, 1, 3, 4]
+    assert simple.targets.tolist() == [1, 0, 2, 1]
+    assert simple.weights.tolist() == [3.0, 3.0, 3.0, 3.0]
+
+
+def test_to_graph_round_trip():
+    for directed in (True, False):
+        graph = Graph(directed=directed)
+        graph.add_edge(1, 2, 5.0)
+        graph.add_edge(2, 1, 7.0)
+        graph.add_edge(2, 2, 1.0)
+        graph.add_edge(3, 1, 3.0)
+        graph.add_node(4)
+
+        rebuilt = ArrayGraph.from_graph(graph).to_graph()
+        assert rebuilt.directed == directed
+        assert list(rebuilt.nodes) == [1, 2, 3, 4]
+        assert sorted(
+            (e.source.id, e.target.id, e.weight) for edges in rebuilt.edges.values() for e in edges
+        ) == sorted(
+            (e.source.id, e.target.id, e.weight) for edges in graph.edges.values() for e in edges
+        )
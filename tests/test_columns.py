@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from columns import ColumnStore
+from graph import Graph
+
+
+def test_allocate_and_default_fill():
+    store = ColumnStore()
+    assert store.allocate() == 0
+    assert store.allocate(3) == 1
+    store.add_column("speed")
+    store.add_column("lanes", np.int32)
+    assert store["speed"].shape == (4,)
+    assert np.isnan(store["speed"]).all()
+    assert store["lanes"].tolist() == [0, 0, 0, 0]
+    assert set(store) == {"speed", "lanes"}
+    assert "speed" in store and len(store) == 2
+
+
+def test_set_creates_typed_column_and_grows():
+    store = ColumnStore()
+    store.allocate(2)
+    store.set("lanes", [0, 1], [2, 3])
+    assert store["lanes"].dtype.kind == "i"
+    store.allocate(100)
+    assert store["lanes"].shape == (102,)
+    assert store.get("lanes", [0, 1, 101]).tolist() == [2, 3, 0]
+
+
+def test_string_columns_hold_any_length():
+    store = ColumnStore()
+    store.allocate(2)
+    store.set("name", 0, "a")
+    store.set("name", 1, "a much longer name")
+    assert store["name"].tolist() == ["a", "a much longer name"]
+
+
+def test_whole_column_assignment_and_views():
+    store = ColumnStore()
+    store.allocate(3)
+    store["length"] = [1.0, 2.0, 3.0]
+    store["length"][1] = 5.0
+    assert store.get("length", 1) == 5.0
+    del store["length"]
+    assert "length" not in store
+    with pytest.raises(KeyError):
+        store["length"]
+
+
+def test_graph_assigns_node_and_edge_indices():
+    graph = Graph()
+    graph.add_edge("A", "B")
+    graph.add_edges_from([("B", "C"), ("C", "C")])
+    assert [node.index for node in graph.node_list] == [0, 1, 2]
+    assert graph.node_columns.size == 3
+    assert graph.edge_columns.size == 3
+    a, b = graph.nodes["A"], graph.nodes["B"]
+    assert graph.edges[a][0].index == graph.edges[b][0].index == 0
+
+
+def test_vectorized_weight_column():
+    graph = Graph(directed=True)
+    graph.add_edges_from([("A", "B"), ("B", "C"), ("A", "C")])
+    columns = graph.edge_columns
+    columns["length"] = [10.0, 10.0, 30.0]
+    columns["speed"] = [1.0, 2.0, 1.0]
+    columns["time"] = columns["length"] / columns["speed"]
+    assert graph.freeze("time").weights.tolist() == [10.0, 30.0, 5.0]
@@ -0,0 +1,108 @@
+import sys
+import networkx as nx
+import numpy as np
+import pytest
+
+from graph import Graph
+from convert import from_networkx, laplacian, to_networkx, to_numpy_adjacency, to_sparse_csr
+
+
+@pytest.fixture
+def sample_graph():
+    graph = Graph(directed=False)
+    graph.add_edge("A", "B", 2.0, {"type": "road"})
+    graph.add_edge("B", "C", 3.0)
+    graph.add_edge("C", "A", 1.0)
+    graph.add_node("D", {"color": "red"})
+    return graph
+
+
+def test_to_numpy_adjacency(sample_graph):
+    matrix = to_numpy_adjacency(sample_graph)
+    expected = nx.to_numpy_array(to_networkx(sample_graph), nodelist=["A", "B", "C", "D"])
+    assert np.array_equal(matrix, expected)
+
+
+def test_to_numpy_adjacency_parallel_edges():
+    graph = Graph(directed=True)
+    graph.add_edge(1, 2, 1.5)
+    graph.add_edge(1, 2, 2.5)
+    assert to_numpy_adjacency(graph, dtype=np.float32).tolist() == [[0.0, 4.0], [0.0, 0.0]]
+
+
+def test_self_loops_count_once(sample_graph):
+    sample_graph.add_edge("D", "D", 5.0)
+    sample_graph.add_edge("A", "A", 0.5)
+    nx_graph = to_networkx(sample_graph)
+    nodes = ["A", "B", "C", "D"]
+    expected = nx.to_numpy_array(nx_graph, nodelist=nodes)
+    assert expected[3, 3] == 5.0
+    assert np.array_equal(to_numpy_adjacency(sample_graph), expected)
+    expected = nx.laplacian_matrix(nx_graph, nodelist=nodes).toarray()
+    assert np.allclose(laplacian(sample_graph), expected)
+
+    pytest.importorskip("scipy")
+    assert np.array_equal(to_sparse_csr(sample_graph).toarray(), to_numpy_adjacency(sample_graph))
+    assert np.allclose(laplacian(sample_graph, sparse=True).toarray(), expected)
+
+    directed = Graph(directed=True)
+    directed.add_edge(1, 1, 5.0)
+    assert to_numpy_adjacency(directed).tolist() == [[5.0]]
+
+
+def test_to_sparse_csr_shares_buffers(sample_graph):
+    pytest.importorskip("scipy")
+    array_graph = sample_graph.freeze()
+    matrix = to_sparse_csr(array_graph)
+    assert np.array_equal(matrix.toarray(), to_numpy_adjacency(array_graph))
+    assert np.shares_memory(matrix.data, array_graph.weights)
+
+
+def test_laplacian(sample_graph):
+    nx_graph = to_networkx(sample_graph)
+    nodes = ["A", "B", "C", "D"]
+    expected = nx.laplacian_matrix(nx_graph, nodelist=nodes).toarray()
+    assert np.allclose(laplacian(sample_graph), expected)
+
+    expected = nx.normalized_laplacian_matrix(nx_graph, nodelist=nodes).toarray()
+    assert np.allclose(laplacian(sample_graph, normalized=True), expected)
+
+
+def test_laplacian_sparse(sample_graph):
+    pytest.importorskip("scipy")
+    for normalized in (False, True):
+        dense = laplacian(sample_graph, normalized=normalized)
+        sparse = laplacian(sample_graph, normalized=normalized, sparse=True)
+        assert np.allclose(sparse.toarray(), dense)
+
+
+def test_sparse_without_scipy(sample_graph, monkeypatch):
+    monkeypatch.setitem(sys.modules, "scipy.sparse", None)
+    with pytest.raises(ImportError, match="pip install scipy"):
+        to_sparse_csr(sample_graph)
+    with pytest.raises(ImportError, match="pip install scipy"):
+        laplacian(sample_graph, sparse=True)
+
+
+def test_networkx_round_trip(sample_graph):
+    nx_graph = to_networkx(sample_graph)
+    assert not nx_graph.is_directed()
+    assert nx_graph.nodes["D"] == {"color": "red"}
+    assert nx_graph.edges["A", "B"] == {"type": "road", "weight": 2.0}
+
+    graph = from_networkx(nx_graph)
+    assert graph.directed is False
+    assert list(graph.nodes) == ["A", "B", "C", "D"]
+    assert graph.nodes["D"].data == {"color": "red"}
+    edge = next(e for e in graph.get_edges("A") if e.target.id == "B")
+    assert edge.weight == 2.0 and edge.data == {"type": "road"}
+    assert sum(len(e) for e in graph.edges.values()) == 6
+
+
+def test_from_networkx_directed_default_weight():
+    nx_graph = nx.DiGraph()
+    nx_graph.add_edge(1, 2)
+    graph = from_networkx(nx_graph)
+    assert graph.directed is True
+    assert [(e.target.id, e.weight) for e in graph.get_edges(1)] == [(2, 1.0)]
+    assert graph.get_edges(2) == []
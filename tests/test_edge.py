@@ -37,3 +37,10 @@ def test_edge_reverse():
     assert reversed_edge.weight == 4.0
     assert reversed_edge.directed is False
     assert reversed_edge.data == {"type": "road"}
+
+
+def test_edge_data_created_on_access():
+    edge = Edge("A", "B")
+    edge.data["type"] = "road"
+    assert edge.data == {"type": "road"}
+    assert edge.reverse().data is edge.data
@@ -1,3 +1,5 @@
+import pytest
+
 from graph import Graph
 
 
@@ -85,3 +87,77 @@ def test_from_dict():
     assert "B" in graph.nodes
     assert len(graph.edges[graph.nodes["A"]]) == 1
     assert len(graph.edges[graph.nodes["B"]]) == 0
+
+
+def test_max_integer_weight():
+    graph = Graph(directed=True)
+    assert graph.max_integer_weight() == 0
+    graph.add_edge("A", "B", 3)
+    graph.add_edge("B", "C", 7.0)
+    assert graph.max_integer_weight() == 7
+    graph.add_edge("C", "A", 1.5)
+    assert graph.max_integer_weight() is None
+    graph.remove_edge("C", "A")
+    graph.add_edge("C", "A", -1)
+    assert graph.max_integer_weight() is None
+
+
+def test_max_integer_weight_follows_mutations():
+    graph = Graph()
+    graph.add_edges_from([("A", "B", 3), ("B", "C", 7)])
+    assert graph.max_integer_weight() == 7
+    graph.set_edge_weight("A", "B", 9)
+    assert graph.max_integer_weight() == 9
+    graph.remove_edge("A", "B")
+    assert graph.max_integer_weight() == 7
+    graph.remove_node("C")
+    assert graph.max_integer_weight() == 0
+
+
+def test_set_edge_weight():
+    graph = Graph(directed=False)
+    graph.add_edge("A", "B", 1.0)
+    graph.set_edge_weight("A", "B", 4.0)
+    assert graph.get_edges("A")[0].weight == 4.0
+    assert graph.get_edges("B")[0].weight == 4.0
+    with pytest.raises(ValueError):
+        graph.set_edge_weight("A", "C", 1.0)
+
+
+def test_subscribe_events():
+    graph = Graph(directed=True)
+    events = []
+
+    def listener(*event):
+        events.append(event)
+
+    graph.subscribe(listener)
+    graph.add_edge("A", "B", 2.0)
+    graph.set_edge_weight("A", "B", 3.0)
+    graph.remove_edge("A", "B")
+    graph.remove_node("B")
+    graph.unsubscribe(listener)
+    graph.add_node("C")
+
+    assert events == [
+        ("add_node", "A", None),
+        ("add_node", "B", None),
+        ("add_edge", "A", "B", 2.0, None),
+        ("set_edge_weight", "A", "B", 3.0),
+        ("remove_edge", "A", "B"),
+        ("remove_node", "B"),
+    ]
+
+
+def test_add_edges_from():
+    graph = Graph(directed=False)
+    events = []
+    graph.subscribe(lambda *event: events.append(event[0]))
+    graph.add_edges_from([("A", "B"), ("B", "C", 2.5), ("C", "A", 3.0, {"type": "road"})])
+
+    assert list(graph.nodes) == ["A", "B", "C"]
+    assert [(e.target.id, e.weight) for e in graph.get_edges("A")] == [("B", 1.0), ("C", 3.0)]
+    assert graph.get_edges("C")[1].data == {"type": "road"}
+    assert len(graph.get_edges("B")) == 2
+    assert events.count("add_edge") == 3
+    assert events.count("add_node") == 3
@@ -5,7 +5,7 @@ import pytest
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QMessageBox, QPushButton
 from unittest.mock import patch
-from gui import GraphVisualizer  # Замените your_module на имя вашего файла
+from gui import GraphVisualizer, LayoutWorker  # Замените your_module на имя вашего файла
 
 
 @pytest.fixture
@@ -105,6 +105,32 @@ def test_add_edge(qtbot, app):
             assert edges_b[0].target.id == "A"
 
 
+def test_integer_node_ids(qtbot, app):
+    """Node selectors keep the real node IDs of graphs with integer IDs."""
+    app.graph.add_edges_from([(1, 2, 1.0), (2, 3, 1.0)])
+    app.node_positions = {node_id: np.random.rand(2) * 10 for node_id in app.graph.nodes}
+    app.update_node_dropdowns()
+    assert app.edge_from.itemText(0) == "1" and app.edge_from.itemData(0) == 1
+
+    app.edge_from.setCurrentIndex(0)
+    app.edge_to.setCurrentIndex(2)
+    app.add_edge()
+    assert set(app.graph.nodes) == {1, 2, 3}
+    assert [edge.target.id for edge in app.graph.get_edges(1)] == [2, 3]
+
+    app.algo_selector.setCurrentText("A*")
+    app.start_node_input.setCurrentIndex(0)
+    app.end_node_input.setCurrentIndex(1)
+    with patch("PyQt6.QtWidgets.QMessageBox.critical") as mock_critical:
+        app.run_algorithm()
+        mock_critical.assert_not_called()
+    assert "1 -> 2" in app.result_display.toPlainText()
+
+    app.edge_from.setCurrentIndex(2)
+    app.remove_node()
+    assert set(app.graph.nodes) == {1, 2}
+
+
 def test_save_load_graph(qtbot, app, tmp_path, mocker):
     """Тест сохранения и загрузки графа."""
     # Добавляем тестовые данные
@@ -223,3 +249,97 @@ def test_remove_node(qtbot, app):
         qtbot.waitUntil(lambda: len(app.graph.node_list) == 0, timeout=1000)
 
     assert app.edge_from.count() == 0
+
+
+def test_update_graph_keeps_labels(qtbot, app):
+    """Метки узлов не пересоздаются при обновлении и перетаскивании."""
+    app.graph.add_edge("A", "B")
+    app.node_positions["A"] = [1.0, 2.0]
+    app.node_positions["B"] = [3.0, 4.0]
+    app.plot_widget.setRange(xRange=[-10, 10], yRange=[-10, 10], padding=0)
+    app.update_graph()
+    labels = dict(app.text_items)
+    assert set(labels) == {"A", "B"}
+
+    app.move_node("A", 5.0, 6.0)
+    app.handle_zoom(None, [[-5, 5], [-5, 5]])
+    app.update_graph()
+    assert app.text_items == labels
+    assert app.text_items["A"].pos().x() == 5.0
+    assert app.text_items["A"].pos().y() == 6.5
+    assert app.node_item.getData()[0][0] == 5.0
+
+    app.graph.remove_node("B")
+    app.update_graph()
+    assert list(app.text_items) == ["A"]
+    assert app.text_items["A"] is labels["A"]
+
+
+def test_hit_testing_and_box_selection(qtbot, app):
+    """Поиск узлов по позиции и выделение рамкой."""
+    for name, pos in [("A", [0.0, 0.0]), ("B", [5.0, 5.0]), ("C", [9.0, 1.0])]:
+        app.graph.add_node(name)
+        app.node_positions[name] = pos
+    app.update_graph()
+
+    assert app.node_at(0.1, -0.1) == "A"
+    assert app.node_at(3.0, 3.0) is None
+    assert sorted(app.select_nodes_in_rect(-1, -1, 6, 6)) == ["A", "B"]
+
+    app.move_node("C", 2.0, 2.0)
+    assert app.node_at(2.0, 2.0) == "C"
+    app.graph.remove_node("A")
+    app.update_graph()
+    assert app.node_at(0.0, 0.0) is None
+    assert app.selected_nodes == ["B"]
+
+
+def test_level_of_detail(qtbot, app):
+    """Метки и узлы только в области просмотра, плотность при сильном отдалении."""
+    app.graph.add_edges_from((i, i + 1) for i in range(99))
+    app.node_positions.update({i: [float(i), 0.0] for i in range(100)})
+    app.plot_widget.setRange(xRange=[-0.5, 9.5], yRange=[-5, 5], padding=0)
+    app.update_graph()
+    assert sorted(app.text_items) == list(range(10))
+    assert len(app.node_item.getData()[0]) == 10
+    assert not app.density_item.isVisible()
+
+    app.visual_params["max_labels"] = 5
+    app.restyle()
+    assert app.text_items == {}
+
+    app.visual_params["density_node_limit"] = 50
+    app.plot_widget.setRange(xRange=[-1, 101], yRange=[-5, 5], padding=0)
+    app.restyle()
+    assert app.density_item.isVisible()
+    assert not app.node_item.isVisible()
+    assert app.density_item.image.sum() > 0
+
+
+def test_background_layout(qtbot, app):
+    """Фоновая раскладка обновляет позиции узлов."""
+    app.graph.add_edges_from([("A", "B"), ("B", "C"), ("C", "A")])
+    app.node_positions.update({"A": [0.0, 0.0], "B": [0.1, 0.0], "C": [0.0, 0.1]})
+    app.update_graph()
+
+    start_btn = next(btn for btn in app.findChildren(QPushButton) if btn.text() == "Start Layout")
+    qtbot.mouseClick(start_btn, Qt.MouseButton.LeftButton)
+    qtbot.waitUntil(lambda: app.layout_worker.isFinished(), timeout=5000)
+    qtbot.waitUntil(lambda: list(app.node_positions["B"]) != [0.1, 0.0], timeout=1000)
+    assert app.node_at(*app.node_positions["A"]) == "A"
+
+    app.stop_layout()
+    assert app.layout_worker is None
+
+
+def test_layout_worker_snapshots_graph(app):
+    """The layout works on a snapshot taken when the worker is created."""
+    app.graph.add_edges_from([("A", "B"), ("B", "C")])
+    worker = LayoutWorker(app.graph, {}, iterations=5)
+    app.graph.add_edge("C", "D")
+    app.graph.remove_node("A")
+
+    emitted = []
+    worker.positions_changed.connect(lambda ids, positions: emitted.append(ids))
+    worker.run()
+    assert emitted and emitted[-1] == ["A", "B", "C"]
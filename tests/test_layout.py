@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from array_graph import ArrayGraph
+from graph import Graph
+from layout import ForceLayout, _quadtree, _repulsion_barnes_hut, _repulsion_exact, force_layout
+
+
+def two_cliques():
+    graph = Graph()
+    graph.add_edges_from((a, b) for a in range(5) for b in range(a + 1, 5))
+    graph.add_edges_from((a, b) for a in range(5, 10) for b in range(a + 1, 10))
+    graph.add_edge(0, 5)
+    return graph
+
+
+def test_force_layout_separates_communities():
+    positions = force_layout(two_cliques(), iterations=200, seed=0)
+    points = np.array([positions[i] for i in range(10)])
+    distances = np.linalg.norm(points[:, None] - points[None, :], axis=2)
+    inside = np.mean([distances[a, b] for a in range(5) for b in range(5) if a != b])
+    between = np.mean([distances[a, b] for a in range(5) for b in range(5, 10)])
+    assert inside < between
+
+
+def test_force_layout_is_seeded_and_keeps_given_positions():
+    graph = two_cliques()
+    assert force_layout(graph, seed=1) == force_layout(graph, seed=1)
+    layout = ForceLayout(graph, positions={0: (100.0, 100.0)}, seed=1)
+    assert layout.positions[0].tolist() == [100.0, 100.0]
+    assert set(layout.to_dict()) == set(range(10))
+
+
+def test_barnes_hut_matches_exact_forces():
+    positions = np.random.default_rng(0).random((500, 2)) * 10
+    exact = _repulsion_exact(positions, 1.0)
+    assert np.allclose(_repulsion_barnes_hut(positions, 1.0, 0.0), exact)
+    approximate = _repulsion_barnes_hut(positions, 1.0, 0.8)
+    assert np.linalg.norm(approximate - exact) / np.linalg.norm(exact) < 0.02
+
+
+def test_quadtree_masses_and_centres():
+    positions = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [0.9, 0.9], [0.95, 0.95]])
+    masses, centres, sizes, starts, counts = _quadtree(positions)
+    assert masses[0] == 5
+    assert np.allclose(centres[0], positions.mean(axis=0))
+    assert counts[0] == 4
+    children = slice(starts[0], starts[0] + counts[0])
+    assert masses[children].sum() == 5
+    leaves = counts == 0
+    assert masses[leaves].sum() == 5
+
+
+@pytest.mark.parametrize("barnes_hut", [False, True])
+def test_step_cools_and_handles_directed_array_graphs(barnes_hut):
+    graph = Graph(directed=True)
+    graph.add_edges_from([(1, 2), (2, 3), (3, 3)])
+    layout = ForceLayout(ArrayGraph.from_graph(graph), seed=0, barnes_hut=barnes_hut)
+    first = layout.step()
+    assert 0 < first <= 1.0
+    assert layout.temperature < 1.0
+    assert np.isfinite(layout.positions).all()
+
+
+def test_empty_graph():
+    assert force_layout(Graph()) == {}
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from spatial import SpatialGrid
+
+
+def test_nearest_within_radius():
+    grid = SpatialGrid(cell_size=1.0)
+    grid.insert("a", 0.0, 0.0)
+    grid.insert("b", 0.3, 0.0)
+    grid.insert("c", 5.0, 5.0)
+    assert grid.nearest(0.25, 0.0, 0.5) == "b"
+    assert grid.nearest(-0.1, 0.0, 0.5) == "a"
+    assert grid.nearest(2.5, 2.5, 0.5) is None
+    assert len(grid) == 3 and "c" in grid
+
+
+def test_insert_moves_and_remove():
+    grid = SpatialGrid(cell_size=2.0)
+    grid.insert(1, 0.0, 0.0)
+    grid.insert(1, 10.0, -10.0)
+    assert grid.position(1) == (10.0, -10.0)
+    assert grid.nearest(0.0, 0.0, 1.0) is None
+    assert grid.nearest(10.0, -10.0, 1.0) == 1
+    grid.remove(1)
+    grid.remove(1)
+    assert len(grid) == 0
+    assert grid.nearest(10.0, -10.0, 1.0) is None
+
+
+def test_query_rect_matches_brute_force():
+    rng = random.Random(0)
+    points = {i: (rng.uniform(-50, 50), rng.uniform(-50, 50)) for i in range(2000)}
+    grid = SpatialGrid(cell_size=3.0)
+    grid.update(points.items())
+    for x0, y0, x1, y1 in [(0, 0, 10, 10), (20, -5, -20, 5), (-100, -100, 100, 100)]:
+        expected = {
+            key
+            for key, (x, y) in points.items()
+            if min(x0, x1) <= x <= max(x0, x1) and min(y0, y1) <= y <= max(y0, y1)
+        }
+        assert set(grid.query_rect(x0, y0, x1, y1)) == expected
+
+
+def test_cell_size_must_be_positive():
+    with pytest.raises(ValueError):
+        SpatialGrid(cell_size=0)
@@ -0,0 +1,136 @@
+import pytest
+
+from graph import Graph
+from sqlite_graph import SQLiteGraph
+from algorithms.astar import a_star
+from algorithms.bfs import bfs_order
+from algorithms.dijkstra import dijkstra
+
+
+def _edges(graph, node_id):
+    return [(e.source.id, e.target.id, e.weight) for e in graph.get_edges(node_id)]
+
+
+def test_add_nodes_and_edges():
+    graph = SQLiteGraph(directed=True)
+    node = graph.add_node("A", {"value": 10})
+    assert node.id == "A" and node.data == {"value": 10}
+    graph.add_edge("A", "B", 2.5, {"type": "road"})
+    graph.add_edge(1, "A")
+
+    assert graph.directed is True
+    assert list(graph.nodes) == ["A", "B", 1]
+    assert len(graph.nodes) == 3
+    assert 1 in graph.nodes and "1" not in graph.nodes
+    assert [n.id for n in graph.node_list] == ["A", "B", 1]
+    assert _edges(graph, "A") == [("A", "B", 2.5)]
+    assert graph.get_edges("A")[0].data == {"type": "road"}
+    assert graph.get_edges("B") == []
+    assert graph.get_edges("missing") == []
+    with pytest.raises(KeyError):
+        graph.nodes["missing"]
+
+
+def test_undirected_edges_and_mutations():
+    graph = SQLiteGraph()
+    graph.add_edges_from([("X", "Y", 3.0), ("Y", "Z"), ("Z", "Z", 2.0)], batch_size=2)
+    assert _edges(graph, "Y") == [("Y", "X", 3.0), ("Y", "Z", 1.0)]
+    assert len(graph.get_edges("Z")) == 3
+
+    graph.set_edge_weight("X", "Y", 4.0)
+    assert _edges(graph, "X") == [("X", "Y", 4.0)]
+    assert _edges(graph, "Y")[0] == ("Y", "X", 4.0)
+    with pytest.raises(ValueError):
+        graph.set_edge_weight("X", "Z", 1.0)
+
+    graph.remove_edge("Y", "X")
+    assert graph.get_edges("X") == []
+    graph.remove_node("Z")
+    assert "Z" not in graph.nodes
+    assert graph.get_edges("Y") == []
+
+
+def test_remove_node_uses_indexes():
+    graph = SQLiteGraph(directed=True)
+    graph.add_edges_from([("A", "B"), ("B", "C"), ("C", "A")])
+    for column in ("source", "target"):
+        plan = graph.connection.execute(
+            f"EXPLAIN QUERY PLAN DELETE FROM edges WHERE {column} = ?", ("B",)
+        ).fetchall()
+        assert plan[0][-1].startswith("SEARCH")
+    graph.remove_node("B")
+    assert _edges(graph, "A") == []
+    assert _edges(graph, "C") == [("C", "A", 1.0)]
+
+
+def test_persistence_and_cache(tmp_path):
+    path = tmp_path / "graph.db"
+    with SQLiteGraph(path, directed=True, cache_size=2) as graph:
+        graph.add_edges_from((i, i + 1, float(i)) for i in range(10))
+        for i in range(10):
+            graph.get_edges(i)
+        assert len(graph._cache) == 2
+
+    with SQLiteGraph(path, directed=False) as graph:
+        assert graph.directed is True
+        assert len(graph.nodes) == 11
+        assert _edges(graph, 3) == [(3, 4, 3.0)]
+
+
+def test_algorithms_run_unchanged():
+    import random
+
+    rng = random.Random(3)
+    edges = [(rng.randrange(40), rng.randrange(40), rng.randint(1, 9)) for _ in range(150)]
+    for directed in (True, False):
+        memory = Graph(directed=directed)
+        memory.add_edges_from(edges)
+        stored = SQLiteGraph(directed=directed, cache_size=8)
+        stored.add_edges_from(edges)
+
+        start = edges[0][0]
+        goal = edges[-1][1]
+        assert stored.max_integer_weight() == memory.max_integer_weight()
+        assert dijkstra(stored, start) == dijkstra(memory, start)
+        assert bfs_order(stored, start) == bfs_order(memory, start)
+        heuristic = {node_id: 0.0 for node_id in memory.nodes}
+        assert a_star(stored, start, goal, heuristic) == a_star(memory, start, goal, heuristic)
+
+        frozen = stored.freeze()
+        expected = memory.freeze()
+        assert frozen.ids == expected.ids
+        assert frozen.offsets.tolist() == expected.offsets.tolist()
+        assert frozen.targets.tolist() == expected.targets.tolist()
+
+
+def test_max_integer_weight():
+    graph = SQLiteGraph(directed=True)
+    assert graph.max_integer_weight() == 0
+    graph.add_edge(1, 2, 3.0)
+    graph.add_edge(2, 3, 7)
+    assert graph.max_integer_weight() == 7
+    graph.add_edge(3, 4, 0.5)
+    assert graph.max_integer_weight() is None
+    graph.set_edge_weight(3, 4, -1.0)
+    assert graph.max_integer_weight() is None
+
+
+def test_max_integer_weight_is_stored(tmp_path):
+    path = tmp_path / "graph.db"
+    graph = SQLiteGraph(path, directed=True)
+    graph.add_edges_from([(1, 2, 3), (2, 3, 9)])
+    assert graph.max_integer_weight() == 9
+    graph.connection.execute("UPDATE edges SET weight = 100")  # Not seen by the cached value
+    assert graph.max_integer_weight() == 9
+    graph.set_edge_weight(1, 2, 4)
+    assert graph.max_integer_weight() == 100
+    graph.remove_edge(2, 3)
+    assert graph.max_integer_weight() == 4
+    graph.close()
+
+    reopened = SQLiteGraph(path)
+    assert reopened.max_integer_weight() == 4
+    reopened.add_edge(3, 1, 2.5)
+    assert reopened.max_integer_weight() is None
+    reopened.remove_node(3)
+    assert reopened.max_integer_weight() == 4
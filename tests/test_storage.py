@@ -1,6 +1,9 @@
 import pytest
+import os
+import json
 import xml.etree.ElementTree as ET
 import csv
+import numpy as np
 from graph import Graph
 from storage import (
     save_to_json,
@@ -9,7 +12,19 @@ from storage import (
     load_from_xml,
     save_to_csv,
     load_from_csv,
+    save_to_ndjson,
+    load_from_ndjson,
+    save_binary,
+    load_binary,
+    load_neighbourhood,
+    load_edge_list,
+    load_graph,
+    save_graph,
+    DeltaLog,
+    enable_cache,
+    disable_cache,
 )
+import storage
 
 
 @pytest.fixture
@@ -164,3 +179,486 @@ def test_load_csv_string_ids(tmp_path):
     assert set(node.id for node in graph.node_list) == {"A", "B"}
     assert any(e.target.id == "B" for edges in graph.edges.values() for e in edges)
     assert node_positions == {"A": (1.0, 2.0), "B": (3.0, 4.0)}
+
+
+def _edge_multiset(graph):
+    return sorted(
+        (str(e.source.id), str(e.target.id), e.weight, sorted(e.data.items()))
+        for edges in graph.edges.values()
+        for e in edges
+    )
+
+
+def test_save_and_load_ndjson(sample_graph, tmp_path):
+    """NDJSON round trip keeps IDs, weights, data and positions."""
+    filename = tmp_path / "test_graph.ndjson"
+    sample_graph.add_node("isolated", {"color": "red"})
+    sample_graph.add_edge(3, 1, 2.5, {"label": "back"})
+    node_positions = {"1": (0.0, 1.0), "isolated": (2.0, 3.0)}
+    save_to_ndjson(sample_graph, filename, node_positions=node_positions)
+
+    loaded_graph, loaded_positions = load_from_ndjson(filename, batch_size=2)
+    assert loaded_graph.directed
+    assert list(loaded_graph.nodes) == list(sample_graph.nodes)
+    assert loaded_graph.nodes["isolated"].data == {"color": "red"}
+    assert _edge_multiset(loaded_graph) == _edge_multiset(sample_graph)
+    assert loaded_positions == node_positions
+
+
+def test_ndjson_undirected_edges_written_once(tmp_path):
+    """Undirected edges, parallel edges and self-loops survive a round trip unchanged."""
+    filename = tmp_path / "undirected.ndjson"
+    graph = Graph(directed=False)
+    graph.add_edge(1, 2, 5.0)
+    graph.add_edge(2, 1, 7.0)
+    graph.add_edge(2, 2, 1.0)
+    graph.add_edge(3, 1, 3.0)
+    save_to_ndjson(graph, filename)
+
+    with open(filename, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 1 + 3 + 4
+
+    loaded_graph, loaded_positions = load_from_ndjson(filename)
+    assert not loaded_graph.directed
+    assert _edge_multiset(loaded_graph) == _edge_multiset(graph)
+    assert loaded_positions == {}
+
+
+def test_ndjson_invalid_file(tmp_path):
+    """Files without a graph header or with unknown records are rejected."""
+    filename = tmp_path / "invalid.ndjson"
+    filename.write_text('{"type": "node", "id": 1}\n', encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_from_ndjson(filename)
+
+    filename.write_text('{"type": "graph", "directed": true}\n{"type": "hyperedge"}\n')
+    with pytest.raises(ValueError):
+        load_from_ndjson(filename)
+
+
+def test_save_and_load_binary(sample_undirected_graph, tmp_path):
+    """Binary round trip memory-maps the CSR arrays and keeps positions."""
+    path = tmp_path / "graph_bin"
+    node_positions = {"1": (0.5, 1.5), "3": (2.0, 3.0)}
+    save_binary(sample_undirected_graph, path, node_positions=node_positions)
+
+    array_graph, loaded_positions = load_binary(path)
+    expected = sample_undirected_graph.freeze()
+    assert not array_graph.directed
+    assert array_graph.ids == [1, 2, 3]
+    assert isinstance(array_graph.targets, np.memmap)
+    assert array_graph.offsets.tolist() == expected.offsets.tolist()
+    assert array_graph.targets.tolist() == expected.targets.tolist()
+    assert array_graph.weights.tolist() == expected.weights.tolist()
+    assert loaded_positions == node_positions
+
+    graph = array_graph.to_graph()
+    assert sum(len(e) for e in graph.edges.values()) == 4
+
+
+def test_binary_string_ids_without_positions(sample_graph, tmp_path):
+    """String IDs are kept and a stale positions file is removed on overwrite."""
+    path = tmp_path / "graph_bin"
+    save_binary(sample_graph, path, node_positions={"1": (0.0, 0.0)})
+
+    graph = Graph(directed=True)
+    graph.add_edge("A", "B", 2.0)
+    save_binary(graph, path)
+    array_graph, loaded_positions = load_binary(path, mmap=False)
+    assert array_graph.directed
+    assert array_graph.ids == ["A", "B"]
+    assert array_graph.index == {"A": 0, "B": 1}
+    assert loaded_positions == {}
+
+    graph.add_edge(1, "A")
+    with pytest.raises(ValueError):
+        save_binary(graph, path)
+
+
+def test_load_edge_list(tmp_path):
+    """Edge lists are read across chunk boundaries with comments and missing weights."""
+    filename = tmp_path / "edges.csv"
+    filename.write_text(
+        "source,target,weight\n# comment\n1,2,5.0\n2, 3,1.5\r\n\n3,1\n4,4,2\n", encoding="utf-8"
+    )
+    graph = load_edge_list(filename, directed=True, header=True, chunk_size=7)
+    assert graph.directed
+    assert list(graph.nodes) == ["1", "2", "3", "4"]
+    assert [(e.source.id, e.target.id, e.weight) for es in graph.edges.values() for e in es] == [
+        ("1", "2", 5.0),
+        ("2", "3", 1.5),
+        ("3", "1", 1.0),
+        ("4", "4", 2.0),
+    ]
+
+
+def test_load_edge_list_tsv_int_ids_workers(tmp_path):
+    """Tab-separated files with integer IDs give the same graph with worker processes."""
+    filename = tmp_path / "edges.tsv"
+    filename.write_text("".join(f"{i}\t{(i * 7) % 50}\t{i / 10}\n" for i in range(200)))
+    graph = load_edge_list(filename, delimiter="\t", node_type=int, chunk_size=256)
+    parallel = load_edge_list(filename, delimiter="\t", node_type=int, chunk_size=256, workers=2)
+    assert not graph.directed
+    assert sum(len(e) for e in graph.edges.values()) == 400
+    assert 7 in graph.nodes
+    assert [(e.source.id, e.target.id, e.weight) for e in graph.edges[graph.nodes[1]]] == [
+        (e.source.id, e.target.id, e.weight) for e in parallel.edges[parallel.nodes[1]]
+    ]
+
+
+def test_load_edge_list_str_ids_workers(tmp_path):
+    """Worker processes give plain str IDs and float weights, in file order."""
+    filename = tmp_path / "edges.csv"
+    filename.write_text("".join(f"n{i},n{(i * 3) % 20},{i % 5}\n" for i in range(100)))
+    graph = load_edge_list(filename, directed=True, chunk_size=128)
+    parallel = load_edge_list(filename, directed=True, chunk_size=128, workers=2)
+    assert list(parallel.nodes) == list(graph.nodes)
+    assert all(type(node_id) is str for node_id in parallel.nodes)
+    rows = [(e.source.id, e.target.id, e.weight) for e in parallel.edges[parallel.nodes["n1"]]]
+    assert rows == [("n1", "n3", 1.0)] and type(rows[0][2]) is float
+
+
+def test_load_edge_list_malformed(tmp_path):
+    """Rows without a target or with a bad weight are rejected."""
+    filename = tmp_path / "bad.csv"
+    filename.write_text("1,2,1.0\n3\n")
+    with pytest.raises(ValueError):
+        load_edge_list(filename)
+    filename.write_text("1,2,heavy\n")
+    with pytest.raises(ValueError):
+        load_edge_list(filename)
+
+
+def test_xml_releases_every_element(tmp_path, monkeypatch):
+    """Elements outside <nodes>/<edges> are dropped as well once parsed."""
+    filename = tmp_path / "extra.xml"
+    filename.write_text(
+        '<graph directed="true"><meta>'
+        + "<note>x</note>" * 10000
+        + '</meta><nodes><node id="a"/></nodes>'
+        + '<edges><edge source="a" target="b" weight="2"><tag/></edge></edges></graph>'
+    )
+    roots = []
+    sizes = []
+    iterparse = ET.iterparse
+
+    def recording_iterparse(source, events):
+        for event, elem in iterparse(source, events):
+            if not roots:
+                roots.append(elem)
+            yield event, elem
+            sizes.append(sum(1 for _ in roots[0].iter()))  # Elements held after each step
+
+    monkeypatch.setattr(storage.ET, "iterparse", recording_iterparse)
+    graph, _ = load_from_xml(filename)
+    assert [(e.target.id, e.weight) for e in graph.get_edges("a")] == [("b", 2.0)]
+    # The parser reads ahead, so the elements of one read buffer can be held at once
+    assert max(sizes) < 5000
+
+
+def test_xml_streaming_round_trip(tmp_path):
+    """Special characters in IDs are escaped and edges are read in batches."""
+    filename = tmp_path / "special.xml"
+    graph = Graph(directed=True)
+    graph.add_edge('a&"b', "<c>", 2.5)
+    graph.add_edge("<c>", "d\ne", 1.0)
+    graph.add_edge("d\ne", 'a&"b', 4.0)
+    node_positions = {"<c>": (1.0, -2.0)}
+    save_to_xml(graph, filename, node_positions=node_positions)
+
+    loaded_graph, loaded_positions = load_from_xml(filename, batch_size=2)
+    assert loaded_graph.directed
+    assert list(loaded_graph.nodes) == ['a&"b', "<c>", "d\ne"]
+    assert [
+        (e.source.id, e.target.id, e.weight) for es in loaded_graph.edges.values() for e in es
+    ] == [
+        ('a&"b', "<c>", 2.5),
+        ("<c>", "d\ne", 1.0),
+        ("d\ne", 'a&"b', 4.0),
+    ]
+    assert loaded_positions == node_positions
+
+
+@pytest.mark.parametrize("compression", ["", ".gz", ".bz2", ".xz"])
+@pytest.mark.parametrize("extension", [".json", ".ndjson", ".xml", ".csv"])
+def test_save_and_load_graph_detects_format(
+    sample_undirected_graph, tmp_path, extension, compression
+):
+    """save_graph/load_graph round trip every text format, plain or compressed."""
+    filename = tmp_path / f"graph{extension}{compression}"
+    node_positions = {"1": (0.0, 1.0), "2": (2.0, 3.0), "3": (4.0, 5.0)}
+    save_graph(sample_undirected_graph, filename, node_positions=node_positions)
+
+    with open(filename, "rb") as f:
+        head = f.read(3)
+    assert (head.startswith(b"\x1f\x8b") or head == b"BZh" or head.startswith(b"\xfd7z")) == bool(
+        compression
+    )
+
+    graph, loaded_positions = load_graph(filename)
+    assert not graph.directed
+    assert sorted(str(node_id) for node_id in graph.nodes) == ["1", "2", "3"]
+    assert sum(len(e) for e in graph.edges.values()) == 4
+    assert loaded_positions == node_positions
+
+
+def test_load_graph_plain_json_binary_and_edge_list(sample_graph, tmp_path):
+    """load_graph also reads plain to_dict JSON, binary directories and edge lists."""
+    json_file = tmp_path / "plain.json.gz"
+    save_to_json(sample_graph, json_file)
+    graph, loaded_positions = load_graph(json_file)
+    assert graph.directed and loaded_positions == {}
+    assert sum(len(e) for e in graph.edges.values()) == 3
+
+    binary_dir = tmp_path / "graph_bin"
+    save_graph(sample_graph, binary_dir, file_format="binary")
+    graph, _ = load_graph(binary_dir)
+    assert graph.directed and list(graph.nodes) == [1, 2, 3]
+
+    edge_file = tmp_path / "edges.tsv"
+    edge_file.write_text("a\tb\t2.0\nb\tc\t3.0\n")
+    graph, _ = load_graph(edge_file, directed=True)
+    assert [(e.source.id, e.target.id, e.weight) for e in graph.get_edges("b")] == [("b", "c", 3.0)]
+
+
+def test_load_graph_edge_list_with_header(tmp_path):
+    """A header row of an edge list is skipped instead of parsed as an edge."""
+    for name, text in (
+        ("edges.csv", "source,target,weight\na,b,2.0\nb,c,3.0\n"),
+        ("edges.txt", "source target weight\na b 2.0\nb c 3.0\n"),
+        ("edges.tsv", "source\ttarget\n1\t2\n2\t3\n"),
+    ):
+        edge_file = tmp_path / name
+        edge_file.write_text(text)
+        graph, _ = load_graph(edge_file, directed=True)
+        assert "source" not in graph.nodes
+        assert sum(len(e) for e in graph.edges.values()) == 2
+
+    edge_file = tmp_path / "no_header.csv"
+    edge_file.write_text("a,b\nb,c\n")
+    graph, _ = load_graph(edge_file, directed=True)
+    assert list(graph.nodes) == ["a", "b", "c"]
+
+
+def test_load_graph_edge_list_named_like_csv_records(tmp_path):
+    """Edge lists whose first node is called node, edge or type stay edge lists."""
+    edge_file = tmp_path / "edges.csv"
+    edge_file.write_text("node,edge,2.0\nedge,type,3.0\n")
+    graph, _ = load_graph(edge_file, directed=True)
+    assert [(e.target.id, e.weight) for e in graph.get_edges("node")] == [("edge", 2.0)]
+
+
+def test_load_graph_json_mixed_id_types(tmp_path):
+    """Undirected edges between int and str IDs are deduplicated without comparing them."""
+    json_file = tmp_path / "mixed.json"
+    edges = [
+        {"source": 1, "target": "a", "weight": 2.0},
+        {"source": "a", "target": 1, "weight": 2.0},
+    ]
+    json_file.write_text(json.dumps({"directed": False, "nodes": {}, "edges": edges}))
+    graph, _ = load_graph(json_file)
+    assert [(e.target.id, e.weight) for e in graph.get_edges(1)] == [("a", 2.0)]
+    assert len(graph.get_edges("a")) == 1
+
+
+def test_load_graph_plain_json_undirected(sample_undirected_graph, tmp_path):
+    """Undirected edges of plain to_dict JSON are not doubled."""
+    json_file = tmp_path / "plain.json"
+    save_to_json(sample_undirected_graph, json_file)
+    graph, _ = load_graph(json_file)
+    assert not graph.directed
+    assert sum(len(e) for e in graph.edges.values()) == sum(
+        len(e) for e in sample_undirected_graph.edges.values()
+    )
+
+
+def test_load_from_compressed_files(sample_graph, tmp_path):
+    """The per-format loaders read compressed files by their magic bytes."""
+    filename = tmp_path / "graph.xml.bz2"
+    save_to_xml(sample_graph, filename)
+    renamed = tmp_path / "graph_without_extension"
+    filename.rename(renamed)
+    graph, _ = load_from_xml(renamed)
+    assert sum(len(e) for e in graph.edges.values()) == 3
+
+    filename = tmp_path / "edges.csv.gz"
+    import gzip
+
+    with gzip.open(filename, "wt") as f:
+        f.write("1,2,0.5\n2,3,1.5\n")
+    graph = load_edge_list(filename, directed=True)
+    assert graph.get_edges("2")[0].weight == 1.5
+
+
+def test_save_graph_unknown_extension(sample_graph, tmp_path):
+    with pytest.raises(ValueError):
+        save_graph(sample_graph, tmp_path / "graph.bin")
+
+
+def test_delta_log_appends_and_replays(tmp_path):
+    """Mutations are appended to the log and replayed on top of the snapshot."""
+    path = tmp_path / "graph_log"
+    graph = Graph(directed=True)
+    graph.add_edge(1, 2, 5.0)
+    log = DeltaLog(path)
+    log.attach(graph, {"1": (0.0, 0.0)})
+    snapshot_size = sum(f.stat().st_size for f in path.glob("snapshot-*"))
+
+    graph.add_edge(2, 3, 1.5, {"label": "new"})
+    graph.set_edge_weight(1, 2, 4.0)
+    graph.add_node(4)
+    graph.remove_node(4)
+    graph.remove_edge(2, 3)
+    graph.add_edge(3, 1, 2.0)
+    log.set_position(3, 7.0, 8.0)
+    log.close()
+    assert sum(f.stat().st_size for f in path.glob("snapshot-*")) == snapshot_size
+
+    loaded_graph, loaded_positions = DeltaLog(path).load()
+    assert loaded_graph.directed
+    assert list(loaded_graph.nodes) == [1, 2, 3]
+    assert [
+        (e.source.id, e.target.id, e.weight) for es in loaded_graph.edges.values() for e in es
+    ] == [
+        (1, 2, 4.0),
+        (3, 1, 2.0),
+    ]
+    assert loaded_positions == {"1": (0.0, 0.0), "3": (7.0, 8.0)}
+
+
+def test_delta_log_compacts_and_drops_torn_record(tmp_path):
+    """A large log is folded into a new snapshot; a torn last line is ignored."""
+    path = tmp_path / "graph_log"
+    log = DeltaLog(path, compact_bytes=200)
+    graph, positions = log.load()
+    assert positions == {} and not graph.directed
+    for i in range(20):
+        graph.add_edge(i, i + 1, float(i))
+    log.close()
+
+    assert len(list(path.glob("snapshot-*"))) == 1
+    (log_file,) = path.glob("log-*")
+    assert log_file.stat().st_size <= 200
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write('{"op": "add_node", "id": 9')
+
+    log = DeltaLog(path)
+    loaded_graph, _ = log.load()
+    assert sum(len(e) for e in loaded_graph.edges.values()) == 40
+    assert 99 not in loaded_graph.nodes
+    loaded_graph.add_edge(0, 99)
+    log.close()
+    loaded_graph, _ = DeltaLog(path).load()
+    assert 99 in loaded_graph.nodes
+
+
+def test_load_neighbourhood(tmp_path):
+    """Only the nodes within the given number of hops and the edges between them are loaded."""
+    path = tmp_path / "graph_bin"
+    graph = Graph(directed=False)
+    for i in range(10):
+        graph.add_edge(f"n{i}", f"n{i + 1}", float(i))
+    graph.add_edge("n5", "n3", 7.0)
+    graph.add_edge("n4", "n4", 1.0)
+    save_binary(graph, path, node_positions={"n4": (1.0, 2.0), "n9": (0.0, 0.0)})
+
+    neighbourhood, positions = load_neighbourhood(path, "n4", hops=2)
+    assert not neighbourhood.directed
+    assert list(neighbourhood.nodes) == ["n2", "n3", "n4", "n5", "n6"]
+    assert sorted(
+        (e.source.id, e.target.id, e.weight)
+        for es in neighbourhood.edges.values()
+        for e in es
+        if e.source.id <= e.target.id
+    ) == [
+        ("n2", "n3", 2.0),
+        ("n3", "n4", 3.0),
+        ("n3", "n5", 7.0),
+        ("n4", "n4", 1.0),
+        ("n4", "n4", 1.0),
+        ("n4", "n5", 4.0),
+        ("n5", "n6", 5.0),
+    ]
+    assert positions == {"n4": (1.0, 2.0)}
+
+    assert list(load_neighbourhood(path, "n0", hops=0)[0].nodes) == ["n0"]
+    with pytest.raises(ValueError):
+        load_neighbourhood(path, "missing")
+
+
+def test_load_neighbourhood_directed_int_ids(sample_graph, tmp_path):
+    """Directed neighbourhoods follow edge direction and accept IDs given as strings."""
+    path = tmp_path / "graph_bin"
+    save_binary(sample_graph, path)
+    neighbourhood, _ = load_neighbourhood(path, "2", hops=3)
+    assert list(neighbourhood.nodes) == [2, 3]
+    assert [(e.source.id, e.target.id) for e in neighbourhood.get_edges(2)] == [(2, 3)]
+    with pytest.raises(ValueError):
+        load_neighbourhood(path, "x")
+
+
+def test_cache_skips_parsing_unchanged_files(sample_graph, tmp_path, monkeypatch):
+    path = tmp_path / "graph.xml"
+    save_to_xml(sample_graph, path, {"1": (1.0, 2.0)})
+    enable_cache(tmp_path / "cache")
+    try:
+        graph, positions = load_graph(path)
+        monkeypatch.setattr(storage, "_parse_xml", lambda f, batch_size: pytest.fail("parsed"))
+        cached, cached_positions = load_graph(path)
+        assert sorted(cached.nodes) == sorted(graph.nodes)
+        assert cached_positions == positions == {"1": (1.0, 2.0)}
+
+        save_to_xml(Graph(), path)
+        with pytest.raises(pytest.fail.Exception):
+            load_graph(path)
+    finally:
+        disable_cache()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = tmp_path / "cache"
+    enable_cache(cache, max_bytes=1)
+    try:
+        for name in ("a.csv", "b.csv"):
+            graph = Graph()
+            graph.add_edge(name, "x")
+            save_to_csv(graph, tmp_path / name)
+            assert "x" in load_from_csv(tmp_path / name)[0].nodes
+        assert len(list(cache.iterdir())) == 1
+    finally:
+        disable_cache()
+
+
+def test_cache_does_not_need_file_digest(sample_graph, tmp_path, monkeypatch):
+    """hashlib.file_digest only exists from Python 3.11 on."""
+    monkeypatch.delattr(storage.hashlib, "file_digest", raising=False)
+    path = tmp_path / "graph.csv"
+    save_to_csv(sample_graph, path)
+    enable_cache(tmp_path / "cache")
+    try:
+        first, _ = load_from_csv(path, directed=True)
+        cached, _ = load_from_csv(path, directed=True)
+        assert sorted(cached.nodes) == sorted(first.nodes)
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+    finally:
+        disable_cache()
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_cache_directory_is_private(tmp_path, monkeypatch):
+    created = tmp_path / "new"
+    enable_cache(created)
+    disable_cache()
+    assert created.stat().st_mode & 0o777 == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    os.chmod(shared, 0o777)
+    enable_cache(shared)
+    disable_cache()
+    assert shared.stat().st_mode & 0o777 == 0o700
+
+    monkeypatch.setattr(storage.os, "getuid", lambda: os.stat(shared).st_uid + 1)
+    with pytest.raises(PermissionError):
+        enable_cache(shared)